@@ -7,13 +7,32 @@ import os
 import re
 from pathlib import Path
 
+# เนื้อหาไฟล์ที่อ่านแล้ว: path -> (content, lines) - อ่านครั้งเดียวต่อไฟล์
+_source_cache = {}
+
+# รวม pattern ที่ต้องหาไว้ใน regex เดียว สแกนทั้งไฟล์รอบเดียว
+_UI_LOAD_PATTERN = re.compile(r'from ui_helper import|from PyQt6 import uic|import uic|uic\.loadUi')
+
+def read_source(file_path):
+    """อ่านไฟล์ (หรือใช้ที่ cache ไว้) คืน (content, lines)"""
+    cached = _source_cache.get(file_path)
+    if cached is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        cached = _source_cache[file_path] = (content, content.split('\n'))
+    return cached
+
+def write_source(file_path, lines):
+    """เขียนไฟล์และอัปเดต cache ให้ตรงกับเนื้อหาใหม่"""
+    content = '\n'.join(lines)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    _source_cache[file_path] = (content, content.split('\n'))
+
 def analyze_file(file_path):
     """Analyze Python file for UI loading patterns"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        lines = content.split('\n')
+        content, lines = read_source(file_path)
         
         print(f"\n🔍 Analyzing {file_path}:")
         
@@ -24,18 +43,23 @@ def analyze_file(file_path):
         # Find problematic lines
         uic_loadui_lines = []
         
-        for i, line in enumerate(lines, 1):
-            if 'from ui_helper import' in line:
+        line_no, line_start = 1, 0
+        for match in _UI_LOAD_PATTERN.finditer(content):
+            # นับบรรทัดต่อจากตำแหน่ง match ก่อนหน้า
+            line_no += content.count('\n', line_start, match.start())
+            line_start = match.start()
+            token = match.group()
+            
+            if token == 'from ui_helper import':
                 has_ui_helper = True
-                print(f"   ✅ Line {i}: ui_helper import found")
-                
-            if 'from PyQt6 import uic' in line or 'import uic' in line:
+                print(f"   ✅ Line {line_no}: ui_helper import found")
+            elif token == 'uic.loadUi':
+                line = lines[line_no - 1].strip()
+                uic_loadui_lines.append((line_no, line))
+                print(f"   🎯 Line {line_no}: {line}")
+            else:
                 has_uic_import = True
-                print(f"   📦 Line {i}: uic import found")
-                
-            if 'uic.loadUi' in line:
-                uic_loadui_lines.append((i, line.strip()))
-                print(f"   🎯 Line {i}: {line.strip()}")
+                print(f"   📦 Line {line_no}: uic import found")
         
         return content, lines, uic_loadui_lines, has_ui_helper, has_uic_import
         
@@ -73,8 +97,7 @@ def fix_mainwindow_page():
     if modified:
         # Write back
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(new_lines))
+            write_source(file_path, new_lines)
             print(f"   💾 Saved changes to {file_path}")
             return True
         except Exception as e:
@@ -124,8 +147,7 @@ def fix_uploadfile_page():
     if modified:
         # Write back
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(new_lines))
+            write_source(file_path, new_lines)
             print(f"   💾 Saved changes to {file_path}")
             return True
         except Exception as e:
@@ -205,8 +227,7 @@ def fix_other_pages():
         if modified:
             # Write back
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(new_lines))
+                write_source(file_path, new_lines)
                 print(f"   💾 Saved changes to {file_path}")
             except Exception as e:
                 print(f"   ❌ Error saving {file_path}: {e}")
@@ -233,8 +254,7 @@ def verify_fixes():
             continue
             
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, lines = read_source(file_path)
                 
             has_ui_helper = 'from ui_helper import' in content
             has_load_ui_safe = 'load_ui_safe(' in content
@@ -248,7 +268,6 @@ def verify_fixes():
             if has_old_uic:
                 all_good = False
                 # Show remaining instances
-                lines = content.split('\n')
                 for i, line in enumerate(lines, 1):
                     if 'uic.loadUi(' in line:
                         print(f"      ⚠️  Line {i}: {line.strip()}")
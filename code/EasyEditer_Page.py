@@ -3,19 +3,27 @@ import json
 import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
-from datetime import datetime
 import time
+import uuid
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from ui_helper import load_ui_safe, UIHelper
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QListWidget, QListWidgetItem, 
     QScrollArea, QVBoxLayout, QFrame, QLabel, QPushButton, 
     QHBoxLayout, QComboBox, QMessageBox, QFileDialog, QDialogButtonBox, 
     QDialog, QGroupBox, QCheckBox, QFormLayout, QSpinBox, QProgressBar,
-    QTextEdit, QLineEdit, QTableWidget, QTableWidgetItem, QSplitter
+    QTextEdit, QLineEdit, QTableWidget, QTableWidgetItem, QSplitter,
+    QTableView, QHeaderView, QListView
+)
+from PyQt6.QtCore import (
+    Qt, QMimeData, pyqtSignal, QTimer, pyqtSlot, QAbstractTableModel, QAbstractListModel, QModelIndex,
+    QThread, QObject, QRunnable, QThreadPool
 )
-from PyQt6.QtCore import Qt, QMimeData, pyqtSignal, QTimer, pyqtSlot
 from PyQt6.QtGui import QDrag, QFont, QColor, QPalette, QAction, QBrush
-from PyQt6 import uic
 from resource_helper import get_ui_path
 
 
@@ -40,6 +48,13 @@ except ImportError:
         def connect_to_ied(self, *args, **kwargs): return None
         def disconnect_from_ied(self, *args, **kwargs): pass
         def read_value(self, *args, **kwargs): return None, "Module not available"
+        def read_values(self, ied_name, refs): return {ref: (None, "Module not available") for ref in refs}
+        def create_data_set(self, *args, **kwargs): return "Module not available"
+        def delete_data_set(self, *args, **kwargs): return "Module not available"
+        def read_data_set_values(self, *args, **kwargs): return None, "Module not available"
+        def find_free_urcb(self, *args, **kwargs): return None
+        def enable_report(self, *args, **kwargs): return "Module not available"
+        def disable_report(self, *args, **kwargs): return "Module not available"
         def control_operation(self, *args, **kwargs): return "Module not available"
         def get_connection(self, *args, **kwargs): return None
         def add_connection_callback(self, *args, **kwargs): pass
@@ -76,15 +91,22 @@ class IEDSelectionDialog(QDialog):
         
         # IED List
         self.ied_list = QListWidget()
+        self.ied_list.setUniformItemSizes(True)
         layout.addWidget(self.ied_list)
         
-        # Populate list
-        for config in self.ied_configs:
-            item = QListWidgetItem(f"🏭 {config['ied_name']} - {config.get('ip_address', 'Unknown IP')}")
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(Qt.CheckState.Unchecked)
-            item.setData(Qt.ItemDataRole.UserRole, config)
-            self.ied_list.addItem(item)
+        # Populate list - ปิด update/signal ระหว่างเติมเพื่อไม่ให้ layout ทุกครั้งที่ add
+        self.ied_list.setUpdatesEnabled(False)
+        self.ied_list.blockSignals(True)
+        try:
+            for config in self.ied_configs:
+                item = QListWidgetItem(f"🏭 {config['ied_name']} - {config.get('ip_address', 'Unknown IP')}")
+                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                item.setCheckState(Qt.CheckState.Unchecked)
+                item.setData(Qt.ItemDataRole.UserRole, config)
+                self.ied_list.addItem(item)
+        finally:
+            self.ied_list.blockSignals(False)
+            self.ied_list.setUpdatesEnabled(True)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -125,6 +147,86 @@ class IEDSelectionDialog(QDialog):
         return selected
 
 
+@dataclass
+class IEDConnRow:
+    """ข้อมูลหนึ่งแถวใน IEDConnModel"""
+    name: str
+    ip_address: str
+    port: str
+    checked: bool = True
+
+
+class IEDConnModel(QAbstractTableModel):
+    """Table model สำหรับ IEDConnectionDialog - เก็บข้อมูลแต่ละแถวแทน QTableWidgetItem"""
+    
+    HEADERS = ["IED Name", "IP Address", "Port", "Connect"]
+    TEXT_FIELDS = ("name", "ip_address", "port")
+    CHECK_COLUMN = 3
+    
+    def __init__(self, ied_configs, parent=None):
+        super().__init__(parent)
+        self._rows = [
+            IEDConnRow(config['ied_name'],
+                       config.get('ip_address', '192.168.1.100'),
+                       str(config.get('mms_port', 102)))
+            for config in ied_configs
+        ]
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        
+        if column == self.CHECK_COLUMN:
+            # Connect checkbox - วาดด้วย CheckStateRole ไม่ต้องสร้าง QCheckBox
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if row.checked else Qt.CheckState.Unchecked
+            return None
+            
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return getattr(row, self.TEXT_FIELDS[column])
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        column = index.column()
+        if column in (1, 2):  # IP Address, Port (editable)
+            flags |= Qt.ItemFlag.ItemIsEditable
+        elif column == self.CHECK_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        row = self._rows[index.row()]
+        column = index.column()
+        
+        if column == self.CHECK_COLUMN and role == Qt.ItemDataRole.CheckStateRole:
+            row.checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif column in (1, 2) and role == Qt.ItemDataRole.EditRole:
+            setattr(row, self.TEXT_FIELDS[column], str(value).strip())
+        else:
+            return False
+            
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+
 class IEDConnectionDialog(QDialog):
     """Dialog for connecting to IEDs"""
     
@@ -145,31 +247,18 @@ class IEDConnectionDialog(QDialog):
         title.setStyleSheet("font-weight: bold; font-size: 14px; padding: 10px;")
         layout.addWidget(title)
         
-        # Connection table
-        self.connection_table = QTableWidget()
-        self.connection_table.setColumnCount(4)
-        self.connection_table.setHorizontalHeaderLabels(["IED Name", "IP Address", "Port", "Connect"])
-        
-        # Populate table
-        self.connection_table.setRowCount(len(self.ied_configs))
-        for row, config in enumerate(self.ied_configs):
-            # IED Name
-            self.connection_table.setItem(row, 0, QTableWidgetItem(config['ied_name']))
-            
-            # IP Address (editable)
-            ip_item = QTableWidgetItem(config.get('ip_address', '192.168.1.100'))
-            self.connection_table.setItem(row, 1, ip_item)
-            
-            # Port (editable)
-            port_item = QTableWidgetItem(str(config.get('mms_port', 102)))
-            self.connection_table.setItem(row, 2, port_item)
-            
-            # Connect checkbox
-            check_widget = QCheckBox()
-            check_widget.setChecked(True)
-            self.connection_table.setCellWidget(row, 3, check_widget)
-            
-        self.connection_table.resizeColumnsToContents()
+        # Connection table (model/view - วาดเฉพาะแถวที่มองเห็น)
+        self.connection_model = IEDConnModel(self.ied_configs, self)
+        self.connection_table = QTableView()
+        self.connection_table.setModel(self.connection_model)
+        
+        # ใช้ความกว้างคอลัมน์คงที่ แทน resizeColumnsToContents() ที่ต้องวัดทุก cell
+        header = self.connection_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(0, 180)
+        header.resizeSection(1, 140)
+        header.resizeSection(2, 60)
+        header.setStretchLastSection(True)
         layout.addWidget(self.connection_table)
         
         # Buttons
@@ -198,48 +287,159 @@ class IEDConnectionDialog(QDialog):
         
     def get_connections_to_make(self):
         """Get list of connections to establish"""
-        connections = []
-        
-        for row in range(self.connection_table.rowCount()):
-            check_widget = self.connection_table.cellWidget(row, 3)
-            if check_widget and check_widget.isChecked():
-                connection_info = {
-                    'ied_name': self.connection_table.item(row, 0).text(),
-                    'ip_address': self.connection_table.item(row, 1).text(),
-                    'port': int(self.connection_table.item(row, 2).text())
-                }
-                connections.append(connection_info)
+        return [
+            {
+                'ied_name': row.name,
+                'ip_address': row.ip_address,
+                'port': int(row.port)
+            }
+            for row in self.connection_model._rows
+            if row.checked
+        ]
+
+
+# (LN dicts, search keys ขนานกัน) ของ LN ใน bucket เดียวกัน
+LNBucket = Tuple[List[Dict[str, Any]], List[str]]
+
+
+@lru_cache(maxsize=4096)
+def _ln_display_name(prefix: str, ln_class: str, inst: str) -> str:
+    """สร้างชื่อที่แสดงของ LN ในรูปแบบ prefix-lnClass-inst (cache ไว้ใช้ซ้ำ)"""
+    # จัดการกรณีพิเศษสำหรับ LLN0 (LN0)
+    if ln_class == 'LLN0':
+        return 'LLN0'  # LLN0 ไม่มี prefix และ inst
+    
+    parts = [part for part in (prefix, ln_class, inst) if part]
+    return '-'.join(parts) if parts else 'Unknown'
+
+
+class LogicalNodeListModel(QAbstractListModel):
+    """List model ของ Logical Nodes - แถวคือ ln dict เดิมใน filtered_nodes ไม่สร้าง item ต่อแถว"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._nodes: List[Dict[str, Any]] = []
+        # JSON drag text ต่อ LN: id(ln) -> (ln, text) - encode ครั้งแรกที่ลาก ใช้ซ้ำข้ามการ filter
+        self._drag_text: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        
+    def set_nodes(self, nodes: List[Dict[str, Any]]):
+        """เปลี่ยนรายการ LN ทั้งหมด (ใช้ list เดิม ไม่ copy)"""
+        self.beginResetModel()
+        self._nodes = nodes
+        self.endResetModel()
+        
+    def node(self, row: int) -> Dict[str, Any]:
+        return self._nodes[row]
+        
+    def drag_text(self, row: int) -> str:
+        """JSON ของ LN (สำหรับ drop ข้าม process) - cache ต่อ LN"""
+        ln_data = self._nodes[row]
+        cached = self._drag_text.get(id(ln_data))
+        if cached is not None and cached[0] is ln_data:
+            return cached[1]
+        text = json.dumps(ln_data)
+        self._drag_text[id(ln_data)] = (ln_data, text)
+        return text
+        
+    def clear_drag_text(self):
+        """ล้าง cache เมื่อโหลดชุด LN ใหม่"""
+        self._drag_text.clear()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._nodes)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ln_data = self._nodes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return _ln_display_name(
+                ln_data.get('@prefix', ''),
+                ln_data.get('@lnClass', ''),
+                ln_data.get('@inst', '')
+            )
+        if role == Qt.ItemDataRole.UserRole:
+            return ln_data
+        return None
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+
+
+class _ColorFlashScheduler(QObject):
+    """คืน style ของ label หลัง flash ด้วย QTimer ตัวเดียว แทน QTimer.singleShot ต่อครั้ง"""
+    
+    _instance: Optional['_ColorFlashScheduler'] = None
+    
+    @classmethod
+    def instance(cls) -> '_ColorFlashScheduler':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending: Dict[QLabel, Tuple[float, str]] = {}  # label -> (expiry, style)
+        self._timer = QTimer(self)
+        self._timer.setInterval(100)
+        self._timer.timeout.connect(self._reset_expired)
+        
+    def schedule(self, label: QLabel, delay: float, style: str):
+        """ตั้ง style ของ label กลับเป็น style หลังผ่านไป delay วินาที"""
+        self._pending[label] = (time.monotonic() + delay, style)
+        if not self._timer.isActive():
+            self._timer.start()
+            
+    def cancel(self, label: QLabel):
+        """ยกเลิกการคืน style ที่ค้างอยู่ (เช่นเมื่อ label แสดง error แทน)"""
+        self._pending.pop(label, None)
+        
+    def _reset_expired(self):
+        now = time.monotonic()
+        expired = [label for label, (expiry, _) in self._pending.items() if expiry <= now]
+        for label in expired:
+            _, style = self._pending.pop(label)
+            try:
+                label.setStyleSheet(style)
+            except RuntimeError:
+                pass  # label ถูกลบไปแล้ว (LN box ถูกลบ)
                 
-        return connections
+        if not self._pending:
+            self._timer.stop()
 
 
-class LogicalNodeItem(QListWidgetItem):
-    """Custom list item สำหรับ Logical Node"""
+class IEDStateBus(QObject):
+    """กระจายสถานะการเชื่อมต่อ IED ไปยัง LN boxes ผ่าน signal เดียว
+    และส่งคำขออ่านค่าเดี่ยวจาก LN boxes กลับไปที่ EasyEditorWidget
+    """
     
-    def __init__(self, ln_data: Dict[str, Any]):
-        self.ln_data = ln_data
-        
-        # สร้างชื่อที่แสดงให้ถูกต้อง
-        prefix = ln_data.get('@prefix', '')
-        ln_class = ln_data.get('@lnClass', '')
-        inst = ln_data.get('@inst', '')
+    state_changed = pyqtSignal(str, object)  # ied_name, IEDConnection or None
+    read_requested = pyqtSignal(str, str)    # ied_name, object_path
+    values_ready = pyqtSignal(str, object)   # ied_name, {object_path: (value, error)}
+    # callback ของ IEDConnectionManager อาจถูกเรียกจาก worker thread - ส่งผ่าน signal (queued)
+    manager_state_changed = pyqtSignal(str, object)  # ied_name, ConnectionState
+    # ผล connect_to_ied จาก thread pool (queued ไป GUI thread)
+    connect_finished = pyqtSignal(str, object, object)  # ied_name, IEDConnection or None, error or None
+
+
+class ReadValueJob(QRunnable):
+    """อ่านค่าเดี่ยวบน QThreadPool แล้วส่งผลกลับผ่าน IEDStateBus (queued ไป GUI thread)"""
+    
+    def __init__(self, ied_name: str, object_path: str, read_func, bus: IEDStateBus):
+        super().__init__()
+        self.ied_name = ied_name
+        self.object_path = object_path
+        self._read_func = read_func
+        self._bus = bus
         
-        # จัดการกรณีพิเศษสำหรับ LLN0 (LN0)
-        if ln_class == 'LLN0':
-            display_name = 'LLN0'  # LLN0 ไม่มี prefix และ inst
-        else:
-            # สร้างชื่อตามรูปแบบ prefix-lnClass-inst
-            parts = []
-            if prefix:
-                parts.append(prefix)
-            if ln_class:
-                parts.append(ln_class)
-            if inst:
-                parts.append(inst)
-            display_name = '-'.join(parts) if parts else 'Unknown'
-        
-        super().__init__(display_name)
-        self.setData(Qt.ItemDataRole.UserRole, ln_data)
+    def run(self):
+        try:
+            result = self._read_func(self.ied_name, self.object_path)
+        except Exception as e:
+            result = (None, str(e))
+        self._bus.values_ready.emit(self.ied_name, {self.object_path: result})
 
 
 class LogicalNodeBox(QFrame):
@@ -247,53 +447,127 @@ class LogicalNodeBox(QFrame):
     
     delete_requested = pyqtSignal(object)
     
-    def __init__(self, ln_data: Dict[str, Any], ied_connection: Optional['IEDConnection'] = None, parent=None):
+    # Stylesheet เดียวใช้ร่วมกันทุก box (ตั้งครั้งเดียวที่ container ของ CustomScrollArea)
+    # แทนการ setStyleSheet ต่อ instance ซึ่งต้อง parse + polish ใหม่ทุก box
+    STYLE_SHEET = """
+        LogicalNodeBox, LogicalNodeBox QFrame {
+            background-color: #f0f0f0;
+            border: 2px solid #888;
+            border-radius: 8px;
+            padding: 5px;
+            margin: 5px;
+        }
+        LogicalNodeBox:hover, LogicalNodeBox QFrame:hover {
+            border-color: #4CAF50;
+        }
+        QPushButton#lnDeleteBtn {
+            background-color: #ff4444;
+            color: white;
+            border: none;
+            border-radius: 10px;
+            font-weight: bold;
+        }
+        QPushButton#lnDeleteBtn:hover {
+            background-color: #cc0000;
+        }
+        QFrame#lnStatusFrame, QFrame#lnStatusFrame QFrame {
+            background-color: #ffffff;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            padding: 5px;
+            margin-top: 5px;
+        }
+    """
+    
+    def __init__(self, ln_data: Dict[str, Any], ied_connection: Optional['IEDConnection'] = None,
+                 parent=None, state_bus: Optional[IEDStateBus] = None):
         super().__init__(parent)
         self.ln_data = ln_data
+        self._ied_name = ln_data.get('_ied_name', '')
         self.ied_connection = ied_connection
         self.current_da_value = None  # เก็บค่าปัจจุบันของ DA
         self.monitoring_enabled = False
         self.object_path = None  # เก็บ path สำหรับอ่านค่า
+        self._do_to_dais = self._build_do_lookup(ln_data)
+        self._path_prefix = self._build_path_prefix(ln_data)
+        self._body_built = False
+        self.defer_body = False  # CustomScrollArea สร้าง body เองเมื่อ box เข้า viewport
+        self._state_bus = state_bus
         self.setup_ui()
         
+        if state_bus is not None:
+            state_bus.state_changed.connect(self._on_ied_state)
+            
+    def _on_ied_state(self, ied_name: str, ied_connection: Optional['IEDConnection']):
+        """รับการเปลี่ยนสถานะจาก IEDStateBus - สนใจเฉพาะ IED ของ box นี้"""
+        if ied_name == self._ied_name:
+            self.set_connection(ied_connection)
+        
+    @staticmethod
+    def _build_path_prefix(ln_data: Dict[str, Any]) -> str:
+        """ส่วนต้นของ object path (คงที่ต่อ LN box): IEDName.LDName/LNClassLNInst"""
+        ied_name = ln_data.get('_ied_name', '')
+        ld_name = ln_data.get('_ld_name', '')
+        ln_class = ln_data.get('@lnClass', '')
+        
+        if ln_class == 'LLN0':
+            return f"{ied_name}.{ld_name}/LLN0"
+        return f"{ied_name}.{ld_name}/{ln_class}{ln_data.get('@inst', '')}"
+        
+    @staticmethod
+    def _build_do_lookup(ln_data: Dict[str, Any]) -> Dict[str, List[Tuple[str, dict]]]:
+        """Normalize DOI/DAI ครั้งเดียว: do_name -> [(display_name, dai), ...]"""
+        doi_list = ln_data.get('DOI', [])
+        if isinstance(doi_list, dict):
+            doi_list = [doi_list]
+        elif not isinstance(doi_list, list):
+            doi_list = []
+            
+        do_to_dais: Dict[str, List[Tuple[str, dict]]] = {}
+        for doi in doi_list:
+            if not isinstance(doi, dict):
+                continue
+                
+            dai_list = doi.get('DAI') or []
+            if isinstance(dai_list, dict):
+                dai_list = [dai_list]
+            elif not isinstance(dai_list, list):
+                dai_list = []
+                
+            dais = do_to_dais.setdefault(doi.get('@name', 'Unknown DO'), [])
+            for dai in dai_list:
+                if isinstance(dai, dict):
+                    da_name = dai.get('@name', 'Unknown DA')
+                    datasrc = dai.get('@sel:datasrc', '')
+                    display_name = f"{da_name} ({datasrc})" if datasrc else da_name
+                    dais.append((display_name, dai))
+                    
+        return do_to_dais
+        
     def setup_ui(self):
         """สร้าง UI สำหรับ LN Box"""
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #f0f0f0;
-                border: 2px solid #888;
-                border-radius: 8px;
-                padding: 5px;
-                margin: 5px;
-            }
-            QFrame:hover {
-                border-color: #4CAF50;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setSpacing(5)
+        self._box_layout = layout
+        
+        # สร้างเฉพาะ header ก่อน - ส่วน DO/DA/status สร้างเมื่อ box อยู่ใน viewport
+        self._build_header()
+        
+    def _build_header(self):
+        """สร้าง header (ชื่อ LN, สถานะการเชื่อมต่อ, ปุ่มลบ)"""
+        layout = self._box_layout
         
         # Header แสดงชื่อ LN
         header_layout = QHBoxLayout()
         
-        # สร้างชื่อที่แสดงให้ถูกต้อง (เหมือน LogicalNodeItem)
-        prefix = self.ln_data.get('@prefix', '')
-        ln_class = self.ln_data.get('@lnClass', '')
-        inst = self.ln_data.get('@inst', '')
-        
-        if ln_class == 'LLN0':
-            title = 'LLN0'
-        else:
-            parts = []
-            if prefix:
-                parts.append(prefix)
-            if ln_class:
-                parts.append(ln_class)
-            if inst:
-                parts.append(inst)
-            title = '-'.join(parts) if parts else 'Unknown'
+        # สร้างชื่อที่แสดงให้ถูกต้อง (เหมือน LogicalNodeListModel)
+        title = _ln_display_name(
+            self.ln_data.get('@prefix', ''),
+            self.ln_data.get('@lnClass', ''),
+            self.ln_data.get('@inst', '')
+        )
             
         title_label = QLabel(title)
         title_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
@@ -305,18 +579,7 @@ class LogicalNodeBox(QFrame):
         # ปุ่มลบ
         delete_btn = QPushButton("✕")
         delete_btn.setFixedSize(20, 20)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff4444;
-                color: white;
-                border: none;
-                border-radius: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #cc0000;
-            }
-        """)
+        delete_btn.setObjectName("lnDeleteBtn")
         delete_btn.clicked.connect(lambda: self.delete_requested.emit(self))
         
         header_layout.addWidget(title_label)
@@ -326,6 +589,22 @@ class LogicalNodeBox(QFrame):
         
         layout.addLayout(header_layout)
         
+    def ensure_body(self):
+        """สร้างส่วน DO/DA/status ถ้ายังไม่ได้สร้าง"""
+        if not self._body_built:
+            self._body_built = True
+            self._build_body()
+            
+    def showEvent(self, event):
+        super().showEvent(event)
+        # ถ้าไม่ได้อยู่ใน CustomScrollArea (ซึ่งจะเลือกสร้างเฉพาะ box ที่มองเห็น) ให้สร้างทันที
+        if not self.defer_body:
+            self.ensure_body()
+            
+    def _build_body(self):
+        """สร้าง dropdown DO/DA และ status frame"""
+        layout = self._box_layout
+        
         # Dropdown สำหรับ DO
         do_label = QLabel("Data Object:")
         do_label.setFont(QFont("Arial", 8))
@@ -333,14 +612,7 @@ class LogicalNodeBox(QFrame):
         self.do_combo.addItem("Select DO...")
         
         # เติมข้อมูล DO จาก DOI
-        doi_list = self.ln_data.get('DOI', [])
-        if isinstance(doi_list, dict):
-            doi_list = [doi_list]
-            
-        for doi in doi_list:
-            if isinstance(doi, dict):
-                do_name = doi.get('@name', 'Unknown DO')
-                self.do_combo.addItem(do_name, doi)
+        self.do_combo.addItems(list(self._do_to_dais.keys()))
         
         self.do_combo.currentIndexChanged.connect(self.on_do_changed)
         
@@ -361,15 +633,7 @@ class LogicalNodeBox(QFrame):
         # Status section
         status_frame = QFrame()
         status_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        status_frame.setStyleSheet("""
-            QFrame {
-                background-color: #ffffff;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 5px;
-                margin-top: 5px;
-            }
-        """)
+        status_frame.setObjectName("lnStatusFrame")
         status_layout = QVBoxLayout(status_frame)
         status_layout.setSpacing(3)
         
@@ -437,24 +701,11 @@ class LogicalNodeBox(QFrame):
         self.refresh_btn.setEnabled(False)
         
         if index > 0:  # ไม่ใช่ "Select DO..."
-            doi_data = self.do_combo.itemData(index)
-            if doi_data:
-                self.da_combo.setEnabled(True)
-                
-                # เติม DA จาก DAI
-                dai_data = doi_data.get('DAI')
-                if dai_data:
-                    if isinstance(dai_data, dict):
-                        dai_list = [dai_data]
-                    else:
-                        dai_list = dai_data if isinstance(dai_data, list) else []
-                    
-                    for dai in dai_list:
-                        if isinstance(dai, dict):
-                            da_name = dai.get('@name', 'Unknown DA')
-                            datasrc = dai.get('@sel:datasrc', '')
-                            display_name = f"{da_name} ({datasrc})" if datasrc else da_name
-                            self.da_combo.addItem(display_name, dai)
+            self.da_combo.setEnabled(True)
+            
+            # เติม DA จาก lookup ที่เตรียมไว้
+            for display_name, dai in self._do_to_dais.get(self.do_combo.itemText(index), []):
+                self.da_combo.addItem(display_name, dai)
     
     def on_da_changed(self, index):
         """เมื่อเลือก DA ให้แสดงสถานะและตัวเลือกการเปลี่ยนสถานะ"""
@@ -472,18 +723,9 @@ class LogicalNodeBox(QFrame):
         self.status_frame.setVisible(True)
         
         # สร้าง object path สำหรับอ่านค่าจาก IED
-        ied_name = self.ln_data.get('_ied_name', '')
-        ld_name = self.ln_data.get('_ld_name', '')
-        ln_class = self.ln_data.get('@lnClass', '')
-        ln_inst = self.ln_data.get('@inst', '')
-        do_name = self.do_combo.currentText()
-        da_name = dai_data.get('@name', '')
-        
         # Format: IEDName.LDName/LNClass.LNInst.DOName.DAName
-        if ln_class == 'LLN0':
-            self.object_path = f"{ied_name}.{ld_name}/LLN0.{do_name}.{da_name}"
-        else:
-            self.object_path = f"{ied_name}.{ld_name}/{ln_class}{ln_inst}.{do_name}.{da_name}"
+        da_name = dai_data.get('@name', '')
+        self.object_path = f"{self._path_prefix}.{self.do_combo.currentText()}.{da_name}"
         
         # Enable refresh button if connected
         self.refresh_btn.setEnabled(bool(self.ied_connection))
@@ -513,6 +755,11 @@ class LogicalNodeBox(QFrame):
         if not self.ied_connection or not self.object_path:
             return
             
+        # อ่านบน thread pool - ผลกลับมาที่ apply_read_result ผ่าน state bus
+        if self._state_bus is not None:
+            self._state_bus.read_requested.emit(self._ied_name, self.object_path)
+            return
+            
         try:
             # Get main window reference
             main_window = self.window()
@@ -521,22 +768,25 @@ class LogicalNodeBox(QFrame):
                     self.ln_data.get('_ied_name', ''),
                     self.object_path
                 )
-                
-                if not error:
-                    # Update display
-                    display_value = str(value)
-                    self.current_value_label.setText(display_value)
-                    self.current_da_value = value
-                    
-                    # Flash green to indicate update
-                    self.current_value_label.setStyleSheet("color: #00cc00; font-weight: bold;")
-                    QTimer.singleShot(500, lambda: self.current_value_label.setStyleSheet("color: #0066cc;"))
-                else:
-                    self.current_value_label.setText(f"Error: {error}")
-                    self.current_value_label.setStyleSheet("color: red;")
+                self.apply_read_result(value, error)
         except Exception as e:
-            self.current_value_label.setText(f"Error: {str(e)}")
+            self.apply_read_result(None, str(e))
+    
+    def apply_read_result(self, value: Any, error: Optional[str]):
+        """แสดงผลค่าที่อ่านได้จาก IED (ใช้ทั้ง refresh เดี่ยวและ batch read)"""
+        if not error:
+            # Update display
+            display_value = str(value)
+            self.current_value_label.setText(display_value)
+            self.current_da_value = value
+            
+            # Flash green to indicate update
+            self.current_value_label.setStyleSheet("color: #00cc00; font-weight: bold;")
+            _ColorFlashScheduler.instance().schedule(self.current_value_label, 0.5, "color: #0066cc;")
+        else:
+            self.current_value_label.setText(f"Error: {error}")
             self.current_value_label.setStyleSheet("color: red;")
+            _ColorFlashScheduler.instance().cancel(self.current_value_label)
     
     def update_status_combo(self, da_name: str):
         """อัพเดท combobox สำหรับเปลี่ยนสถานะตาม IEC 61850 config"""
@@ -563,7 +813,7 @@ class LogicalNodeBox(QFrame):
                 self.status_combo.addItem(display_text, value)
         else:
             # ถ้าไม่มี config เฉพาะ ให้ใช้ default ตามชื่อ DA
-            if da_name.lower() in ['stval', 'ctlval']:
+            if da_name.lower() in {'stval', 'ctlval'}:
                 self.status_combo.setEnabled(True)
                 self.status_combo.addItem("-- Select new value --")
                 self.status_combo.addItem("FALSE", False)
@@ -620,7 +870,7 @@ class LogicalNodeBox(QFrame):
                     
                     # Flash green
                     self.current_value_label.setStyleSheet("color: #00cc00; font-weight: bold;")
-                    QTimer.singleShot(1000, lambda: self.current_value_label.setStyleSheet("color: #0066cc;"))
+                    _ColorFlashScheduler.instance().schedule(self.current_value_label, 1.0, "color: #0066cc;")
                     
                     QMessageBox.information(self, "Success", "Control command sent successfully")
                 else:
@@ -635,28 +885,58 @@ class LogicalNodeBox(QFrame):
         self.status_combo.setCurrentIndex(0)
 
 
-class CustomListWidget(QListWidget):
-    """Custom List Widget สำหรับ Logical Nodes พร้อม drag support"""
+class _LNRegistry:
+    """ที่เก็บ ln_data ระหว่าง drag ภายใน process เดียวกัน - mime data ส่งแค่ token"""
+    
+    _store: Dict[str, dict] = {}
+    
+    @classmethod
+    def put(cls, ln_data: dict) -> str:
+        token = uuid.uuid4().hex
+        cls._store[token] = ln_data
+        return token
+    
+    @classmethod
+    def pop(cls, token: str) -> Optional[dict]:
+        return cls._store.pop(token, None)
+
+
+class CustomListView(QListView):
+    """Custom List View สำหรับ Logical Nodes พร้อม drag support"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setDragDropMode(QListWidget.DragDropMode.DragOnly)
+        self.setDragEnabled(True)
+        self.setDragDropMode(QListView.DragDropMode.DragOnly)
         self.setDefaultDropAction(Qt.DropAction.CopyAction)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setModel(LogicalNodeListModel(self))
+        
+        # ทุกแถวเป็นข้อความบรรทัดเดียว - ไม่ต้องคำนวณ sizeHint ทีละแถว
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(100)
         
     def startDrag(self, supportedActions):
         """เริ่ม drag operation"""
-        item = self.currentItem()
-        if item:
+        index = self.currentIndex()
+        if index.isValid():
             drag = QDrag(self)
             mimeData = QMimeData()
             
-            # เก็บข้อมูล LN ใน mime data
-            ln_data = item.data(Qt.ItemDataRole.UserRole)
-            mimeData.setText(json.dumps(ln_data))
-            mimeData.setData("application/x-logical-node", json.dumps(ln_data).encode())
+            # เก็บ LN ไว้ใน registry และส่งแค่ token ใน mime data
+            ln_data = self.model().node(index.row())
+            token = _LNRegistry.put(ln_data)
+            mimeData.setData("application/x-logical-node", token.encode())
+            
+            # JSON text สำหรับ drop ข้าม process เท่านั้น - encode ครั้งเดียวต่อ LN
+            mimeData.setText(self.model().drag_text(index.row()))
             
             drag.setMimeData(mimeData)
             drag.exec(Qt.DropAction.CopyAction)
+            
+            # ถ้า drag ถูกยกเลิก token จะยังค้างอยู่ - ลบทิ้ง
+            _LNRegistry.pop(token)
 
 
 class CustomScrollArea(QScrollArea):
@@ -672,6 +952,7 @@ class CustomScrollArea(QScrollArea):
         self.layout = QVBoxLayout(self.container)
         self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.layout.setSpacing(10)
+        self.container.setStyleSheet(LogicalNodeBox.STYLE_SHEET)
         
         self.setWidget(self.container)
         
@@ -688,28 +969,87 @@ class CustomScrollArea(QScrollArea):
             }
         """)
         
+        self._drag_active = False
+        
         # เก็บ LN boxes
         self.ln_boxes: List[LogicalNodeBox] = []
         
+        # IEDStateBus ของ EasyEditorWidget (กำหนดใน EasyEditorWidget.load_ui)
+        self.state_bus: Optional[IEDStateBus] = None
+        
+        # สร้าง body ของ LN box เฉพาะที่อยู่ใน viewport
+        self._body_build_pending = False
+        self.verticalScrollBar().valueChanged.connect(self._schedule_body_build)
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_body_build()
+        
+    def _schedule_body_build(self, *args):
+        """รวมการ scroll/resize หลายครั้งให้ตรวจ viewport ครั้งเดียว"""
+        if not self._body_build_pending:
+            self._body_build_pending = True
+            QTimer.singleShot(0, self._build_visible_boxes)
+            
+    def _build_visible_boxes(self):
+        """สร้าง body ให้ LN boxes ที่อยู่ใน viewport"""
+        self._body_build_pending = False
+        
+        # คำนวณตำแหน่งจาก sizeHint เอง - geometry จริงอาจยังไม่ถูก layout
+        top = self.verticalScrollBar().value()
+        bottom = top + self.viewport().height()
+        spacing = self.layout.spacing()
+        y = self.layout.contentsMargins().top()
+        
+        built_any = False
+        for ln_box in self.ln_boxes:
+            if y > bottom:
+                break
+            height = ln_box.sizeHint().height()
+            if not ln_box._body_built and y + height >= top:
+                ln_box.ensure_body()
+                built_any = True
+            y += height + spacing
+                
+        # Box ที่สร้าง body แล้วจะสูงขึ้น - ตรวจ viewport อีกรอบหลัง layout ใหม่
+        if built_any:
+            self._schedule_body_build()
+            
     def dragEnterEvent(self, event):
         """เมื่อ drag เข้ามา"""
         if event.mimeData().hasFormat("application/x-logical-node"):
             event.acceptProposedAction()
-            self.setProperty("dragActive", True)
-            self.style().polish(self)
+            self._set_drag_active(True)
         else:
             event.ignore()
             
     def dragLeaveEvent(self, event):
         """เมื่อ drag ออกไป"""
-        self.setProperty("dragActive", False)
+        self._set_drag_active(False)
+        
+    def _set_drag_active(self, active: bool):
+        """สลับ style ตอน drag - polish เฉพาะเมื่อสถานะเปลี่ยนจริง
+        
+        ใช้ property selector แทน setStyleSheet เพราะการตั้ง stylesheet ที่
+        scroll area จะ polish LN boxes ทุกตัวใน container ใหม่หมด
+        """
+        if self._drag_active == active:
+            return
+        self._drag_active = active
+        self.setProperty("dragActive", active)
+        self.style().unpolish(self)
         self.style().polish(self)
         
     def dropEvent(self, event):
         """เมื่อ drop LN"""
         if event.mimeData().hasFormat("application/x-logical-node"):
             try:
-                ln_data = json.loads(event.mimeData().data("application/x-logical-node").data().decode())
+                mime_data = event.mimeData()
+                token = mime_data.data("application/x-logical-node").data().decode()
+                ln_data = _LNRegistry.pop(token)
+                if ln_data is None:
+                    # Drop จาก process อื่น - fallback ไปใช้ JSON text
+                    ln_data = json.loads(mime_data.text())
                 self.add_logical_node(ln_data)
                 event.acceptProposedAction()
             except Exception as e:
@@ -718,8 +1058,7 @@ class CustomScrollArea(QScrollArea):
         else:
             event.ignore()
             
-        self.setProperty("dragActive", False)
-        self.style().polish(self)
+        self._set_drag_active(False)
         
     def add_logical_node(self, ln_data: Dict[str, Any]):
         """เพิ่ม Logical Node box"""
@@ -730,11 +1069,13 @@ class CustomScrollArea(QScrollArea):
             ied_name = ln_data.get('_ied_name', '')
             ied_connection = main_window.get_ied_connection(ied_name)
         
-        ln_box = LogicalNodeBox(ln_data, ied_connection)
+        ln_box = LogicalNodeBox(ln_data, ied_connection, state_bus=self.state_bus)
+        ln_box.defer_body = True
         ln_box.delete_requested.connect(self.remove_logical_node)
         
         self.layout.addWidget(ln_box)
         self.ln_boxes.append(ln_box)
+        self._schedule_body_build()
         
     def remove_logical_node(self, ln_box: LogicalNodeBox):
         """ลบ Logical Node box"""
@@ -742,12 +1083,73 @@ class CustomScrollArea(QScrollArea):
             self.ln_boxes.remove(ln_box)
             self.layout.removeWidget(ln_box)
             ln_box.deleteLater()
+            self._schedule_body_build()
             
-    def update_connections(self, ied_name: str, connection: Optional['IEDConnection']):
-        """Update connection status for all LN boxes of an IED"""
-        for ln_box in self.ln_boxes:
-            if ln_box.ln_data.get('_ied_name', '') == ied_name:
-                ln_box.set_connection(connection)
+
+@dataclass
+class MonitoringState:
+    """Data set / report ที่ใช้ monitor IED หนึ่ง - แก้ได้จาก IEDPoller thread ของ IED นั้นเท่านั้น"""
+    paths: Optional[Tuple[str, ...]] = None  # object paths ของ data set ปัจจุบัน (None = ยังไม่สร้าง)
+    dataset_created: bool = False
+    rcb_reference: Optional[str] = None
+    stopped: bool = False  # GUI thread ตั้งตอน stop() - ห้ามสร้าง data set / report เพิ่ม
+
+
+class IEDPoller(QThread):
+    """Worker thread ต่อ IED สำหรับอ่านค่า monitoring โดยไม่ block GUI thread
+    
+    data set / report ของ monitoring เป็นของ thread นี้ (self.monitoring) - สร้างใน read_func
+    และถูกปิดโดย teardown_func บน thread นี้เมื่อได้รับ stop sentinel
+    """
+    
+    values_ready = pyqtSignal(str, object)  # ied_name, {object_path: (value, error)}
+    
+    def __init__(self, ied_name: str, read_func, teardown_func=None, parent=None):
+        super().__init__(parent)
+        self.ied_name = ied_name
+        self._read_func = read_func
+        self._teardown_func = teardown_func
+        self.monitoring = MonitoringState()
+        # รับได้ทีละ 1 request - ถ้ารอบก่อนยังอ่านไม่เสร็จ tick ใหม่จะถูกข้าม
+        self._queue: "queue.Queue[Optional[Tuple[str, ...]]]" = queue.Queue(maxsize=1)
+        
+    def enqueue(self, paths: Tuple[str, ...]) -> bool:
+        """ส่ง object paths ให้ worker อ่าน - คืน False ถ้ายังมีงานค้างอยู่"""
+        try:
+            self._queue.put_nowait(paths)
+            return True
+        except queue.Full:
+            return False
+            
+    def stop(self):
+        """หยุด worker (ทิ้งงานที่ค้างอยู่)"""
+        self.monitoring.stopped = True
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        
+    def run(self):
+        while True:
+            paths = self._queue.get()
+            if paths is None:
+                break
+                
+            try:
+                results = self._read_func(self.ied_name, paths, self.monitoring)
+            except Exception as e:
+                results = {path: (None, str(e)) for path in paths}
+                
+            # ว่าง = IED ส่งค่าเองผ่าน report ไม่ต้องแจ้ง GUI
+            if results:
+                self.values_ready.emit(self.ied_name, results)
+                
+        if self._teardown_func:
+            try:
+                self._teardown_func(self.ied_name, self.monitoring)
+            except Exception as e:
+                print(f"⚠️ Error stopping monitoring of {self.ied_name}: {e}")
 
 
 class EasyEditorWidget(QWidget):
@@ -759,31 +1161,60 @@ class EasyEditorWidget(QWidget):
         
         # ข้อมูลแอป
         self.scl_data = None
+        self._scl_cache: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+        self._streamed_scl_path: Optional[Path] = None
         self.logical_nodes: List[Dict[str, Any]] = []
+        # Index สำหรับ filter (สร้างใน _index_logical_nodes): search key ขนานกับ logical_nodes
+        # และ bucket (LN, search key) แยกตาม IED / category / (IED, category)
+        # bucket ไม่ถูกแก้หลังสร้าง จึงส่ง list ใน bucket ให้ filtered_nodes ได้ตรงๆ
+        self._ln_search_key: List[str] = []
+        self._ln_by_ied: Dict[str, LNBucket] = {}
+        self._ln_by_category: Dict[str, LNBucket] = {}
+        self._ln_by_ied_category: Dict[Tuple[str, str], LNBucket] = {}
+        self._last_filter_key: Optional[Tuple[str, str, str]] = None
         self.filtered_nodes: List[Dict[str, Any]] = []
         self.selected_ied_configs: List[Dict[str, Any]] = []
         self.current_folder = None
         self.current_file = None
         
         # IED Connection Management
+        self.state_bus = IEDStateBus(self)
+        self.state_bus.manager_state_changed.connect(self.on_connection_state_changed)
         if HAS_IED_CONNECTION:
             self.connection_manager = IEDConnectionManager()
-            self.connection_manager.add_connection_callback(self.on_connection_state_changed)
+            self.connection_manager.add_connection_callback(self.state_bus.manager_state_changed.emit)
         else:
             self.connection_manager = None
         self.active_connections = {}
+        self.state_bus.read_requested.connect(self.request_single_read)
+        self.state_bus.values_ready.connect(self.apply_read_results)
+        self.state_bus.connect_finished.connect(self.on_connect_finished)
+        # การเชื่อมต่อ IED รันบน pool นี้ - _connect_batch คือรอบที่ยังรอผลอยู่
+        self._connect_executor: Optional[ThreadPoolExecutor] = None
+        self._connect_batch: Optional[Dict[str, Any]] = None
         
         # Monitoring
         self.monitoring_timer = QTimer()
         self.monitoring_timer.timeout.connect(self.refresh_all_values)
         self.monitoring_enabled = False
+        # Worker ต่อ IED - data set / report ของ monitoring อยู่ใน poller.monitoring
+        self.pollers: Dict[str, IEDPoller] = {}
+        # poller ที่สั่ง stop แล้วแต่ thread ยังไม่จบ (กำลังอ่าน / ปิด report) - เก็บ reference ไว้จน finished
+        self._stopping_pollers: Dict[str, IEDPoller] = {}
+        
+        # Debounce การพิมพ์ค้นหา - กรองครั้งเดียวหลังหยุดพิมพ์
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(175)
+        self._filter_timer.timeout.connect(self.filter_logical_nodes)
         
         # Operation log
-        self.operation_log = []
+        self.operation_log: deque = deque(maxlen=1000)  # เก็บ 1000 รายการล่าสุด
         
         # Safety and mode
         self.safety_enabled = True
         self.test_mode = True  # True = test mode, False = live mode
+        self._live_mode_prompts: Dict[str, QMessageBox] = {}
         
         # File management - ใช้ path เดียวกับ Publisher_Page
         self.root_dir = Path(__file__).resolve().parent.parent / 'upload_file' / 'after_convert'
@@ -796,9 +1227,15 @@ class EasyEditorWidget(QWidget):
             'Status': ['STMP', 'SPDC', 'SIMG', 'SIML'],
             'Other': []  # สำหรับ LN ที่ไม่อยู่ในหมวดหมู่ใดๆ
         }
+        # Reverse map lnClass -> category (LN ที่ไม่อยู่ใน map ถือเป็น 'Other')
+        self._ln_class_to_category: Dict[str, str] = {
+            ln_class: category
+            for category, ln_classes in self.ln_categories.items()
+            for ln_class in ln_classes
+        }
         
+        self._signals_connected = False
         self.load_ui()
-        self.setup_custom_widgets()
         self.connect_signals()
         self.initialize_ui()
         
@@ -836,8 +1273,11 @@ class EasyEditorWidget(QWidget):
             self.searchBox = self.findChild(QLineEdit, 'searchBox')
             
             # Main content widgets
-            self.lnList = self.findChild(QListWidget, 'lnList')
+            self.lnList = self.findChild(QListView, 'lnList')
+            # lnList / dropZone ถูก promote ใน .ui เป็น CustomListView / CustomScrollArea
             self.dropZone = self.findChild(QScrollArea, 'dropZone')
+            if self.dropZone is not None:
+                self.dropZone.state_bus = self.state_bus
             self.instructionLabel = self.findChild(QLabel, 'instructionLabel')
             self.mainSplitter = self.findChild(QSplitter, 'mainSplitter')
             
@@ -848,74 +1288,62 @@ class EasyEditorWidget(QWidget):
             QMessageBox.critical(self, "Error", f"Failed to load UI: {str(e)}")
             sys.exit(1)
     
-    def setup_custom_widgets(self):
-        """แทนที่ widgets ใน UI ด้วย custom widgets"""
-        # แทนที่ lnList ด้วย CustomListWidget
-        if self.lnList:
-            parent = self.lnList.parent()
-            geometry = self.lnList.geometry()
-            self.lnList.setParent(None)
-            
-            self.lnList = CustomListWidget(parent)
-            self.lnList.setGeometry(geometry)
-        
-        # แทนที่ dropZone ด้วย CustomScrollArea  
-        if self.dropZone:
-            parent = self.dropZone.parent()
-            geometry = self.dropZone.geometry()
-            self.dropZone.setParent(None)
-            
-            self.dropZone = CustomScrollArea(parent)
-            self.dropZone.setGeometry(geometry)
-            
     def connect_signals(self):
-        """เชื่อม signals กับ slots"""
+        """เชื่อม signals กับ slots (ครั้งเดียวเท่านั้น)"""
+        if self._signals_connected:
+            return
+        self._signals_connected = True
+        
         # Back button
-        if self.backBtn:
+        if self.backBtn is not None:
             self.backBtn.clicked.connect(self.go_back)
             
         # Control buttons
-        if self.connectBtn:
+        if self.connectBtn is not None:
             self.connectBtn.clicked.connect(self.show_connection_dialog)
-        if self.monitorBtn:
+        if self.monitorBtn is not None:
             self.monitorBtn.clicked.connect(self.toggle_monitoring)
             
         # Safety and mode checkboxes
-        if self.safetyMode:
+        if self.safetyMode is not None:
             self.safetyMode.toggled.connect(self.toggle_safety_mode)
-        if self.testMode:
+        if self.testMode is not None:
             self.testMode.toggled.connect(self.toggle_test_mode)
             
         # File management
-        if self.loadFilesBtn:
+        if self.loadFilesBtn is not None:
             self.loadFilesBtn.clicked.connect(self.load_files)
-        if self.filesListShow:
+        if self.filesListShow is not None:
             self.filesListShow.itemDoubleClicked.connect(self.open_file)
             
         # Filtering
-        if self.iedCombo:
+        if self.iedCombo is not None:
             self.iedCombo.currentTextChanged.connect(self.on_ied_changed)
-        if self.categoryCombo:
-            self.categoryCombo.currentTextChanged.connect(self.filter_logical_nodes)
-        if self.searchBox:
-            self.searchBox.textChanged.connect(self.filter_logical_nodes)
+        if self.categoryCombo is not None:
+            self.categoryCombo.currentTextChanged.connect(self._schedule_filter)
+        if self.searchBox is not None:
+            self.searchBox.textChanged.connect(self._schedule_filter)
+            
+    def _schedule_filter(self, *_):
+        """เริ่ม (หรือเริ่มใหม่) timer สำหรับกรอง logical nodes"""
+        self._filter_timer.start()
         
     def initialize_ui(self):
         """เตรียม UI เริ่มต้น"""
         # เติมข้อมูล category combo
-        if self.categoryCombo:
+        if self.categoryCombo is not None:
             self.categoryCombo.addItem("All Categories")
             self.categoryCombo.addItems(list(self.ln_categories.keys()))
         
         # เติมข้อมูล IED combo - เริ่มต้นว่าง
-        if self.iedCombo:
+        if self.iedCombo is not None:
             self.iedCombo.addItem("Select IED first...")
             self.iedCombo.setEnabled(False)
             
         # Set initial button states
-        if self.connectBtn:
+        if self.connectBtn is not None:
             self.connectBtn.setEnabled(False)
-        if self.monitorBtn:
+        if self.monitorBtn is not None:
             self.monitorBtn.setEnabled(False)
         
     def go_back(self):
@@ -957,45 +1385,84 @@ class EasyEditorWidget(QWidget):
             if connections_to_make:
                 self.connect_to_ieds(connections_to_make)
                 
+    MAX_PARALLEL_CONNECTS = 8
+    
     def connect_to_ieds(self, connection_list: List[Dict]):
-        """Connect to multiple IEDs"""
-        connected_count = 0
-        failed_count = 0
-        
+        """Connect to multiple IEDs - handshake ของแต่ละ IED ทำพร้อมกันบน thread pool
+        ไม่รอผลบน GUI thread: แต่ละ IED ส่งผลกลับผ่าน state_bus.connect_finished ทันทีที่เสร็จ
+        """
+        if self._connect_batch is not None:
+            self.log_operation("Still connecting to IEDs - please wait", "warning")
+            return
+            
+        if self._connect_executor is None:
+            self._connect_executor = ThreadPoolExecutor(
+                max_workers=self.MAX_PARALLEL_CONNECTS, thread_name_prefix="ied-connect"
+            )
+            
+        # รอบการเชื่อมต่อนี้: IED ที่ยังไม่ได้ผล + จำนวนสำเร็จ/ล้มเหลว (แก้บน GUI thread เท่านั้น)
+        self._connect_batch = {
+            'pending': {conn_info['ied_name'] for conn_info in connection_list},
+            'connected': 0,
+            'failed': 0,
+        }
+        if self.connectBtn is not None:
+            self.connectBtn.setEnabled(False)
+            
+        def connect(conn_info: Dict):
+            return self.connection_manager.connect_to_ied(
+                conn_info['ied_name'], conn_info['ip_address'], conn_info.get('port', 102)
+            )
+            
+        def post_result(ied_name: str, future):
+            # เรียกบน worker thread (หรือทันทีถ้าเสร็จแล้ว) - signal ส่งต่อไป GUI thread
+            error = future.exception()
+            connection = None if error else future.result()
+            self.state_bus.connect_finished.emit(ied_name, connection, str(error) if error else None)
+            
         for conn_info in connection_list:
             ied_name = conn_info['ied_name']
-            ip_address = conn_info['ip_address']
-            port = conn_info.get('port', 102)
+            self.log_operation(
+                f"Connecting to {ied_name} at "
+                f"{conn_info['ip_address']}:{conn_info.get('port', 102)}"
+            )
+            future = self._connect_executor.submit(connect, conn_info)
+            future.add_done_callback(lambda f, ied_name=ied_name: post_result(ied_name, f))
+            
+    def on_connect_finished(self, ied_name: str, connection, error: Optional[str]):
+        """รับผลการเชื่อมต่อของ IED หนึ่งตัว (GUI thread) - สรุปผลเมื่อครบทุกตัวในรอบ"""
+        batch = self._connect_batch
+        if batch is None or ied_name not in batch['pending']:
+            return
+        batch['pending'].discard(ied_name)
+        
+        if connection:
+            self.active_connections[ied_name] = connection
+            batch['connected'] += 1
+            self.log_operation(f"Successfully connected to {ied_name}")
+            
+            # Update LN boxes with connection
+            self.state_bus.state_changed.emit(ied_name, connection)
+        elif error:
+            batch['failed'] += 1
+            self.log_operation(f"Error connecting to {ied_name}: {error}", "error")
+        else:
+            batch['failed'] += 1
+            self.log_operation(f"Failed to connect to {ied_name}", "error")
             
-            try:
-                self.log_operation(f"Connecting to {ied_name} at {ip_address}:{port}")
-                
-                connection = self.connection_manager.connect_to_ied(
-                    ied_name, ip_address, port
-                )
-                
-                if connection:
-                    self.active_connections[ied_name] = connection
-                    connected_count += 1
-                    self.log_operation(f"Successfully connected to {ied_name}")
-                    
-                    # Update LN boxes with connection
-                    self.dropZone.update_connections(ied_name, connection)
-                else:
-                    failed_count += 1
-                    self.log_operation(f"Failed to connect to {ied_name}", "error")
-                    
-            except Exception as e:
-                failed_count += 1
-                self.log_operation(f"Error connecting to {ied_name}: {str(e)}", "error")
-                
         # Update UI
         self.update_connection_status()
-        
+        if batch['pending']:
+            return
+            
+        self._connect_batch = None
+        if self.connectBtn is not None:
+            self.connectBtn.setEnabled(True)
+            
         # Show summary
-        message = f"Connected to {connected_count} IED(s)"
-        if failed_count > 0:
-            message += f"\nFailed: {failed_count}"
+        message = f"Connected to {batch['connected']} IED(s)"
+        if batch['failed'] > 0:
+            message += f"\nFailed: {batch['failed']}"
             
         QMessageBox.information(self, "Connection Result", message)
         
@@ -1012,7 +1479,7 @@ class EasyEditorWidget(QWidget):
         for ied_name in list(self.active_connections.keys()):
             if self.connection_manager:
                 self.connection_manager.disconnect_from_ied(ied_name)
-            self.dropZone.update_connections(ied_name, None)
+            self.state_bus.state_changed.emit(ied_name, None)
             self.log_operation(f"Disconnected from {ied_name}")
             
         self.active_connections.clear()
@@ -1027,9 +1494,10 @@ class EasyEditorWidget(QWidget):
         # Update dropzone connections
         if state.value == "Connected":
             connection = self.connection_manager.get_connection(ied_name)
-            self.dropZone.update_connections(ied_name, connection)
+            self.state_bus.state_changed.emit(ied_name, connection)
         else:
-            self.dropZone.update_connections(ied_name, None)
+            self.state_bus.state_changed.emit(ied_name, None)
+            self._stop_pollers(ied_name)
             if ied_name in self.active_connections:
                 del self.active_connections[ied_name]
                 
@@ -1040,14 +1508,14 @@ class EasyEditorWidget(QWidget):
         connected_count = len(self.active_connections)
         
         if connected_count == 0:
-            if self.connectionStatus:
+            if self.connectionStatus is not None:
                 self.connectionStatus.setText("🔴 Disconnected")
-            if self.monitorBtn:
+            if self.monitorBtn is not None:
                 self.monitorBtn.setEnabled(False)
         else:
-            if self.connectionStatus:
+            if self.connectionStatus is not None:
                 self.connectionStatus.setText(f"🟢 Connected ({connected_count})")
-            if self.monitorBtn:
+            if self.monitorBtn is not None:
                 self.monitorBtn.setEnabled(True)
                 
     # Monitoring Methods
@@ -1066,7 +1534,7 @@ class EasyEditorWidget(QWidget):
         self.monitoring_enabled = True
         self.monitoring_timer.start(1000)  # Refresh every 1 second
         
-        if self.monitorBtn:
+        if self.monitorBtn is not None:
             self.monitorBtn.setText("⏹️ Stop Monitor")
         
         self.log_operation("Started value monitoring")
@@ -1078,8 +1546,10 @@ class EasyEditorWidget(QWidget):
             
         self.monitoring_enabled = False
         self.monitoring_timer.stop()
+        # แต่ละ poller ปิด report / ลบ data set ของตัวเองก่อนจบ thread
+        self._stop_pollers()
         
-        if self.monitorBtn:
+        if self.monitorBtn is not None:
             self.monitorBtn.setText("▶️ Monitor")
         
         self.log_operation("Stopped value monitoring")
@@ -1089,10 +1559,174 @@ class EasyEditorWidget(QWidget):
         if not self.monitoring_enabled:
             return
             
-        # Refresh values in all LN boxes
+        # Group object paths by IED; each IED's poller reads them with one request
+        paths_by_ied: Dict[str, Dict[str, None]] = {}
         for ln_box in self.dropZone.ln_boxes:
             if ln_box.ied_connection and ln_box.object_path:
-                ln_box.refresh_value()
+                ied_name = ln_box.ln_data.get('_ied_name', '')
+                paths_by_ied.setdefault(ied_name, {})[ln_box.object_path] = None
+                
+        for ied_name, paths in paths_by_ied.items():
+            poller = self._get_poller(ied_name)
+            if poller is not None:
+                poller.enqueue(tuple(paths))
+            
+    def _get_poller(self, ied_name: str) -> Optional[IEDPoller]:
+        """ดึง (หรือสร้าง) worker thread สำหรับ IED
+        คืน None ถ้า poller ตัวเก่าของ IED ยังปิด data set / report ไม่เสร็จ (ใช้ @Monitor1 ชื่อเดียวกัน)
+        """
+        poller = self.pollers.get(ied_name)
+        if poller is None:
+            if ied_name in self._stopping_pollers:
+                return None
+            poller = IEDPoller(ied_name, self.read_monitoring_values, self.stop_monitoring_values, self)
+            poller.values_ready.connect(self.on_poll_values_ready)
+            poller.start()
+            self.pollers[ied_name] = poller
+        return poller
+        
+    def _stop_pollers(self, ied_name: Optional[str] = None):
+        """หยุด worker thread ของ IED ที่ระบุ (หรือทั้งหมด) โดยไม่รอบน GUI thread
+        thread จบเองหลังอ่านรอบที่ค้างและปิด report แล้วค่อย deleteLater
+        """
+        names = [ied_name] if ied_name else list(self.pollers.keys())
+        for name in names:
+            poller = self.pollers.pop(name, None)
+            if poller:
+                self._stopping_pollers[name] = poller
+                poller.finished.connect(lambda name=name, poller=poller: self._on_poller_finished(name, poller))
+                poller.stop()
+                
+    def _on_poller_finished(self, ied_name: str, poller: IEDPoller):
+        """ทิ้ง poller ที่ thread จบแล้ว"""
+        if self._stopping_pollers.get(ied_name) is poller:
+            del self._stopping_pollers[ied_name]
+        poller.deleteLater()
+                
+    def on_poll_values_ready(self, ied_name: str, results: Dict[str, Tuple[Optional[Any], Optional[str]]]):
+        """รับผลการอ่านจาก worker (ทำงานบน GUI thread) แล้วกระจายให้ LN boxes"""
+        if not self.monitoring_enabled:
+            return
+            
+        self.apply_read_results(ied_name, results)
+        
+    def request_single_read(self, ied_name: str, object_path: str):
+        """อ่านค่าเดี่ยว (เปลี่ยน DA / กด refresh / เพิ่งเชื่อมต่อ) บน QThreadPool"""
+        QThreadPool.globalInstance().start(
+            ReadValueJob(ied_name, object_path, self.read_da_value, self.state_bus)
+        )
+        
+    def apply_read_results(self, ied_name: str, results: Dict[str, Tuple[Optional[Any], Optional[str]]]):
+        """กระจายผลการอ่านให้ LN boxes ที่ตรงกับ object path (GUI thread)"""
+        for ln_box in self.dropZone.ln_boxes:
+            if ln_box.object_path in results and ln_box.ln_data.get('_ied_name', '') == ied_name:
+                value, error = results[ln_box.object_path]
+                ln_box.apply_read_result(value, error)
+                
+    MONITORING_DATASET = "@Monitor1"
+    
+    def _rebuild_monitoring_dataset(self, ied_name: str, paths: Tuple[str, ...],
+                                    state: MonitoringState) -> bool:
+        """สร้าง dynamic data set ใหม่ให้ตรงกับ object paths ที่ monitor อยู่"""
+        if state.dataset_created:
+            self.connection_manager.delete_data_set(ied_name, self.MONITORING_DATASET)
+            
+        error = self.connection_manager.create_data_set(
+            ied_name,
+            self.MONITORING_DATASET,
+            [f"{path}[ST]" for path in paths]
+        )
+        
+        created = error is None
+        state.paths = paths
+        state.dataset_created = created
+        
+        if created:
+            self.log_operation(f"Monitoring data set for {ied_name}: {len(paths)} attribute(s)")
+        else:
+            self.log_operation(f"Data set not available on {ied_name}, using batch read: {error}", "warning")
+            
+        return created
+        
+    def _enable_monitoring_report(self, ied_name: str, paths: Tuple[str, ...],
+                                  state: MonitoringState) -> bool:
+        """ผูก URCB ที่ว่างเข้ากับ monitoring data set ให้ IED ส่งเฉพาะค่าที่เปลี่ยน"""
+        logical_device = paths[0].partition('/')[0]
+        rcb_reference = self.connection_manager.find_free_urcb(ied_name, logical_device)
+        if not rcb_reference:
+            self.log_operation(f"No free report control block on {ied_name}, polling data set", "warning")
+            return False
+            
+        def on_report(report_ied: str, changed: Dict[int, Any]):
+            # เรียกจาก thread ของ libiec61850 - signal ส่งต่อไป GUI thread (queued)
+            if state.stopped:
+                return
+            self.state_bus.values_ready.emit(report_ied, {
+                paths[index]: (value, None)
+                for index, value in changed.items() if index < len(paths)
+            })
+            
+        error = self.connection_manager.enable_report(
+            ied_name, rcb_reference, self.MONITORING_DATASET, on_report
+        )
+        if error:
+            self.log_operation(f"Reports not available on {ied_name}, polling data set: {error}", "warning")
+            return False
+            
+        state.rcb_reference = rcb_reference
+        self.log_operation(f"Monitoring {ied_name} by report ({rcb_reference})")
+        return True
+        
+    def _disable_monitoring_report(self, ied_name: str, state: MonitoringState):
+        """ปิด report ของ IED (ถ้ามี)"""
+        rcb_reference, state.rcb_reference = state.rcb_reference, None
+        if rcb_reference and self.connection_manager:
+            self.connection_manager.disable_report(ied_name, rcb_reference)
+            
+    def read_monitoring_values(self, ied_name: str, paths: Tuple[str, ...],
+                               state: MonitoringState) -> Dict[str, Tuple[Optional[Any], Optional[str]]]:
+        """อ่านค่าทั้งหมดที่ monitor ของ IED (IEDPoller thread) - ใช้ report ถ้า IED มี URCB ว่าง
+        ไม่งั้นอ่านด้วย GetDataSetValues ครั้งเดียว (คืน {} เมื่อค่ามาทาง report)
+        """
+        if state.stopped:
+            return {}
+            
+        if not self.connection_manager or ied_name not in self.active_connections:
+            return self.batch_read_da_values(ied_name, list(paths))
+            
+        # Rebuild lazily เมื่อชุด object paths เปลี่ยน (เพิ่ม/ลบ LN box หรือเปลี่ยน DA)
+        if state.paths != paths:
+            # data set ที่ RCB ใช้อยู่ลบไม่ได้ - ปิด report ก่อน
+            self._disable_monitoring_report(ied_name, state)
+            created = self._rebuild_monitoring_dataset(ied_name, paths, state)
+            if created and not state.stopped:
+                self._enable_monitoring_report(ied_name, paths, state)
+        else:
+            created = state.dataset_created
+            
+        # IED ส่งการเปลี่ยนแปลงมาเองผ่าน report - ไม่ต้อง poll
+        if state.rcb_reference:
+            return {}
+            
+        if created:
+            values, error = self.connection_manager.read_data_set_values(
+                ied_name, self.MONITORING_DATASET
+            )
+            if not error and isinstance(values, list) and len(values) == len(paths):
+                return {path: (value, None) for path, value in zip(paths, values)}
+                
+            # Data set ใช้ไม่ได้แล้ว - สร้างใหม่ในรอบถัดไป
+            state.paths = None
+            
+        return self.batch_read_da_values(ied_name, list(paths))
+        
+    def stop_monitoring_values(self, ied_name: str, state: MonitoringState):
+        """ปิด report และลบ data set ของ monitoring (IEDPoller thread ตอนหยุด)"""
+        self._disable_monitoring_report(ied_name, state)
+        if state.dataset_created and self.connection_manager:
+            self.connection_manager.delete_data_set(ied_name, self.MONITORING_DATASET)
+        state.paths = None
+        state.dataset_created = False
                 
     # Safety and Mode Methods
     def toggle_safety_mode(self, checked: bool):
@@ -1113,22 +1747,32 @@ class EasyEditorWidget(QWidget):
         
         if not checked:
             # Show warning
-            reply = QMessageBox.warning(self, "Live Mode Warning",
-                                      "⚠️ Switching to LIVE MODE!\n\n"
-                                      "All commands will be sent to real IEDs.\n"
-                                      "Are you sure?",
-                                      QMessageBox.StandardButton.Yes | 
-                                      QMessageBox.StandardButton.No,
-                                      QMessageBox.StandardButton.No)
+            reply = self._ask_live_mode("switch",
+                                        "⚠️ Switching to LIVE MODE!\n\n"
+                                        "All commands will be sent to real IEDs.\n"
+                                        "Are you sure?")
             
             if reply == QMessageBox.StandardButton.No:
-                if self.testMode:
+                if self.testMode is not None:
                     self.testMode.setChecked(True)
                 self.test_mode = True
                 return
                 
         self.log_operation(f"Mode: {'Test' if checked else 'LIVE'}")
         
+    def _ask_live_mode(self, key: str, text: str) -> QMessageBox.StandardButton:
+        """ถามยืนยัน Live Mode - สร้าง QMessageBox ครั้งแรกแล้วใช้ซ้ำทุกคำสั่ง"""
+        box = self._live_mode_prompts.get(key)
+        if box is None:
+            box = QMessageBox(QMessageBox.Icon.Warning, "Live Mode Warning", text,
+                              QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                              self)
+            box.setDefaultButton(QMessageBox.StandardButton.No)
+            self._live_mode_prompts[key] = box
+            
+        box.exec()
+        return box.standardButton(box.clickedButton())
+        
     # Value Reading/Writing Methods
     def read_da_value(self, ied_name: str, object_path: str) -> Tuple[Optional[Any], Optional[str]]:
         """Read value from IED"""
@@ -1149,6 +1793,26 @@ class EasyEditorWidget(QWidget):
         except Exception as e:
             return None, str(e)
             
+    def batch_read_da_values(self, ied_name: str,
+                             object_paths: List[str]) -> Dict[str, Tuple[Optional[Any], Optional[str]]]:
+        """Read several values from one IED in a single request"""
+        if not self.connection_manager:
+            return {path: (None, "Connection manager not available") for path in object_paths}
+            
+        if ied_name not in self.active_connections:
+            return {path: (None, "IED not connected") for path in object_paths}
+            
+        try:
+            results = self.connection_manager.read_values(ied_name, object_paths)
+        except Exception as e:
+            return {path: (None, str(e)) for path in object_paths}
+            
+        for path, (value, error) in results.items():
+            if not error:
+                self.log_operation(f"Read {path}: {value}")
+                
+        return results
+            
     def send_control_command(self, ied_name: str, control_path: str, value: Any) -> bool:
         """Send control command to IED"""
         if not self.connection_manager:
@@ -1194,13 +1858,10 @@ class EasyEditorWidget(QWidget):
         # Check if in test mode
         if not self.test_mode:
             # Extra confirmation for live mode
-            reply = QMessageBox.warning(self, "Live Mode Warning",
-                                       "⚠️ You are in LIVE MODE!\n\n"
-                                       "This will send real commands to the IED.\n"
-                                       "Are you sure you want to continue?",
-                                       QMessageBox.StandardButton.Yes | 
-                                       QMessageBox.StandardButton.No,
-                                       QMessageBox.StandardButton.No)
+            reply = self._ask_live_mode("control",
+                                        "⚠️ You are in LIVE MODE!\n\n"
+                                        "This will send real commands to the IED.\n"
+                                        "Are you sure you want to continue?")
             
             if reply == QMessageBox.StandardButton.No:
                 return False
@@ -1215,7 +1876,7 @@ class EasyEditorWidget(QWidget):
     # Logging Methods
     def log_operation(self, message: str, level: str = "info"):
         """Log operation"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         
         if level == "error":
             prefix = "❌"
@@ -1227,56 +1888,52 @@ class EasyEditorWidget(QWidget):
             prefix = "ℹ️"
             
         log_entry = f"[{timestamp}] {prefix} {message}"
+        # deque(maxlen) ตัดรายการเก่าทิ้งเอง และ append ได้จาก worker threads
         self.operation_log.append(log_entry)
         
-        # Keep log size reasonable
-        if len(self.operation_log) > 1000:
-            self.operation_log = self.operation_log[-1000:]
-            
         # Also print to console
         print(log_entry)
         
     def load_files(self):
         """Load SCL files from directory - เหมือนกับ Publisher_Page"""
         try:
-            if self.filesListShow:
-                self.filesListShow.clear()
             self.current_folder = None
             
             if not self.root_dir.exists():
-                if self.filesListShow:
-                    self.filesListShow.addItem("❌ after_convert folder not found")
+                self._replace_list_items(self.filesListShow, ["❌ after_convert folder not found"])
                 return
             
-            # List folders
-            for folder in sorted(self.root_dir.iterdir()):
-                if folder.is_dir():
-                    if self.filesListShow:
-                        self.filesListShow.addItem(f"📁 {folder.name}")
+            # List folders - scandir อ่าน directory ครั้งเดียว ใช้ d_type แทน stat() ทีละตัว
+            with os.scandir(self.root_dir) as entries:
+                folder_names = sorted(entry.name for entry in entries if entry.is_dir())
+            self._replace_list_items(self.filesListShow, [
+                self._file_item(f"📁 {name}", self.root_dir / name) for name in folder_names
+            ])
             
-            print(f"📂 Found {self.filesListShow.count() if self.filesListShow else 0} folders")
+            print(f"📂 Found {self.filesListShow.count() if self.filesListShow is not None else 0} folders")
             
         except Exception as e:
             print(f"❌ Error loading files: {e}")
     
+    @staticmethod
+    def _file_item(text: str, path: Optional[Path]) -> QListWidgetItem:
+        """Item ใน filesListShow ที่เก็บ Path ไว้ใน UserRole (None = กลับไปหน้า folders)"""
+        item = QListWidgetItem(text)
+        item.setData(Qt.ItemDataRole.UserRole, path)
+        return item
+        
     def open_file(self, item: QListWidgetItem):
         """Open folder or file - เหมือนกับ Publisher_Page"""
         try:
-            text = item.text()
+            path = item.data(Qt.ItemDataRole.UserRole)
             
-            if text.startswith("📁"):  # Folder
-                folder_name = text.replace("📁 ", "")
-                self.current_folder = self.root_dir / folder_name
-                self.show_folder_contents()
-                
-            elif text.startswith("📄") or text.startswith("📋"):  # File
-                filename = text.replace("📄 ", "").replace("📋 ", "")
-                if self.current_folder:
-                    file_path = self.current_folder / filename
-                    self.load_scl_file(file_path)
-                    
-            elif text.startswith("⬅️"):  # Back
+            if path is None:  # Back
                 self.load_files()
+            elif path.parent == self.root_dir:  # Folder
+                self.current_folder = path
+                self.show_folder_contents()
+            else:  # File
+                self.load_scl_file(path)
                 
         except Exception as e:
             print(f"❌ Error opening: {e}")
@@ -1284,17 +1941,20 @@ class EasyEditorWidget(QWidget):
     def show_folder_contents(self):
         """Show contents of selected folder - เหมือนกับ Publisher_Page"""
         try:
-            if self.filesListShow:
-                self.filesListShow.clear()
-                self.filesListShow.addItem("⬅️ Back to folders")
-            
-            # List SCL and JSON files
-            files = list(self.current_folder.glob("*.scl")) + list(self.current_folder.glob("*.json"))
+            # List SCL and JSON files (อ่าน directory ครั้งเดียวแทน glob สองรอบ)
+            with os.scandir(self.current_folder) as dir_entries:
+                files = sorted(
+                    entry.name for entry in dir_entries
+                    if entry.name.endswith(('.scl', '.json')) and entry.is_file()
+                )
             
-            for file in sorted(files):
-                icon = "📄" if file.suffix == ".scl" else "📋"
-                if self.filesListShow:
-                    self.filesListShow.addItem(f"{icon} {file.name}")
+            entries = [self._file_item("⬅️ Back to folders", None)]
+            entries.extend(
+                self._file_item(f"{'📄' if name.endswith('.scl') else '📋'} {name}",
+                                self.current_folder / name)
+                for name in files
+            )
+            self._replace_list_items(self.filesListShow, entries)
             
             print(f"📁 {self.current_folder.name}: {len(files)} files")
             
@@ -1305,20 +1965,24 @@ class EasyEditorWidget(QWidget):
         """Load SCL or JSON file"""
         try:
             print(f"📖 Loading {file_path.name}...")
+            self._streamed_scl_path = None
             
             # Load JSON
             if file_path.suffix == '.json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.scl_data = json.load(f)
+                self.scl_data = self.read_scl_json(file_path)
             else:
                 # Try to find corresponding JSON
                 json_path = file_path.with_suffix('.json')
                 if json_path.exists():
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        self.scl_data = json.load(f)
+                    self.scl_data = self.read_scl_json(json_path)
                 else:
-                    QMessageBox.warning(self, "File Error", "No JSON file found for SCL")
-                    return
+                    # ยังไม่มี JSON - อ่านแค่ header ของ IED ก่อน ส่วนเต็มอ่านหลังเลือก IED
+                    try:
+                        self.scl_data = self.read_scl_streaming(file_path, frozenset())
+                    except ImportError:
+                        QMessageBox.warning(self, "File Error", "No JSON file found for SCL")
+                        return
+                    self._streamed_scl_path = file_path
             
             self.current_file = file_path
             self.process_scl_data()
@@ -1327,6 +1991,63 @@ class EasyEditorWidget(QWidget):
             print(f"❌ Error loading file: {e}")
             QMessageBox.critical(self, "Load Error", f"Cannot load file:\n{e}")
     
+    def read_scl_json(self, json_path: Path) -> Dict[str, Any]:
+        """อ่าน SCL JSON - ใช้ผลที่ parse ไว้แล้วถ้าเปิดไฟล์เดิมซ้ำ (ไฟล์ไม่เปลี่ยน)"""
+        stat = json_path.stat()
+        cache_key = (str(json_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        
+        if self._scl_cache and self._scl_cache[0] == cache_key:
+            print(f"⚡ Using cached {json_path.name}")
+            return self._scl_cache[1]
+            
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            
+        # เก็บไว้แค่ไฟล์ล่าสุดเพื่อไม่ให้ใช้ memory มากเกินไป
+        self._scl_cache = (cache_key, data)
+        return data
+        
+    SCL_NAMESPACES = {
+        "http://www.iec.ch/61850/2003/SCL": None,
+        "http://www.w3.org/2001/XMLSchema-instance": "xsi",
+    }
+    
+    def read_scl_streaming(self, scl_path: Path, ied_names: Optional[frozenset] = None) -> Dict[str, Any]:
+        """อ่านไฟล์ SCL แบบ streaming (expat) - เก็บเฉพาะ IED และ Communication
+        
+        IED ที่ชื่อไม่อยู่ใน ied_names จะเก็บไว้แค่ attributes (พอสำหรับ dialog เลือก IED)
+        ied_names=None หมายถึงเก็บทุก IED แบบเต็ม
+        """
+        # import ตอนใช้ครั้งแรก - xmltodict ดึง urllib/http.client ตามมาด้วย (~20ms ตอนเปิดหน้า)
+        import xmltodict
+        
+        ieds: List[Dict[str, Any]] = []
+        scl: Dict[str, Any] = {'IED': ieds}
+        
+        def on_section(path, item):
+            tag, attrs = path[-1]
+            if tag == 'IED':
+                name = (attrs or {}).get('name')
+                if ied_names is None or name in ied_names:
+                    ieds.append(item if isinstance(item, dict) else {})
+                else:
+                    ieds.append({f'@{key}': value for key, value in (attrs or {}).items()})
+            elif tag == 'Communication':
+                scl['Communication'] = item
+            # section อื่น (DataTypeTemplates, Substation, ...) ทิ้งไปเลย
+            return True
+        
+        with open(scl_path, 'rb') as f:
+            xmltodict.parse(
+                f,
+                attr_prefix="@",
+                process_namespaces=True,
+                namespaces=self.SCL_NAMESPACES,
+                item_depth=2,
+                item_callback=on_section,
+            )
+        return {'SCL': scl}
+        
     def process_scl_data(self):
         """Process loaded SCL data"""
         try:
@@ -1347,6 +2068,12 @@ class EasyEditorWidget(QWidget):
                 print(f"DEBUG: Selected IEDs = {self.selected_ied_configs}")
             
                 if self.selected_ied_configs:
+                    # SCL ที่อ่านแบบ streaming - อ่านรายละเอียดเฉพาะ IED ที่เลือก
+                    if self._streamed_scl_path:
+                        self.scl_data = self.read_scl_streaming(
+                            self._streamed_scl_path,
+                            frozenset(config['ied_name'] for config in self.selected_ied_configs)
+                        )
                     # Extract logical nodes ทันทีหลังเลือก IED
                     self.extract_logical_nodes()
                     # จากนั้นค่อย populate IED combo
@@ -1354,7 +2081,7 @@ class EasyEditorWidget(QWidget):
                     print(f"✅ Selected {len(self.selected_ied_configs)} IEDs")
                     
                     # Enable connection action
-                    if self.connectBtn:
+                    if self.connectBtn is not None:
                         self.connectBtn.setEnabled(True)
                     
                     # กลับไปหน้า folders list หลังเลือก IED เสร็จ
@@ -1378,39 +2105,20 @@ class EasyEditorWidget(QWidget):
             if not isinstance(ieds, list):
                 ieds = [ieds]
             
+            # IP ของแต่ละ IED จาก Communication - เดินครั้งเดียวแทนการวนซ้ำต่อ IED
+            ip_by_ied = self._build_ip_map(self.scl_data['SCL'].get('Communication') or {})
+            
             # Extract basic info
             for ied in ieds:
+                ied_name = ied.get('@name', 'Unknown')
                 config = {
-                    'ied_name': ied.get('@name', 'Unknown'),
+                    'ied_name': ied_name,
                     'manufacturer': ied.get('@manufacturer', ''),
                     'type': ied.get('@type', ''),
-                    'ip_address': '192.168.1.100',  # Default
+                    'ip_address': ip_by_ied.get(ied_name, '192.168.1.100'),  # Default
                     'mms_port': 102
                 }
                 
-                # Try to find IP from Communication section
-                comm = self.scl_data['SCL'].get('Communication', {})
-                subnets = comm.get('SubNetwork', [])
-                if not isinstance(subnets, list):
-                    subnets = [subnets]
-                
-                for subnet in subnets:
-                    caps = subnet.get('ConnectedAP', [])
-                    if not isinstance(caps, list):
-                        caps = [caps]
-                    
-                    for cap in caps:
-                        if cap.get('@iedName') == config['ied_name']:
-                            # Extract IP
-                            address = cap.get('Address', {})
-                            p_elements = address.get('P', [])
-                            if not isinstance(p_elements, list):
-                                p_elements = [p_elements]
-                            
-                            for p in p_elements:
-                                if isinstance(p, dict) and p.get('@type') == 'IP':
-                                    config['ip_address'] = p.get('#text', config['ip_address'])
-                
                 configs.append(config)
             
         except Exception as e:
@@ -1418,9 +2126,35 @@ class EasyEditorWidget(QWidget):
         
         return configs
     
+    @staticmethod
+    def _build_ip_map(comm: Dict[str, Any]) -> Dict[str, str]:
+        """สร้าง map iedName -> IP จาก ConnectedAP/Address/P (ค่าที่เจอทีหลังทับค่าก่อนหน้า)"""
+        ip_by_ied: Dict[str, str] = {}
+        
+        subnets = comm.get('SubNetwork', [])
+        if not isinstance(subnets, list):
+            subnets = [subnets]
+            
+        for subnet in subnets:
+            caps = subnet.get('ConnectedAP', [])
+            if not isinstance(caps, list):
+                caps = [caps]
+                
+            for cap in caps:
+                ied_name = cap.get('@iedName')
+                p_elements = cap.get('Address', {}).get('P', [])
+                if not isinstance(p_elements, list):
+                    p_elements = [p_elements]
+                    
+                for p in p_elements:
+                    if isinstance(p, dict) and p.get('@type') == 'IP' and '#text' in p:
+                        ip_by_ied[ied_name] = p['#text']
+                        
+        return ip_by_ied
+        
     def populate_ied_combo(self):
         """Populate IED combo with selected IEDs"""
-        if self.iedCombo:
+        if self.iedCombo is not None:
             self.iedCombo.clear()
             self.iedCombo.addItem("Select IED...")
             
@@ -1439,16 +2173,21 @@ class EasyEditorWidget(QWidget):
             return
             
         # Get selected IED names
-        selected_ied_names = [config['ied_name'] for config in self.selected_ied_configs]
+        selected_ied_names = frozenset(config['ied_name'] for config in self.selected_ied_configs)
             
         scl = self.scl_data.get('SCL', {})
-        ieds = scl.get('IED', [])
         
-        if isinstance(ieds, dict):
-            ieds = [ieds]
-            
-        for ied in ieds:
-            if not isinstance(ied, dict):
+        # local aliases - loop นี้วิ่งทุก LN ของทุก IED ที่เลือก
+        logical_nodes = self.logical_nodes
+        append = logical_nodes.append
+        intern = sys.intern
+        
+        def as_list(value):
+            # JSON จาก xmltodict ให้ dict เมื่อมี element เดียว, list เมื่อมีหลายตัว
+            return value if type(value) is list else [value]
+        
+        for ied in as_list(scl.get('IED', [])):
+            if type(ied) is not dict:
                 continue
                 
             ied_name = ied.get('@name', 'Unknown')
@@ -1456,71 +2195,98 @@ class EasyEditorWidget(QWidget):
             # Skip IEDs ที่ไม่ได้เลือก
             if ied_name not in selected_ied_names:
                 continue
+            ied_name = intern(ied_name)
             
             print(f"  🔍 Processing IED: {ied_name}")
             
             # ดึง AccessPoint -> Server -> LDevice (เหมือน Publisher_Page.py)
-            aps = ied.get('AccessPoint', [])
-            if not isinstance(aps, list):
-                aps = [aps]
-            
-            for ap in aps:
-                if not isinstance(ap, dict):
+            for ap in as_list(ied.get('AccessPoint', [])):
+                if type(ap) is not dict:
                     continue
                 
-                server = ap.get('Server', {})
+                server = ap.get('Server')
                 if not server:
                     continue
                 
                 # ดึง Logical Devices จาก Server
-                lds = server.get('LDevice', [])
-                if isinstance(lds, dict):
-                    lds = [lds]
-                    
-                for ld in lds:
-                    if not isinstance(ld, dict):
+                for ld in as_list(server.get('LDevice', [])):
+                    if type(ld) is not dict:
                         continue
                         
-                    ld_name = ld.get('@inst', 'Unknown')
+                    ld_name = intern(ld.get('@inst', 'Unknown'))
                     print(f"    📂 Found LogicalDevice: {ld_name}")
                     
-                    # ดึง Logical Nodes
-                    ln_count = 0
+                    # ดึง Logical Nodes - สร้าง record ใหม่ (shallow copy) ไม่แก้ dict ใน scl_data
+                    # DOI/SDI ข้างในยังชี้ไปที่ object เดิม ไม่ได้ copy ซ้ำ
+                    start_count = len(logical_nodes)
                     
                     # ดึง LN0 (ถ้ามี)
                     ln0 = ld.get('LN0')
-                    if ln0 and isinstance(ln0, dict):
-                        ln0['@lnClass'] = 'LLN0'  # ใช้ LLN0 สำหรับ LN0
-                        ln0['@inst'] = ''  # LN0 ไม่มี inst
-                        ln0['@prefix'] = ''  # LN0 ไม่มี prefix
-                        ln0['_ied_name'] = ied_name
-                        ln0['_ld_name'] = ld_name
-                        self.logical_nodes.append(ln0)
-                        ln_count += 1
+                    if ln0 and type(ln0) is dict:
+                        append({
+                            **ln0,
+                            '@lnClass': 'LLN0',  # ใช้ LLN0 สำหรับ LN0
+                            '@inst': '',  # LN0 ไม่มี inst
+                            '@prefix': '',  # LN0 ไม่มี prefix
+                            '_ied_name': ied_name,
+                            '_ld_name': ld_name,
+                        })
                     
                     # ดึง LN อื่นๆ
-                    lns = ld.get('LN', [])
-                    if isinstance(lns, dict):
-                        lns = [lns]
-                        
-                    for ln in lns:
-                        if isinstance(ln, dict):
+                    for ln in as_list(ld.get('LN', [])):
+                        if type(ln) is dict:
                             # เพิ่มข้อมูล context
-                            ln['_ied_name'] = ied_name
-                            ln['_ld_name'] = ld_name
-                            self.logical_nodes.append(ln)
-                            ln_count += 1
+                            record = {**ln, '_ied_name': ied_name, '_ld_name': ld_name}
+                            ln_class = record.get('@lnClass')
+                            if type(ln_class) is str:
+                                record['@lnClass'] = intern(ln_class)
+                            append(record)
                     
-                    print(f"      ✅ Found {ln_count} logical nodes")
+                    print(f"      ✅ Found {len(logical_nodes) - start_count} logical nodes")
         
+        self._index_logical_nodes()
         print(f"📊 Total: Extracted {len(self.logical_nodes)} logical nodes from selected IEDs")
         
+    def _index_logical_nodes(self):
+        """สร้าง search key และ bucket ตาม IED / category ของแต่ละ LN ไว้ครั้งเดียว"""
+        category_of = self._ln_class_to_category.get
+        get = dict.get
+        search_keys: List[str] = []
+        by_ied: Dict[str, LNBucket] = {}
+        by_category: Dict[str, LNBucket] = {}
+        by_ied_category: Dict[Tuple[str, str], LNBucket] = {}
+        
+        # ชุด LN ใหม่ - JSON drag text ของชุดเก่าใช้ไม่ได้แล้ว
+        if self.lnList is not None:
+            self.lnList.model().clear_drag_text()
+        
+        for ln in self.logical_nodes:
+            ln_class = get(ln, '@lnClass', '')
+            category = category_of(ln_class, 'Other')
+            ied_name = get(ln, '_ied_name', '')
+            # \0 คั่นแต่ละ field เพื่อไม่ให้ค้นเจอข้ามรอยต่อระหว่าง field
+            key = f"{get(ln, '@prefix', '')}\0{ln_class}\0{get(ln, '@inst', '')}".lower()
+            search_keys.append(key)
+            for buckets, bucket_key in ((by_ied, ied_name), (by_category, category),
+                                        (by_ied_category, (ied_name, category))):
+                bucket = buckets.get(bucket_key)
+                if bucket is None:
+                    bucket = buckets[bucket_key] = ([], [])
+                bucket[0].append(ln)
+                bucket[1].append(key)
+            
+        self._ln_search_key = search_keys
+        self._ln_by_ied = by_ied
+        self._ln_by_category = by_category
+        self._ln_by_ied_category = by_ied_category
+        self._last_filter_key = None
+        
     def on_ied_changed(self, ied_text: str):
         """เมื่อเลือก IED ใหม่ - filter logical nodes"""
         if not ied_text or ied_text == "Select IED...":
             # Clear list when no IED selected
-            if self.lnList:
-                self.lnList.clear()
+            self._clear_ln_list()
+            self._last_filter_key = None
             return
         
         # Filter logical nodes ตาม IED ที่เลือก
@@ -1529,60 +2295,48 @@ class EasyEditorWidget(QWidget):
     def filter_logical_nodes(self):
         """กรอง logical nodes ตาม criteria รวมถึง IED ที่เลือก"""
         if not self.logical_nodes:
-            if self.lnList:
-                self.lnList.clear()
+            self._clear_ln_list()
+            self._last_filter_key = None
             return
         
+        ied_text = self.iedCombo.currentText() if self.iedCombo is not None else ""
+        category_filter = self.categoryCombo.currentText() if self.categoryCombo is not None else ""
+        search_text = self.searchBox.text().lower() if self.searchBox is not None else ""
+        
+        # signal ซ้ำ (เช่น repopulate combo / setText เดิม) ไม่ต้องกรองและสร้าง list ใหม่
+        filter_key = (ied_text, category_filter, search_text)
+        if filter_key == self._last_filter_key:
+            return
+        self._last_filter_key = filter_key
+        
         # Filter by selected IED first
-        ied_text = self.iedCombo.currentText() if self.iedCombo else ""
-        if ied_text and ied_text != "Select IED...":
-            # Extract IED name from combo text
-            if ied_text.startswith("🏭 "):
-                selected_ied_name = ied_text.replace("🏭 ", "")
-                filtered_by_ied = [ln for ln in self.logical_nodes if ln.get('_ied_name') == selected_ied_name]
-            else:
-                filtered_by_ied = self.logical_nodes[:]
-        else:
+        if not ied_text or ied_text == "Select IED...":
             # No IED selected - show empty list
-            if self.lnList:
-                self.lnList.clear()
+            self._clear_ln_list()
             return
+        selected_ied_name = ied_text[len("🏭 "):] if ied_text.startswith("🏭 ") else None
             
         # Filter by category
-        category_filter = self.categoryCombo.currentText() if self.categoryCombo else ""
-        if category_filter and category_filter != "All Categories":
-            category_lns = self.ln_categories.get(category_filter, [])
-            filtered_by_category = [
-                ln for ln in filtered_by_ied 
-                if ln.get('@lnClass', '') in category_lns
-            ]
+        if not category_filter or category_filter == "All Categories":
+            category_filter = None
+            
+        # IED / category มาจาก bucket ที่เตรียมไว้ - เหลือแค่เช็ค search text กับ LN ที่ตรง
+        if selected_ied_name is not None:
+            if category_filter is None:
+                bucket = self._ln_by_ied.get(selected_ied_name)
+            else:
+                bucket = self._ln_by_ied_category.get((selected_ied_name, category_filter))
+        elif category_filter is not None:
+            bucket = self._ln_by_category.get(category_filter)
         else:
-            # If "All Categories" or "Other", include all
-            filtered_by_category = filtered_by_ied[:]
-            
-            # Special handling for "Other" category - include LNs not in any defined category
-            if category_filter == "Other":
-                all_defined_lns = []
-                for cat_lns in self.ln_categories.values():
-                    if isinstance(cat_lns, list):
-                        all_defined_lns.extend(cat_lns)
-                
-                filtered_by_category = [
-                    ln for ln in filtered_by_ied 
-                    if ln.get('@lnClass', '') not in all_defined_lns
-                ]
+            bucket = (self.logical_nodes, self._ln_search_key)
             
-        # Filter by search text
-        search_text = self.searchBox.text().lower() if self.searchBox else ""
+        nodes, keys = bucket if bucket is not None else ([], [])
         if search_text:
-            self.filtered_nodes = [
-                ln for ln in filtered_by_category
-                if (search_text in ln.get('@prefix', '').lower() or
-                    search_text in ln.get('@lnClass', '').lower() or
-                    search_text in str(ln.get('@inst', '')).lower())
-            ]
+            self.filtered_nodes = [ln for ln, key in zip(nodes, keys) if search_text in key]
         else:
-            self.filtered_nodes = filtered_by_category[:]
+            # ไม่มี search text - ใช้ list ของ bucket เลย ไม่ต้อง copy
+            self.filtered_nodes = nodes
             
         self.populate_ln_list()
         
@@ -1592,13 +2346,32 @@ class EasyEditorWidget(QWidget):
             print(f"📊 Filtered to {len(self.filtered_nodes)} logical nodes for IED: {ied_name}")
         
     def populate_ln_list(self):
-        """เติมข้อมูล logical nodes ใน list"""
-        if self.lnList:
-            self.lnList.clear()
+        """แสดง filtered_nodes ใน list (model อ้าง list เดิม ไม่สร้าง item ต่อแถว)"""
+        if self.lnList is not None:
+            self.lnList.model().set_nodes(self.filtered_nodes)
             
-            for ln in self.filtered_nodes:
-                item = LogicalNodeItem(ln)
-                self.lnList.addItem(item)
+    def _clear_ln_list(self):
+        self.filtered_nodes = []
+        self.populate_ln_list()
+        
+    @staticmethod
+    def _replace_list_items(list_widget: Optional[QListWidget], items: List[Any]):
+        """แทนที่ items ทั้งหมดใน list ในครั้งเดียว (ไม่ relayout/repaint ทีละ item)"""
+        # ห้ามใช้ `if not list_widget` - QListWidget ที่ว่างอยู่มีค่าเป็น False (__len__)
+        if list_widget is None:
+            return
+        list_widget.setUpdatesEnabled(False)
+        list_widget.blockSignals(True)
+        try:
+            list_widget.clear()
+            if items and isinstance(items[0], str):
+                list_widget.addItems(items)
+            else:
+                for item in items:
+                    list_widget.addItem(item)
+        finally:
+            list_widget.blockSignals(False)
+            list_widget.setUpdatesEnabled(True)
 
 
 def main():
@@ -52,6 +52,12 @@ class LoginPage(QWidget):
         self.showpassword_button = self.findChild(QPushButton, 'showpassword_button')
         self.login_button = self.findChild(QPushButton, 'login_button')
 
+        # ข้อความเริ่มต้นของ login_text - เก็บครั้งเดียวไว้คืนค่าหลังแสดงข้อความเตือน
+        self._default_html = self.login_text.toHtml()
+        self._reset_timer = QTimer(self)
+        self._reset_timer.setSingleShot(True)
+        self._reset_timer.timeout.connect(self.reset_login_text)
+
         # ตั้งค่าเริ่มต้น
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)       
 
@@ -93,8 +99,6 @@ class LoginPage(QWidget):
 
             # ถ้าว่างให้แสดงข้อความเตือน
 
-            original_html = self.login_text.toHtml()
-
             self.login_text.setHtml("""
 
                 <div align="center">
@@ -121,10 +125,7 @@ class LoginPage(QWidget):
 
             # รีเซตข้อความหลัง 2 วินาที
 
-            def reset_text():
-                self.login_text.setHtml(original_html)
-
-            QTimer.singleShot(2000, reset_text)
+            self._reset_timer.start(2000)
 
     def toggle_password_visibility(self):
         if self.password_visible:
@@ -163,7 +164,6 @@ class LoginPage(QWidget):
             self.disable_inputs()
             QTimer.singleShot(1000, self.on_login_success)
         else:
-            original_html = self.login_text.toHtml()
             self.login_text.setHtml("""
                 <div align="center">
                     <span style="color: red; font-size: 20px;">
@@ -174,14 +174,10 @@ class LoginPage(QWidget):
             self.password_input.clear()
             self.password_input.setFocus()
 
-            def reset_text():
-                self.login_text.setHtml(original_html)
-
-            QTimer.singleShot(3000, reset_text)
+            self._reset_timer.start(3000)
 
     def show_warning_message(self, message):
         """แสดงข้อความเตือน"""
-        original_html = self.login_text.toHtml()
         self.login_text.setHtml(f"""
             <div align="center">
                 <span style="color: orange; font-size: 18px;">
@@ -189,10 +185,11 @@ class LoginPage(QWidget):
                 </span>
             </div>
         """)
-        def reset_text():
-            self.login_text.setHtml(original_html)
+        self._reset_timer.start(2000)
 
-        QTimer.singleShot(2000, reset_text)
+    def reset_login_text(self):
+        """คืนข้อความเริ่มต้นของ login_text"""
+        self.login_text.setHtml(self._default_html)
 
     
 
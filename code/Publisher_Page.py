@@ -220,6 +220,7 @@ class VirtualIEDSystem(QWidget):
         # IEDScout view manager
         self.iedscout_manager = IEDScoutViewManager(self.ied_tree)
         self.iedscout_manager.item_edited.connect(self.on_iedscout_item_edited)
+        self.da_value_dialog = None  # DAValueEditorDialog สร้างครั้งแรกที่ใช้ แล้วใช้ซ้ำ
         
         # Statistics
         self.stats = {
@@ -767,15 +768,16 @@ class VirtualIEDSystem(QWidget):
                 if len(path_parts) > 0:
                     da_info['name'] = path_parts[-1]
             
-            # Open dialog
-            dialog = DAValueEditorDialog(da_info, self)
+            # Open dialog (reuse the same instance - only the DA data is reloaded)
+            if self.da_value_dialog is None:
+                self.da_value_dialog = DAValueEditorDialog(parent=self)
+            dialog = self.da_value_dialog
+            dialog.load_da(da_info)
             
-            def on_value_changed(da_name, new_value):
+            if dialog.exec() == QDialog.DialogCode.Accepted:
+                _, new_value = dialog.get_value()
                 self.on_iedscout_item_edited(iedscout_item, str(new_value))
             
-            dialog.value_changed.connect(on_value_changed)
-            dialog.exec()
-            
         except Exception as e:
             QMessageBox.critical(self, "Edit Error", f"Cannot edit value:\n{e}")
     
@@ -4,12 +4,24 @@ faulthandler.enable()
 
 from PyQt6.QtWidgets import QWidget, QFileDialog, QMessageBox, QVBoxLayout, QPushButton, QLabel
 from ui_helper import load_ui_safe, UIHelper
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QObject, pyqtSignal
 import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from resource_helper import get_ui_path
 
+class _ParseSignals(QObject):
+    """ส่งผลการแปลงไฟล์จาก worker thread กลับมาที่ GUI thread (queued)"""
+    file_done = pyqtSignal(str, object)  # dest_path, exception หรือ None
+
+
+def _parse_scl_file(dest_path: str) -> None:
+    from scl_parser import SCLParser
+    SCLParser(dest_path).split_into_ied_json()
+
+
 class UploadFilePage(QWidget):
     """หน้าสำหรับอัปโหลดไฟล์ SCL ( .scd / .cid / .xml )
     - ไฟล์จริงจะถูกคัดลอกไปยัง  `upload_file/before_convert/`
@@ -48,6 +60,14 @@ class UploadFilePage(QWidget):
         self.back_button.clicked.connect(self.back_to_main)
         self.uploadfile_button.clicked.connect(self.upload_file)
 
+        # แปลงไฟล์ใน background - หน้าจอไม่ค้างระหว่าง parse
+        self._parse_pool = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="scl-parse")
+        self._parse_signals = _ParseSignals(self)
+        self._parse_signals.file_done.connect(self._on_file_parsed)
+        self._pending_parses = 0
+        self._dirs_ready = False
+
     # ------------------------------------------------------------
     def back_to_main(self):
         """ดีเลย์นิดหน่อย เพื่อให้อนิเมชันปุ่มทำงานก่อนกลับ"""
@@ -56,14 +76,17 @@ class UploadFilePage(QWidget):
     # ------------------------------------------------------------
     @staticmethod
     def _generate_renamed_filename(path: str) -> str:
-        """เพิ่มตัวนับ (_1, _2 …) ต่อท้ายไฟล์หากชื่อซ้ำ"""
+        """เพิ่มตัวนับ (_1, _2 …) ต่อท้ายไฟล์หากชื่อซ้ำ
+        - อ่านโฟลเดอร์ครั้งเดียวแล้วใช้ตัวนับถัดจากตัวที่มากที่สุด แทนการ stat ทีละชื่อ
+        """
         base, ext = os.path.splitext(path)
-        counter = 1
-        new_path = f"{base}_{counter}{ext}"
-        while os.path.exists(new_path):
-            counter += 1
-            new_path = f"{base}_{counter}{ext}"
-        return new_path
+        folder, stem = os.path.split(base)
+        flags = re.IGNORECASE if os.name == 'nt' else 0
+        pattern = re.compile(re.escape(stem) + r'_(\d+)' + re.escape(ext) + '$', flags)
+        with os.scandir(folder or '.') as entries:
+            used = [int(m.group(1)) for entry in entries if (m := pattern.match(entry.name))]
+        counter = max(used) + 1 if used else 1
+        return f"{base}_{counter}{ext}"
 
     # ------------------------------------------------------------
     def upload_file(self):
@@ -81,11 +104,13 @@ class UploadFilePage(QWidget):
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
         before_dir = os.path.join(base_dir, 'upload_file', 'before_convert')
         after_dir  = os.path.join(base_dir, 'upload_file', 'after_convert')
-        os.makedirs(before_dir, exist_ok=True)
-        os.makedirs(after_dir,  exist_ok=True)
-
-        from scl_parser import SCLParser  # นำเข้าที่นี่ เพื่อลดเวลาเปิดหน้า UI
+        # สร้างโฟลเดอร์ครั้งแรกครั้งเดียว ไม่ต้อง stat ซ้ำทุกครั้งที่กดอัปโหลด
+        if not self._dirs_ready:
+            os.makedirs(before_dir, exist_ok=True)
+            os.makedirs(after_dir,  exist_ok=True)
+            self._dirs_ready = True
 
+        copied_paths = []
         for file_path in file_paths:
             try:
                 file_name = os.path.basename(file_path)
@@ -110,20 +135,35 @@ class UploadFilePage(QWidget):
                         file_name = os.path.basename(dest_path)
                         print(f"✏️ เปลี่ยนชื่อเป็น: {file_name}")
 
-                shutil.copy(file_path, dest_path)
+                # copyfile ใช้ kernel copy (sendfile) บน Linux / buffer 1 MiB บน Windows
+                # และไม่ต้องคัดลอก permission bits เหมือน shutil.copy
+                shutil.copyfile(file_path, dest_path)
                 print(f"📦 คัดลอก: {file_name}")
-
-                # --------------------------------------------- แปลง + แตกไฟล์
-                json_path = os.path.join(after_dir, os.path.splitext(file_name)[0] + '.json')
-
-                parser = SCLParser(dest_path)
-                parser.split_into_ied_json()          # ← ใช้เมทอดใหม่
-
-
+                copied_paths.append(dest_path)
 
             except Exception as e:
                 print(f"❌ ผิดพลาดในไฟล์ {file_path}: {e}")
 
+        if not copied_paths:
+            return
+
+        # --------------------------------------------- แปลง + แตกไฟล์ (background)
+        # แต่ละไฟล์แยกกันอิสระ - ส่งเข้า pool พร้อมกันแล้วรอผลผ่าน signal
+        self._pending_parses += len(copied_paths)
+        self.uploadfile_button.setEnabled(False)
+        for dest_path in copied_paths:
+            future = self._parse_pool.submit(_parse_scl_file, dest_path)
+            future.add_done_callback(
+                lambda f, path=dest_path: self._parse_signals.file_done.emit(path, f.exception()))
+
+    def _on_file_parsed(self, dest_path: str, error):
+        if error is not None:
+            print(f"❌ ผิดพลาดในไฟล์ {dest_path}: {error}")
+        self._pending_parses -= 1
+        if self._pending_parses > 0:
+            return
+
+        self.uploadfile_button.setEnabled(True)
         print("✅ ดำเนินการกับไฟล์ทั้งหมดเสร็จสิ้น")
 
         QMessageBox.information(
@@ -131,4 +171,4 @@ class UploadFilePage(QWidget):
             "Upload Complete",
             "Upload success",
             QMessageBox.StandardButton.Ok
-        )
\ No newline at end of file
+        )
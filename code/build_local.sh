@@ -143,6 +143,10 @@ build_exe() {
         log_warning "patch_ui_loading.py not found, skipping UI patches"
     fi
     
+    # Pre-compile UI files (load_ui_safe ใช้ ui_compiled/ แทน uic.loadUi)
+    log_info "Compiling UI files..."
+    python code/compile_ui.py
+    
     # Check UI files exist
     if [[ -d "QTDesigner" ]]; then
         UI_COUNT=$(find QTDesigner -name "*.ui" | wc -l)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compile QTDesigner/*.ui -> ui_compiled/Ui_<name>.py (ขั้นตอน build)
+- load_ui_safe จะใช้ module ที่ compile แล้วแทนการ parse XML ด้วย uic.loadUi ทุกครั้งที่เปิดหน้า
+- รันจาก directory ไหนก็ได้:  python code/compile_ui.py
+"""
+
+import io
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+from PyQt6 import uic
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+UI_DIR = os.path.join(CODE_DIR, 'QTDesigner')
+OUT_DIR = os.path.join(CODE_DIR, 'ui_compiled')
+
+# path ของรูปที่ compileUi สร้างเป็น relative "QTDesigner/..." - ให้ resolve ผ่าน resource_path
+# เหมือนที่ loadUi ได้ path มาจาก resource_helper.get_ui_path
+_PIXMAP_PATH = re.compile(r'QtGui\.QPixmap\("(QTDesigner/[^"]*)"\)')
+
+# import ของ promoted widget (<header> ใน .ui) ที่ compileUi สร้างไว้ท้ายไฟล์
+# ถ้าหน้านั้นรันเป็น script module จะอยู่ใน __main__ - import ตรงๆ จะได้ module ซ้ำอีกชุด
+# (class ซ้ำ, _LNRegistry แยกกัน) จึงเปลี่ยนให้ resolve ผ่าน _promoted_module
+_PROMOTED_IMPORT = re.compile(r'^from (?!PyQt6\b)([\w.]+) import (.+)$', re.MULTILINE)
+_PROMOTED_HELPER = '''
+
+def _promoted_module(name):
+    """module ของ promoted widget - ใช้ __main__ ถ้าหน้านั้นถูกรันเป็น script"""
+    import importlib
+    import sys
+    if name not in sys.modules:
+        main = sys.modules.get('__main__')
+        main_file = getattr(main, '__file__', None) or ''
+        if os.path.splitext(os.path.basename(main_file))[0] == name.rpartition('.')[2]:
+            return main
+    return importlib.import_module(name)
+'''
+
+
+def _rewrite_promoted_import(match: re.Match) -> str:
+    names = [name.strip() for name in match.group(2).split(',')]
+    lines = [f"_promoted = _promoted_module({match.group(1)!r})"]
+    lines += [f"{name} = _promoted.{name}" for name in names]
+    return '\n'.join(lines)
+
+
+def compile_ui_file(ui_name: str) -> str:
+    """Compile .ui หนึ่งไฟล์ คืน path ของ module ที่สร้าง"""
+    ui_path = os.path.join(UI_DIR, ui_name)
+    stem = os.path.splitext(ui_name)[0]
+    out_path = os.path.join(OUT_DIR, f'Ui_{stem}.py')
+
+    root = ET.parse(ui_path).getroot().find('widget')
+    base_class = root.get('class')
+    form_class = f"Ui_{root.get('name')}"
+
+    buffer = io.StringIO()
+    # ส่ง path แบบ relative กับ code/ เพื่อให้ path รูปเป็น "QTDesigner/..."
+    cwd = os.getcwd()
+    try:
+        os.chdir(CODE_DIR)
+        uic.compileUi(os.path.join('QTDesigner', ui_name), buffer)
+    finally:
+        os.chdir(cwd)
+
+    # promoted widget ก่อน - ไม่ให้ regex ไปจับ import resource_helper ที่เติมข้างล่าง
+    source, count = _PROMOTED_IMPORT.subn(_rewrite_promoted_import, buffer.getvalue())
+    if count:
+        source = source.replace('from PyQt6 import QtCore, QtGui, QtWidgets',
+                                'import os\n\nfrom PyQt6 import QtCore, QtGui, QtWidgets' + _PROMOTED_HELPER, 1)
+
+    source, count = _PIXMAP_PATH.subn(r'QtGui.QPixmap(resource_path("\1"))', source)
+    if count:
+        source = source.replace('from PyQt6 import QtCore, QtGui, QtWidgets',
+                                'from PyQt6 import QtCore, QtGui, QtWidgets\n'
+                                'from resource_helper import resource_path', 1)
+    source += f'\n\nFormClass = {form_class}\nBASE_CLASS = "{base_class}"\n'
+
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return out_path
+
+
+def main() -> int:
+    os.makedirs(OUT_DIR, exist_ok=True)
+    init_path = os.path.join(OUT_DIR, '__init__.py')
+    if not os.path.exists(init_path):
+        with open(init_path, 'w', encoding='utf-8') as f:
+            f.write('"""Generated by compile_ui.py - do not edit"""\n')
+
+    failed = 0
+    for ui_name in sorted(os.listdir(UI_DIR)):
+        if not ui_name.endswith('.ui'):
+            continue
+        try:
+            out_path = compile_ui_file(ui_name)
+            print(f"✅ {ui_name} -> {os.path.relpath(out_path, CODE_DIR)}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {ui_name}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,13 +7,45 @@ FIXED VERSION - with FCDA validation and enhanced error handling
 
 from __future__ import annotations
 
-import json
+import os
 import re
+import shutil
+from functools import lru_cache
 from pathlib import Path
+from sys import intern
 from typing import Any
 import xmltodict
-from xml.etree import ElementTree as ET
-import copy
+from xml.parsers import expat
+
+# xmltodict-fast (pip install xmltodict-fast) ติดตั้งเป็น module `xmltodict` ตัวเดียวกัน
+# และส่ง unparse() ไปที่ Rust backend เอง (fallback เป็น pure Python ในตัว) - ไม่ต้องแก้ import
+XMLTODICT_BACKEND = getattr(xmltodict, "_BACKEND", "python")
+
+# orjson (optional) parse JSON จาก bytes ตรงๆ ไม่ต้อง decode เป็น str ก่อน - ไม่มีก็ใช้ json ของ stdlib
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Regex ที่ใช้ซ้ำกับทุก string / ทั้งเอกสาร - compile ครั้งเดียวตอน import
+_CTRL_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]')
+_SELFCLOSE_RE = re.compile(r"\s+/>")
+_XSI_DUP_RE = re.compile(r'\s+xmlns:(?!xsi)[^=]+="http://www\.w3\.org/2001/XMLSchema-instance"')
+_AMP_RE = re.compile(r'&(?![a-zA-Z0-9#]+;)')
+_LT_RE = re.compile(r'<(?![/!?a-zA-Z])')
+_GT_RE = re.compile(r'(?<=[^>])>')
+_XML_NAME_RE = re.compile(r'[^\w\-.:@]')
+_XML_BAD_NAME_RE = re.compile(r'[<>/"\'=]')
+_XML_TEXT_SPECIAL_RE = re.compile(r'[&<>]')
+_XML_ATTR_SPECIAL_RE = re.compile(r'[&<>"\n\r\t]')
+
+# ประเภทของ key จาก _classify_key / _classify_section_key
+_KEY_PLAIN = 0      # key ปกติ
+_KEY_SKIP = 1       # ทิ้ง (d6p; ใน _clean_section รวม XMLSchema-instance และ URL อื่นๆ)
+_KEY_SKIP_URL = 2   # ทิ้ง - URL ของ namespace ที่ไม่รู้จัก (แจ้งเตือนต่างจาก _KEY_SKIP)
+_KEY_VENDOR = 3     # namespace URL ของ vendor -> "@prefix:attr"
+_KEY_COLON = 4      # key ที่มี ':' แต่ไม่ใช่ URL - เก็บไว้ตามเดิม
+_KEY_XSI_TYPE = 5   # XMLSchema-instance:type -> "@xsi:type"
 
 
 class JsonToCidConverter:
@@ -33,8 +65,7 @@ class JsonToCidConverter:
         
         try:
             # Read and validate JSON
-            raw = json_path.read_text(encoding="utf-8")
-            scl_obj = json.loads(raw)
+            scl_obj = _json.loads(json_path.read_bytes())
             scl = scl_obj.get("SCL", {})
             
             if not scl:
@@ -45,10 +76,12 @@ class JsonToCidConverter:
             
             # Pre-process data with enhanced FCDA validation
             print("🧹 Pre-processing SCL data...")
-            processed_scl = JsonToCidConverter._preprocess_scl_data(scl)
+            processed_scl, valid_refs = JsonToCidConverter._preprocess_scl_data(scl)
+            # ปล่อย tree ดิบจาก JSON - ต่อจากนี้ใช้แค่ processed_scl (string ซ้ำถูก intern ไว้แล้ว)
+            del scl_obj, scl
             
             # Build new SCL structure
-            new_scl = JsonToCidConverter._build_scl_structure(processed_scl)
+            new_scl = JsonToCidConverter._build_scl_structure(processed_scl, valid_refs)
             
             # Generate XML
             print("🔨 Generating XML...")
@@ -69,31 +102,27 @@ class JsonToCidConverter:
             raise
 
     @staticmethod
-    def _preprocess_scl_data(scl: dict) -> dict:
-        """Pre-process SCL data to clean up issues"""
-        # Deep copy to avoid modifying original
-        processed = copy.deepcopy(scl)
+    def _preprocess_scl_data(scl: dict) -> tuple[dict, set]:
+        """Pre-process SCL data to clean up issues
         
-        # Clean vendor attributes and structure
-        processed = JsonToCidConverter._clean_vendor_attributes(processed)
+        Returns a new tree and its LN references; `scl` itself is never modified,
+        so no defensive deepcopy is needed.
+        """
+        # Clean vendor attributes, fix structure and clean strings in one pass
+        # (the walker builds a new tree - the input is not modified)
+        processed = JsonToCidConverter._walk_and_clean(scl)
         
-        # Fix data structure issues
-        processed = JsonToCidConverter._fix_data_structure(processed)
+        # LN references - collected once, reused by the dangling FCDA check later
+        valid_refs = JsonToCidConverter._collect_valid_refs(processed)
         
-        # Validate and fix FCDA references (NEW)
-        processed = JsonToCidConverter._validate_and_fix_fcda(processed)
+        # Validate and fix FCDA references - needs the complete cleaned tree
+        processed = JsonToCidConverter._validate_and_fix_fcda(processed, valid_refs)
         
-        # Clean string values
-        processed = JsonToCidConverter._clean_all_strings(processed)
-        
-        return processed
+        return processed, valid_refs
 
     @staticmethod
-    def _validate_and_fix_fcda(scl: dict) -> dict:
-        """ตรวจสอบและแก้ไข FCDA ที่ invalid"""
-        print("🔍 Validating FCDA references...")
-        
-        # เก็บ valid references
+    def _collect_valid_refs(scl: dict) -> set:
+        """เก็บ (iedName, ldInst, lnClass, lnInst) ของ LN ทุกตัวใน IED"""
         valid_refs = set()
         
         # หา IED ทั้งหมด
@@ -131,21 +160,12 @@ class JsonToCidConverter:
                         
                     ld_inst = ld.get('@inst', '')
                     
+                    # เก็บแค่ระดับ LN - reference ระดับ DO (…, do_name) จะมีได้ก็ต่อเมื่อ LN
+                    # ของมันอยู่ใน set แล้ว จึงไม่ต้องเก็บ DOI และไม่ต้องเช็ค key ที่มี do_name
+                    
                     # เก็บ LN0
-                    ln0 = ld.get('LN0')
-                    if isinstance(ln0, dict):
+                    if isinstance(ld.get('LN0'), dict):
                         valid_refs.add((ied_name, ld_inst, 'LLN0', ''))
-                        
-                        # เก็บ DOI ใน LN0
-                        dois = ln0.get('DOI', [])
-                        if not isinstance(dois, list):
-                            dois = [dois] if dois else []
-                        
-                        for doi in dois:
-                            if isinstance(doi, dict):
-                                do_name = doi.get('@name', '')
-                                if do_name:
-                                    valid_refs.add((ied_name, ld_inst, 'LLN0', '', do_name))
                     
                     # เก็บ LN อื่นๆ
                     lns = ld.get('LN', [])
@@ -157,84 +177,87 @@ class JsonToCidConverter:
                             continue
                             
                         ln_class = ln.get('@lnClass', '')
-                        ln_inst = ln.get('@inst', '')
-                        
                         if ln_class:
-                            valid_refs.add((ied_name, ld_inst, ln_class, ln_inst))
-                            
-                            # เก็บ DOI ใน LN
-                            dois = ln.get('DOI', [])
-                            if not isinstance(dois, list):
-                                dois = [dois] if dois else []
-                            
-                            for doi in dois:
-                                if isinstance(doi, dict):
-                                    do_name = doi.get('@name', '')
-                                    if do_name:
-                                        valid_refs.add((ied_name, ld_inst, ln_class, ln_inst, do_name))
+                            valid_refs.add((ied_name, ld_inst, ln_class, ln.get('@inst', '')))
         
+        return valid_refs
+
+    @staticmethod
+    def _iter_datasets(node: Any):
+        """Yield every DataSet dict in the tree (DataSet contents are not descended into)
+
+        เดินด้วย stack แทน recursion - push ลูกแบบกลับลำดับเพื่อให้ได้ลำดับตามเอกสารเหมือนเดิม
+        DataSet ที่เจอจะถูก push เป็น tuple (ds,) เพื่อ yield ตอนถึงคิว (tree จาก JSON ไม่มี tuple)
+        """
+        stack = [node]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            obj = pop()
+            t = type(obj)
+            if t is dict:
+                children = []
+                for key, value in obj.items():
+                    if key == "DataSet":
+                        for ds in (value if type(value) is list else [value]):
+                            if type(ds) is dict:
+                                children.append((ds,))
+                    else:
+                        tv = type(value)
+                        if tv is dict or tv is list:
+                            children.append(value)
+                extend(reversed(children))
+            elif t is list:
+                extend(reversed(obj))
+            elif t is tuple:
+                yield obj[0]
+
+    @staticmethod
+    def _validate_and_fix_fcda(scl: dict, valid_refs: set) -> dict:
+        """ตรวจสอบและแก้ไข FCDA ที่ invalid
+        
+        แก้ ds['FCDA'] ของ DataSet ใน scl โดยตรง (in place) - ต้องส่ง tree ที่สร้างใหม่
+        จาก _walk_and_clean เข้ามา ไม่ใช่ข้อมูลต้นฉบับจาก JSON
+        """
+        print("🔍 Validating FCDA references...")
         print(f"Found {len(valid_refs)} valid LN references")
         
         # แก้ไข DataSet
         invalid_count = 0
         fixed_count = 0
         
-        def fix_datasets(obj):
-            nonlocal invalid_count, fixed_count
+        for ds in JsonToCidConverter._iter_datasets(scl):
+            ds_name = ds.get('@name', 'Unknown')
             
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if key == "DataSet":
-                        datasets = value if isinstance(value, list) else [value]
-                        
-                        for ds in datasets:
-                            if not isinstance(ds, dict):
-                                continue
-                                
-                            ds_name = ds.get('@name', 'Unknown')
-                            
-                            # ตรวจสอบและแก้ไข FCDA
-                            fcdas = ds.get('FCDA', [])
-                            if not isinstance(fcdas, list):
-                                fcdas = [fcdas] if fcdas else []
-                            
-                            valid_fcdas = []
-                            for fcda in fcdas:
-                                if not isinstance(fcda, dict):
-                                    continue
-                                
-                                # ตรวจสอบ reference
-                                ied_name = fcda.get('@iedName', '')
-                                ld_inst = fcda.get('@ldInst', '')
-                                ln_class = fcda.get('@lnClass', '')
-                                ln_inst = fcda.get('@lnInst', '')
-                                do_name = fcda.get('@doName', '')
-                                
-                                # ลองหา reference ทั้ง 2 แบบ
-                                ref_key1 = (ied_name, ld_inst, ln_class, ln_inst)
-                                ref_key2 = (ied_name, ld_inst, ln_class, ln_inst, do_name)
-                                
-                                if ref_key1 in valid_refs or ref_key2 in valid_refs:
-                                    valid_fcdas.append(fcda)
-                                    fixed_count += 1
-                                else:
-                                    reference_str = f"{ied_name}/{ld_inst}/{ln_class}{ln_inst}"
-                                    if do_name:
-                                        reference_str += f".{do_name}"
-                                    
-                                    print(f"⚠️ Removing invalid FCDA: {reference_str} from DataSet '{ds_name}'")
-                                    invalid_count += 1
-                            
-                            ds['FCDA'] = valid_fcdas
+            # ตรวจสอบและแก้ไข FCDA
+            fcdas = ds.get('FCDA', [])
+            if not isinstance(fcdas, list):
+                fcdas = [fcdas] if fcdas else []
+            
+            valid_fcdas = []
+            for fcda in fcdas:
+                if not isinstance(fcda, dict):
+                    continue
+                
+                # ตรวจสอบ reference
+                get = fcda.get
+                ied_name = get('@iedName', '')
+                ld_inst = get('@ldInst', '')
+                ln_class = get('@lnClass', '')
+                ln_inst = get('@lnInst', '')
+                
+                if (ied_name, ld_inst, ln_class, ln_inst) in valid_refs:
+                    valid_fcdas.append(fcda)
+                    fixed_count += 1
+                else:
+                    do_name = get('@doName', '')
+                    reference_str = f"{ied_name}/{ld_inst}/{ln_class}{ln_inst}"
+                    if do_name:
+                        reference_str += f".{do_name}"
                     
-                    elif isinstance(value, (dict, list)):
-                        fix_datasets(value)
+                    print(f"⚠️ Removing invalid FCDA: {reference_str} from DataSet '{ds_name}'")
+                    invalid_count += 1
             
-            elif isinstance(obj, list):
-                for item in obj:
-                    fix_datasets(item)
-        
-        fix_datasets(scl)
+            ds['FCDA'] = valid_fcdas
         
         if invalid_count > 0:
             print(f"🔧 Fixed {invalid_count} invalid FCDA references")
@@ -245,99 +268,115 @@ class JsonToCidConverter:
         return scl
 
     @staticmethod
-    def _clean_vendor_attributes(data: Any) -> Any:
-        """Clean vendor attributes and ensure proper namespace handling"""
-        if isinstance(data, dict):
+    def _walk_and_clean(data: Any) -> Any:
+        """Clean vendor attributes, fix structure and clean strings in a single pass
+        
+        Dispatches on exact type (tree comes from JSON - plain dict/list/str only)
+        """
+        t = type(data)
+        if t is dict:
             cleaned = {}
+            classify = JsonToCidConverter._classify_key
             for k, v in data.items():
+                kind, new_key = classify(k)
+                
+                # Regular processing
+                if kind == _KEY_PLAIN:
+                    tv = type(v)
+                    if tv is dict or tv is list:
+                        cleaned_v = JsonToCidConverter._walk_and_clean(v)
+                        if cleaned_v or k in JsonToCidConverter.structural_tags:
+                            # Ensure IED has required attributes
+                            if k == "IED" and tv is dict and "@name" not in cleaned_v:
+                                cleaned_v["@name"] = "Unknown_IED"
+                            cleaned[k] = cleaned_v
+                    elif v not in (None, ""):
+                        # Empty check is on the raw value - whitespace-only strings are kept (as "")
+                        # intern: ค่าอย่าง iedName/ldInst/lnClass ซ้ำกันเป็นแสน - ให้ใช้ object เดียวกัน
+                        cleaned[k] = intern(JsonToCidConverter._clean_string_value(v)) if tv is str else v
+                
                 # Skip problematic d6p attributes completely
-                if k.startswith("@d6p") or k == "@xmlns:d6p1" or "d6p" in k:
+                elif kind == _KEY_SKIP:
                     print(f"⚠️  Skipping problematic attribute: {k}")
-                    continue
                 
-                # Handle malformed vendor attributes
-                if ":" in k and not k.startswith("@"):
-                    # Check if it's a vendor namespace URL in the key
-                    vendor_handled = False
-                    for prefix, namespace in JsonToCidConverter.vendor_namespaces.items():
-                        if namespace in k:
-                            # Extract the actual attribute name
-                            attr_name = k.split(':')[-1]
-                            new_key = f"@{prefix}:{attr_name}"
-                            cleaned[new_key] = v
-                            vendor_handled = True
-                            print(f"🔧 Fixed vendor attribute: {k} -> {new_key}")
-                            break
-                    
-                    if not vendor_handled:
-                        # Skip unrecognized namespace URLs
-                        if "http://" in k:
-                            print(f"⚠️  Skipping unrecognized namespace: {k}")
-                            continue
-                        else:
-                            # Keep other colon-separated keys that aren't URLs
-                            cleaned[k] = JsonToCidConverter._clean_vendor_attributes(v) if isinstance(v, (dict, list)) else v
-                    continue
+                # Handle malformed vendor attributes (vendor namespace URL in the key)
+                elif kind == _KEY_VENDOR:
+                    cleaned[new_key] = JsonToCidConverter._fix_and_clean(v)
+                    print(f"🔧 Fixed vendor attribute: {k} -> {new_key}")
                 
-                # Handle XMLSchema-instance types
-                if "XMLSchema-instance:type" in k:
-                    cleaned["@xsi:type"] = v
-                    continue
+                # Skip unrecognized namespace URLs
+                elif kind == _KEY_SKIP_URL:
+                    print(f"⚠️  Skipping unrecognized namespace: {k}")
                 
-                # Regular processing
-                if isinstance(v, (dict, list)):
-                    cleaned_v = JsonToCidConverter._clean_vendor_attributes(v)
-                    if cleaned_v or k in JsonToCidConverter.structural_tags:
-                        cleaned[k] = cleaned_v
-                elif v not in (None, ""):
-                    cleaned[k] = v
+                # Keep other colon-separated keys that aren't URLs
+                elif kind == _KEY_COLON:
+                    cleaned[k] = JsonToCidConverter._walk_and_clean(v) if isinstance(v, (dict, list, str)) else v
+                
+                # Handle XMLSchema-instance types
+                else:
+                    cleaned[new_key] = JsonToCidConverter._fix_and_clean(v)
             
             return cleaned
             
-        elif isinstance(data, list):
-            return [JsonToCidConverter._clean_vendor_attributes(item) for item in data if item is not None]
+        elif t is list:
+            return [JsonToCidConverter._walk_and_clean(item) for item in data if item is not None]
+        
+        elif t is str:
+            return JsonToCidConverter._clean_string_value(data)
         
         return data
 
     @staticmethod
-    def _fix_data_structure(data: Any) -> Any:
-        """Fix structural issues in the data"""
+    @lru_cache(maxsize=4096)
+    def _classify_key(k: str) -> tuple[int, str]:
+        """จัดประเภท key สำหรับ _walk_and_clean คืน (ประเภท, key ใหม่) - ชื่อ key ซ้ำกันทั้งไฟล์จึง cache ไว้"""
+        if "d6p" in k:
+            return _KEY_SKIP, k
+        if ":" in k and k[:1] != "@":
+            for prefix, namespace in JsonToCidConverter.vendor_namespaces.items():
+                if namespace in k:
+                    return _KEY_VENDOR, f"@{prefix}:{k.split(':')[-1]}"
+            return (_KEY_SKIP_URL if "http://" in k else _KEY_COLON), k
+        if "XMLSchema-instance:type" in k:
+            return _KEY_XSI_TYPE, "@xsi:type"
+        return _KEY_PLAIN, k
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_section_key(k: str) -> tuple[int, str]:
+        """จัดประเภท key สำหรับ _clean_section คืน (ประเภท, key ใหม่)"""
+        if k.startswith("@d6p") or k == "@xmlns:d6p1":
+            return _KEY_SKIP, k
+        if ":" in k and k[:1] != "@":
+            if "XMLSchema-instance:type" in k:
+                return _KEY_XSI_TYPE, "@xsi:type"
+            if "XMLSchema-instance" in k:
+                return _KEY_SKIP, k
+            for prefix, namespace in JsonToCidConverter.vendor_namespaces.items():
+                if namespace in k:
+                    return _KEY_VENDOR, f"@{prefix}:{k.split(':')[-1]}"
+            # Skip other HTTP URLs in keys
+            if "http://" in k:
+                return _KEY_SKIP, k
+        return _KEY_PLAIN, k
+
+    @staticmethod
+    def _fix_and_clean(data: Any) -> Any:
+        """Fix structure and clean strings (no vendor attribute handling) - for vendor attribute values"""
         if isinstance(data, dict):
             fixed = {}
             for k, v in data.items():
-                # Ensure proper structure for known elements
-                if k == "IED" and isinstance(v, dict):
-                    # Ensure IED has required attributes
-                    if "@name" not in v:
-                        v["@name"] = "Unknown_IED"
-                
                 if isinstance(v, (dict, list)):
-                    fixed[k] = JsonToCidConverter._fix_data_structure(v)
-                else:
-                    fixed[k] = v
+                    v = JsonToCidConverter._fix_and_clean(v)
+                    if k == "IED" and isinstance(v, dict) and "@name" not in v:
+                        v["@name"] = "Unknown_IED"
+                elif isinstance(v, str):
+                    v = JsonToCidConverter._clean_string_value(v)
+                fixed[k] = v
             return fixed
             
         elif isinstance(data, list):
-            return [JsonToCidConverter._fix_data_structure(item) for item in data if item is not None]
-        
-        return data
-
-    @staticmethod
-    def _clean_all_strings(data: Any) -> Any:
-        """Clean all string values in the data structure"""
-        if isinstance(data, dict):
-            cleaned = {}
-            for k, v in data.items():
-                if isinstance(v, str):
-                    cleaned[k] = JsonToCidConverter._clean_string_value(v)
-                elif isinstance(v, (dict, list)):
-                    cleaned[k] = JsonToCidConverter._clean_all_strings(v)
-                else:
-                    cleaned[k] = v
-            return cleaned
-            
-        elif isinstance(data, list):
-            return [JsonToCidConverter._clean_all_strings(item) for item in data]
+            return [JsonToCidConverter._fix_and_clean(item) for item in data if item is not None]
         
         elif isinstance(data, str):
             return JsonToCidConverter._clean_string_value(data)
@@ -350,23 +389,24 @@ class JsonToCidConverter:
         if not isinstance(value, str):
             return str(value)
         
-        # Remove XML-illegal control characters
-        value = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', value)
-        
-        # Remove null bytes
-        value = value.replace('\x00', '')
+        # Fast path: printable strings have no control chars / BOM and their only
+        # whitespace is ' ' - return as-is unless spaces need collapsing
+        if value.isprintable():
+            if '  ' not in value and value[:1] != ' ' and value[-1:] != ' ':
+                return value
+            return ' '.join(value.split())
         
-        # Remove BOM
-        value = value.lstrip('\ufeff')
+        # Remove XML-illegal control characters (including null bytes) and BOM
+        value = _CTRL_RE.sub('', value).lstrip('\ufeff')
         
-        # Normalize whitespace
-        value = re.sub(r'\s+', ' ', value).strip()
+        # Normalize whitespace (split() uses the same whitespace set as \s)
+        value = ' '.join(value.split())
         
         # Don't escape XML entities here - let xmltodict handle it
         return value
 
     @staticmethod
-    def _build_scl_structure(scl: dict) -> dict:
+    def _build_scl_structure(scl: dict, valid_refs: set | None = None) -> dict:
         """Build proper SCL structure with correct namespaces"""
         new_scl: dict[str, Any] = {}
 
@@ -374,9 +414,10 @@ class JsonToCidConverter:
         new_scl["@xmlns"] = scl.get("@xmlns", "http://www.iec.ch/61850/2003/SCL")
         new_scl["@xmlns:xsi"] = scl.get("@xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
         
-        # Add vendor namespaces if they're used
+        # Add vendor namespaces if they're used (เดิน tree ครั้งเดียวสำหรับทุก prefix)
+        used = JsonToCidConverter._collect_used_vendor_prefixes(scl)
         for prefix, namespace in JsonToCidConverter.vendor_namespaces.items():
-            if JsonToCidConverter._uses_vendor_prefix(scl, prefix):
+            if prefix in used:
                 new_scl[f"@xmlns:{prefix}"] = namespace
                 print(f"✅ Added vendor namespace: {prefix}")
         
@@ -403,35 +444,56 @@ class JsonToCidConverter:
         JsonToCidConverter._ensure_inst_attributes(new_scl)
         
         # Enhanced dangling FCDA warning
-        JsonToCidConverter._warn_on_dangling_fcda(new_scl)
+        JsonToCidConverter._warn_on_dangling_fcda(new_scl, valid_refs)
 
         return new_scl
 
     @staticmethod
-    def _uses_vendor_prefix(data: Any, prefix: str) -> bool:
-        """Check if vendor prefix is used in the data"""
-        def check(obj):
-            if isinstance(obj, dict):
-                for k in obj.keys():
-                    if k.startswith(f"@{prefix}:"):
-                        return True
-                    if isinstance(obj[k], (dict, list)) and check(obj[k]):
-                        return True
-            elif isinstance(obj, list):
-                return any(check(item) for item in obj)
-            return False
-        
-        return check(data)
+    def _collect_used_vendor_prefixes(data: Any) -> set[str]:
+        """Collect the known vendor prefixes used as '@prefix:attr' keys (single pass)"""
+        vendors = JsonToCidConverter.vendor_namespaces
+        used: set[str] = set()
+        stack = [data]
+        pop, push = stack.pop, stack.append
+        while stack:
+            obj = pop()
+            if type(obj) is dict:
+                for k, v in obj.items():
+                    if k[:1] == '@' and ':' in k:
+                        prefix = k[1:k.index(':')]
+                        if prefix in vendors and prefix not in used:
+                            used.add(prefix)
+                            if len(used) == len(vendors):
+                                return used
+                    tv = type(v)
+                    if tv is dict or tv is list:
+                        push(v)
+            elif type(obj) is list:
+                stack.extend(obj)
+        return used
 
     @staticmethod
     def _generate_xml(obj: dict) -> str:
         """Generate XML with enhanced error handling"""
         try:
-            # Use xmltodict to generate XML
-            xml_str = xmltodict.unparse(obj, pretty=False, full_document=False)
+            xml_str = None
             
-            # Post-process the XML
-            xml_str = JsonToCidConverter._post_process_xml(xml_str)
+            # Pure-Python xmltodict: ใช้ emitter ของเราเอง (output เหมือนกันทุก byte)
+            # ถ้ามี Rust backend (xmltodict-fast) ให้ unparse ของมันทำแทน
+            if XMLTODICT_BACKEND == "python":
+                try:
+                    print("🔨 XML writer: direct emitter")
+                    xml_str = JsonToCidConverter._emit_xml(obj)
+                except (TypeError, ValueError) as e:
+                    print(f"⚠️  Direct emitter failed ({e}), falling back to xmltodict")
+            
+            if xml_str is None:
+                # Use xmltodict to generate XML
+                print(f"🔨 xmltodict backend: {XMLTODICT_BACKEND}")
+                xml_str = xmltodict.unparse(obj, pretty=False, full_document=False)
+            
+            # Post-process the XML (string values ผ่าน _clean_string_value มาแล้วใน preprocess)
+            xml_str = JsonToCidConverter._post_process_xml(xml_str, strings_cleaned=True)
             
             return xml_str
             
@@ -440,6 +502,108 @@ class JsonToCidConverter:
             # Try alternative XML generation
             return JsonToCidConverter._alternative_xml_generation(obj)
 
+    @staticmethod
+    def _emit_xml(obj: dict) -> str:
+        """Serialize an xmltodict-style tree to XML in one pass
+        
+        Same output as xmltodict.unparse(obj, pretty=False, full_document=False)
+        for the plain dict/list trees built by the preprocessing step:
+        '@' keys become attributes (quoted like saxutils.quoteattr), '#text' is
+        written after the child elements, list values repeat the element and
+        empty lists are skipped. Raises ValueError for invalid names and for
+        '#comment' keys, which are left to xmltodict.
+        """
+        parts: list[str] = []
+        write = parts.append
+        checked: set[str] = set()
+        
+        def check_name(name: str, kind: str) -> None:
+            # เหมือน xmltodict._validate_name - cache ไว้เพราะชื่อ tag/attr ซ้ำกันเยอะมาก
+            if name in checked:
+                return
+            if not isinstance(name, str):
+                raise ValueError(f"{kind} name must be a string")
+            if (name[:1] in ('?', '!') or _XML_BAD_NAME_RE.search(name)
+                    or any(ch.isspace() for ch in name)):
+                raise ValueError(f"Invalid {kind} name: {name!r}")
+            checked.add(name)
+        
+        def to_str(value: Any) -> str:
+            if type(value) is str or isinstance(value, str):
+                return value
+            if isinstance(value, bool):
+                return "true" if value else "false"
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                return bytes(value).decode('utf-8', errors='replace')
+            return str(value)
+        
+        def escape_text(text: str) -> str:
+            if _XML_TEXT_SPECIAL_RE.search(text) is None:
+                return text
+            return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        
+        def quote_attr(value: str) -> str:
+            if _XML_ATTR_SPECIAL_RE.search(value) is None:
+                return '"' + value + '"'
+            value = (value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+                     .replace('\n', '&#10;').replace('\r', '&#13;').replace('\t', '&#9;'))
+            if '"' not in value:
+                return '"' + value + '"'
+            if "'" not in value:
+                return "'" + value + "'"
+            return '"' + value.replace('"', '&quot;') + '"'
+        
+        def emit(tag: str, value: Any) -> None:
+            if tag == '#comment':
+                raise ValueError("comments are not supported by the direct emitter")
+            check_name(tag, "element")
+            for v in (value if type(value) is list else (value,)):
+                if v is None:
+                    write(f'<{tag}></{tag}>')
+                    continue
+                if type(v) is not dict and not isinstance(v, dict):
+                    text = to_str(v)
+                    write(f'<{tag}>{escape_text(text)}</{tag}>' if text else f'<{tag}></{tag}>')
+                    continue
+                
+                write('<' + tag)
+                # '@xmlns' แบบ dict อาจทับ attr ชื่อเดียวกันได้ (เหมือน xmltodict) - กรณีนี้รวบ attr ใน dict ก่อนเขียน
+                attrs = {} if type(v.get('@xmlns')) is dict else None
+                text = None
+                children = []
+                for k, iv in v.items():
+                    if k == '#text':
+                        text = None if iv is None else to_str(iv)
+                    elif k[:1] == '@':
+                        if attrs is not None and k == '@xmlns':
+                            for prefix, uri in iv.items():
+                                check_name(prefix, "attribute")
+                                attrs[f'xmlns:{prefix}' if prefix else 'xmlns'] = '' if uri is None else to_str(uri)
+                            continue
+                        name = k[1:]
+                        check_name(name, "attribute")
+                        value_str = "" if iv is None else to_str(iv)
+                        if attrs is None:
+                            write(f' {name}={quote_attr(value_str)}')
+                        else:
+                            attrs[name] = value_str
+                    elif not (type(iv) is list and not iv):
+                        children.append((k, iv))
+                if attrs:
+                    for name, value_str in attrs.items():
+                        write(f' {name}={quote_attr(value_str)}')
+                write('>')
+                
+                for child_tag, child_value in children:
+                    emit(child_tag, child_value)
+                if text:
+                    write(escape_text(text))
+                write(f'</{tag}>')
+        
+        for key, value in obj.items():
+            emit(key, value)
+        return ''.join(parts)
+
     @staticmethod
     def _alternative_xml_generation(obj: dict) -> str:
         """Alternative XML generation method"""
@@ -470,7 +634,7 @@ class JsonToCidConverter:
                     continue
                 
                 # Ensure valid XML names
-                clean_key = re.sub(r'[^\w\-.:@]', '_', str(key))
+                clean_key = _XML_NAME_RE.sub('_', str(key))
                 
                 if isinstance(value, (dict, list)):
                     simplified_value = JsonToCidConverter._simplify_for_xml(value)
@@ -488,20 +652,24 @@ class JsonToCidConverter:
             return data
 
     @staticmethod
-    def _post_process_xml(xml: str) -> str:
-        """Post-process generated XML to fix issues"""
+    def _post_process_xml(xml: str, strings_cleaned: bool = False) -> str:
+        """Post-process generated XML to fix issues
+        
+        Each full-document regex pass is guarded by a cheap substring check.
+        `strings_cleaned=True` skips the control-character pass when every
+        string value already went through _clean_string_value.
+        """
         # Compact self-closing tags
-        xml = re.sub(r"\s+/>", "/>", xml)
+        if '/>' in xml:
+            xml = _SELFCLOSE_RE.sub("/>", xml)
         
-        # Remove duplicate XMLSchema-instance namespace declarations
-        xml = re.sub(
-            r'\s+xmlns:(?!xsi)[^=]+="http://www\.w3\.org/2001/XMLSchema-instance"',
-            "",
-            xml,
-        )
+        # Remove duplicate XMLSchema-instance namespace declarations (xmlns:xsi เองนับเป็น 1)
+        if xml.count('XMLSchema-instance') > 1:
+            xml = _XSI_DUP_RE.sub("", xml)
         
         # Final cleanup of any remaining illegal characters
-        xml = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]", "", xml)
+        if not strings_cleaned:
+            xml = _CTRL_RE.sub("", xml)
         
         # Fix any remaining encoding issues
         try:
@@ -512,26 +680,33 @@ class JsonToCidConverter:
         
         return xml
 
+    @staticmethod
+    def _check_well_formed(xml_str: str) -> None:
+        """Parse with expat without building a tree - raises ExpatError if not well-formed
+
+        namespace-aware เหมือน parser ของ ElementTree (prefix ที่ไม่ได้ประกาศถือว่า invalid)
+        """
+        expat.ParserCreate(namespace_separator='}').Parse(xml_str, True)
+
     @staticmethod
     def _validate_xml(xml_str: str) -> None:
         """Validate generated XML with enhanced error reporting"""
         try:
-            ET.fromstring(xml_str.encode('utf-8'))
+            JsonToCidConverter._check_well_formed(xml_str)
             print("✅ XML validation passed")
             
-        except ET.ParseError as e:
+        except expat.ExpatError as e:
             # Enhanced error reporting
             error_msg = str(e)
             print(f"❌ XML validation failed: {error_msg}")
             
             # Try to provide more context
-            if hasattr(e, 'lineno') and hasattr(e, 'offset'):
-                lines = xml_str.split('\n')
-                if e.lineno <= len(lines):
-                    line = lines[e.lineno - 1]
-                    print(f"Problem line {e.lineno}: {line[:100]}...")
-                    if e.offset:
-                        print(f"Problem at position {e.offset}")
+            lines = xml_str.split('\n')
+            if e.lineno <= len(lines):
+                line = lines[e.lineno - 1]
+                print(f"Problem line {e.lineno}: {line[:100]}...")
+                if e.offset:
+                    print(f"Problem at position {e.offset}")
             
             # Try to fix common XML issues
             print("🔧 Attempting to fix XML issues...")
@@ -539,10 +714,10 @@ class JsonToCidConverter:
             
             # Validate the fixed XML
             try:
-                ET.fromstring(fixed_xml.encode('utf-8'))
+                JsonToCidConverter._check_well_formed(fixed_xml)
                 print("✅ XML validation passed after fixes")
                 return  # Success
-            except ET.ParseError as e2:
+            except expat.ExpatError as e2:
                 print(f"❌ XML still invalid after fixes: {e2}")
             
             raise Exception(f"XML validation failed: {error_msg}")
@@ -551,17 +726,14 @@ class JsonToCidConverter:
     def _fix_xml_issues(xml_str: str) -> str:
         """Fix common XML issues"""
         # Fix unescaped ampersands
-        xml_str = re.sub(r'&(?![a-zA-Z0-9#]+;)', '&amp;', xml_str)
+        xml_str = _AMP_RE.sub('&amp;', xml_str)
         
         # Fix unescaped < and >
-        xml_str = re.sub(r'<(?![/!?a-zA-Z])', '&lt;', xml_str)
-        xml_str = re.sub(r'(?<=[^>])>', '&gt;', xml_str)
+        xml_str = _LT_RE.sub('&lt;', xml_str)
+        xml_str = _GT_RE.sub('&gt;', xml_str)
         
         # Remove invalid XML characters
-        xml_str = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', xml_str)
-        
-        # Fix malformed tags
-        xml_str = re.sub(r'<([^>]*?)([^/])>([^<]*?)</\1>', r'<\1\2>\3</\1>', xml_str)
+        xml_str = _CTRL_RE.sub('', xml_str)
         
         return xml_str
 
@@ -573,21 +745,24 @@ class JsonToCidConverter:
             cid_dir = json_path.parent.parent / "cid_file"
             cid_dir.mkdir(parents=True, exist_ok=True)
             
-            # Write debug file
-            debug_path = json_path.with_suffix(".debug.xml")
-            debug_path.write_text(xml_str, encoding="utf-8")
-            print(f"📝 Debug file: {debug_path}")
-            
-            # Write final output
+            # Write final output - encode once, write the bytes straight through
             out_path = cid_dir / f"{json_path.stem}{out_ext}"
-            out_path.write_text(xml_str, encoding="utf-8")
+            with open(out_path, "wb", buffering=1 << 20) as f:
+                f.write(xml_str.encode("utf-8"))
+                size = f.tell()
             
             # Verify the written file
-            if out_path.exists() and out_path.stat().st_size > 0:
-                print(f"✅ Output file verification passed: {out_path.stat().st_size} bytes")
+            if size > 0:
+                print(f"✅ Output file verification passed: {size} bytes")
             else:
                 print(f"⚠️ Output file verification failed")
             
+            # Debug copy only on request (URANUS_DEBUG_XML=1) - copied from the written file
+            if os.environ.get("URANUS_DEBUG_XML") == "1":
+                debug_path = json_path.with_suffix(".debug.xml")
+                shutil.copyfile(out_path, debug_path)
+                print(f"📝 Debug file: {debug_path}")
+            
             return out_path
             
         except Exception as e:
@@ -613,47 +788,30 @@ class JsonToCidConverter:
         """Clean a section with enhanced vendor attribute handling"""
         S = JsonToCidConverter.structural_tags
         
-        if isinstance(data, dict):
+        t = type(data)
+        if t is dict:
             out = {}
+            classify = JsonToCidConverter._classify_section_key
             for k, v in data.items():
-                # Skip problematic attributes
-                if k.startswith("@d6p") or k == "@xmlns:d6p1":
+                # Skip problematic attributes / map xsi:type and vendor namespace keys
+                kind, new_key = classify(k)
+                if kind == _KEY_SKIP:
+                    continue
+                if kind != _KEY_PLAIN:
+                    out[new_key] = v
                     continue
-                
-                # Handle vendor attributes more carefully
-                if ":" in k and not k.startswith("@"):
-                    if "XMLSchema-instance:type" in k:
-                        out["@xsi:type"] = v
-                        continue
-                    if "XMLSchema-instance" in k:
-                        continue
-                    
-                    # Handle vendor namespaces in keys
-                    vendor_handled = False
-                    for prefix, namespace in JsonToCidConverter.vendor_namespaces.items():
-                        if namespace in k:
-                            attr_name = k.split(':')[-1]
-                            out[f"@{prefix}:{attr_name}"] = v
-                            vendor_handled = True
-                            break
-                    
-                    if vendor_handled:
-                        continue
-                    
-                    # Skip other HTTP URLs in keys
-                    if "http://" in k:
-                        continue
                 
                 # Skip empty values
                 if v in (None, ""):
                     continue
                 
                 # Process nested structures
-                if isinstance(v, (dict, list)):
+                tv = type(v)
+                if tv is dict or tv is list:
                     v2 = JsonToCidConverter._clean_section(v, f"{section_name}.{k}")
                     if v2 or (k in S):
                         out[k] = v2 if v2 else v
-                elif isinstance(v, str):
+                elif tv is str:
                     sv = v.strip()
                     if sv:
                         sv = JsonToCidConverter._clean_string_value(sv)
@@ -664,11 +822,11 @@ class JsonToCidConverter:
             
             return out
             
-        elif isinstance(data, list):
+        elif t is list:
             res = []
             for it in data:
                 it2 = JsonToCidConverter._clean_section(it, section_name)
-                if it2 or (isinstance(it, dict) and it.keys() & S):
+                if it2 or (type(it) is dict and it.keys() & S):
                     res.append(it2 if it2 else it)
             return res
         
@@ -689,46 +847,30 @@ class JsonToCidConverter:
                         ln.setdefault("@inst", ln.get("@inst", "1"))
 
     @staticmethod
-    def _warn_on_dangling_fcda(scl: dict) -> None:
-        """Enhanced warning about dangling FCDA references"""
-        valid = set()
-        for ied in JsonToCidConverter._as_list(scl.get("IED")):
-            ied_name = ied.get("@name", "")
-            for ap in JsonToCidConverter._as_list(ied.get("AccessPoint")):
-                srv = ap.get("Server", {})
-                for ld in JsonToCidConverter._as_list(srv.get("LDevice")):
-                    li = ld.get("@inst")
-                    ln0 = ld.get("LN0")
-                    if ln0:
-                        valid.add((ied_name, li, "LLN0", ln0.get("@inst", "0")))
-                    for ln in JsonToCidConverter._as_list(ld.get("LN")):
-                        valid.add((ied_name, li, ln.get("@lnClass"), ln.get("@inst", "")))
+    def _warn_on_dangling_fcda(scl: dict, valid_refs: set | None = None) -> None:
+        """Enhanced warning about dangling FCDA references
+        
+        `valid_refs` is the set collected during pre-processing; it is only
+        re-collected from `scl` when not given.
+        """
+        if valid_refs is None:
+            valid_refs = JsonToCidConverter._collect_valid_refs(scl)
 
         dangling_count = 0
-        def walk(node):
-            nonlocal dangling_count
-            if isinstance(node, dict):
-                for k, v in node.items():
-                    if k == "DataSet":
-                        for ds in JsonToCidConverter._as_list(v):
-                            ds_name = ds.get('@name', 'Unknown')
-                            for fc in JsonToCidConverter._as_list(ds.get("FCDA")):
-                                ied_name = fc.get("@iedName", "")
-                                tup = (
-                                    ied_name,
-                                    fc.get("@ldInst"),
-                                    fc.get("@lnClass"),
-                                    fc.get("@lnInst", ""),
-                                )
-                                if tup not in valid:
-                                    print(f"⚠️  Dangling FCDA {'/'.join(str(x) for x in tup)} in DataSet '{ds_name}'")
-                                    dangling_count += 1
-                    walk(v)
-            elif isinstance(node, list):
-                for it in node:
-                    walk(it)
-
-        walk(scl)
+        for ds in JsonToCidConverter._iter_datasets(scl):
+            ds_name = ds.get('@name', 'Unknown')
+            for fc in JsonToCidConverter._as_list(ds.get("FCDA")):
+                if not isinstance(fc, dict):
+                    continue
+                tup = (
+                    fc.get("@iedName", ""),
+                    fc.get("@ldInst", ""),
+                    fc.get("@lnClass", ""),
+                    fc.get("@lnInst", ""),
+                )
+                if tup not in valid_refs:
+                    print(f"⚠️  Dangling FCDA {'/'.join(str(x) for x in tup)} in DataSet '{ds_name}'")
+                    dangling_count += 1
         
         if dangling_count == 0:
             print("✅ No dangling FCDA references found")
@@ -4,6 +4,7 @@ IEC 61850 DO/DA Configuration
 ตามมาตรฐาน IEC 61850
 """
 
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from enum import Enum
 
@@ -450,8 +451,9 @@ class IEC61850Config:
         """Get Common Data Class configuration"""
         return self.cdc_config.get(cdc_name)
     
+    @lru_cache(maxsize=2048)
     def get_da_values(self, ln_class: str, do_name: str, da_name: str) -> List[Any]:
-        """Get possible values for specific DA"""
+        """Get possible values for specific DA (cached - config is static)"""
         do_config = self.get_do_config(ln_class, do_name)
         if not do_config:
             return []
@@ -511,8 +513,9 @@ class IEC61850Config:
         
         return None
     
+    @lru_cache(maxsize=256, typed=True)
     def format_value(self, value: Any) -> str:
-        """Format value for display"""
+        """Format value for display (typed cache so True and 1 stay distinct)"""
         if isinstance(value, StatusValue):
             return value.name
         elif isinstance(value, bool):
@@ -10,18 +10,64 @@ from PyQt6.QtWidgets import (
     QComboBox, QLineEdit, QPushButton, QLabel,
     QGroupBox, QMessageBox, QScrollArea, QWidget
 )
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractListModel, QModelIndex, QRegularExpression, QSignalBlocker, QTimer
+)
+from PyQt6.QtGui import QRegularExpressionValidator
+from collections import ChainMap
 from typing import Dict, List, Any
+import re
+
+# รูปแบบ input - ตรวจด้วย regex ครั้งเดียวแทน split + int(..., 16) ทีละส่วน
+_MAC_RE = re.compile(r'[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}')
+_APPID_RE = re.compile(r'0[xX][0-9A-Fa-f]+|[0-9]+')
+_GOOSE_MAC_PREFIX = '01:0C:CD:01:'
+
+def _parse_appid(text: str) -> int:
+    """APP ID text (ผ่าน _APPID_RE แล้ว) -> int
+    ไม่ใช้ int(text, 0) เพราะ decimal ที่มี 0 นำหน้า เช่น "01" จะ error"""
+    return int(text, 16 if text[:2] in ('0x', '0X') else 10)
+
+# debug flag - ปิดไว้ print ต่อ GOOSE config ทำให้เปิด dialog ช้า
+DEBUG_MODE = False
 
 def debug_log(msg: str):
     """Debug logging helper"""
-    print(f"[DEBUG] {msg}")
+    if DEBUG_MODE:
+        print(f"[DEBUG] {msg}")
+
+class IedListModel(QAbstractListModel):
+    """List model ของ IED ใน combo - ใช้ ied_configs เดิม ไม่ addItem ทีละแถว"""
+    
+    def __init__(self, ied_configs, parent=None):
+        super().__init__(parent)
+        self._ied_configs = ied_configs
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ied_configs)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ied_name = self._ied_configs[index.row()]['ied_name']
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"🏭 {ied_name}"
+        if role == Qt.ItemDataRole.UserRole:
+            return ied_name
+        return None
 
 class AddressEditorDialog(QDialog):
     """Dialog for editing GOOSE Address configurations (APP ID, MAC)"""
     
     config_changed = pyqtSignal(dict)  # Signal when config is changed
     
+    # Stylesheet เดียวตั้งที่ dialog - label เลือกด้วย objectName แทน setStyleSheet ต่อ widget
+    STYLE_SHEET = """
+        QLabel#addrInfoLabel { color: blue; font-style: italic; padding: 10px; }
+        QLabel#addrMacInfo { color: gray; font-size: 10px; }
+        QLabel#addrWarnLabel { color: orange; padding: 10px; }
+    """
+    
     def __init__(self, ied_configs, goose_configs, parent=None):
         super().__init__(parent)
         
@@ -30,7 +76,8 @@ class AddressEditorDialog(QDialog):
         self.goose_configs = goose_configs  # Dict of GOOSE configs
         
         # Runtime configs (will be modified)
-        self.runtime_goose_configs = {}
+        # แต่ละตัวเป็น ChainMap(แก้ไข, ต้นฉบับ) - ค่าที่แก้ลง dict แรก ต้นฉบับไม่ถูกแตะ
+        self.runtime_goose_configs: Dict[str, ChainMap] = {}
         
         # Initialize runtime configs from originals
         self._init_runtime_configs()
@@ -38,8 +85,27 @@ class AddressEditorDialog(QDialog):
         # Current editing widgets
         self.current_widgets = {}
         
-        # Setup UI
-        self.setup_ui()
+        # Debounce validation while typing - ผลล่าสุดเก็บไว้ให้ apply_changes ใช้
+        self._last_errors = None
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(150)
+        self._validate_timer.timeout.connect(self._do_validate)
+        
+        self.setWindowTitle("🔧 Edit GOOSE Configuration")
+        self.setMinimumSize(600, 400)
+        
+        # UI สร้างตอน show ครั้งแรก (showEvent) - __init__ เก็บแค่ state
+        self._ui_built = False
+    
+    def showEvent(self, event):
+        """Build the UI on first show"""
+        if not self._ui_built:
+            self._ui_built = True
+            self.setup_ui()
+            # ขนาดถูกคำนวณก่อน showEvent ตอนยังไม่มี layout - คำนวณใหม่
+            self.adjustSize()
+        super().showEvent(event)
         
     def _init_runtime_configs(self):
         """Initialize runtime configs from original configs"""
@@ -47,28 +113,34 @@ class AddressEditorDialog(QDialog):
         debug_log(f"IED configs count: {len(self.ied_configs)}")
         debug_log(f"GOOSE configs count: {len(self.goose_configs)}")
         
-        # Copy GOOSE configs
+        # Layer GOOSE configs (copy-on-write - no per-config copy up front)
         for key, config in self.goose_configs.items():
             if hasattr(config, 'to_dict'):
-                self.runtime_goose_configs[key] = config.to_dict()
+                base = config.to_dict()
             elif isinstance(config, dict):
-                self.runtime_goose_configs[key] = config.copy()
+                base = config
             else:
                 # Create basic dict if config is a different type
-                self.runtime_goose_configs[key] = {
+                base = {
                     'app_id': 0x0001,
                     'dst_mac': '01:0C:CD:01:00:00',
                     'go_id': 'DefaultGOOSE',
                     'dataset_ref': 'Dataset1'
                 }
-            debug_log(f"Added GOOSE config for {key}: {self.runtime_goose_configs[key]}")
+            self.runtime_goose_configs[key] = ChainMap({}, base)
+            if DEBUG_MODE:  # ไม่ต้อง format repr ของ config ถ้าไม่ได้ debug
+                debug_log(f"Added GOOSE config for {key}: {base}")
+        
+        # Index IED name -> GOOSE key (key รูปแบบ "IED/LD/GSE" - ตัวแรกที่เจอของแต่ละ IED)
+        self._ied_to_goose_key: Dict[str, str] = {}
+        for key in self.runtime_goose_configs:
+            self._ied_to_goose_key.setdefault(key.split('/', 1)[0], key)
         
         debug_log(f"Runtime configs initialized - GOOSE: {len(self.runtime_goose_configs)}")
     
     def setup_ui(self):
         """Setup dialog UI"""
-        self.setWindowTitle("🔧 Edit GOOSE Configuration")
-        self.setMinimumSize(600, 400)
+        self.setStyleSheet(self.STYLE_SHEET)
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -91,10 +163,62 @@ class AddressEditorDialog(QDialog):
         scroll_widget = QWidget()
         self.config_layout = QVBoxLayout(scroll_widget)
         
-        # Placeholder for configuration widgets
+        # Configuration widgets - สร้างครั้งเดียว เปลี่ยน IED แค่ set ค่าใหม่
         self.config_container = QWidget()
         self.config_container_layout = QVBoxLayout(self.config_container)
         self.config_layout.addWidget(self.config_container)
+        
+        # Virtual IED Info
+        self._info_label = QLabel("🤖 Virtual IED - GOOSE Configuration Only")
+        self._info_label.setObjectName("addrInfoLabel")
+        self.config_container_layout.addWidget(self._info_label)
+        
+        # GOOSE Configuration Group
+        self._goose_group = QGroupBox("GOOSE Configuration")
+        goose_layout = QFormLayout()
+        
+        # APP ID
+        self._appid_edit = QLineEdit()
+        self._appid_edit.setPlaceholderText("e.g., 0x0001 or 1")
+        # กันตัวอักษรผิดตั้งแต่ตอนพิมพ์ - range/รูปแบบเต็มยังเช็คใน validate_inputs
+        self._appid_edit.setValidator(QRegularExpressionValidator(
+            QRegularExpression(r'^(0[xX][0-9A-Fa-f]{1,4}|\d{1,5})$'), self._appid_edit))
+        self._appid_edit.textChanged.connect(self.on_config_changed)
+        
+        # MAC Address
+        self._mac_edit = QLineEdit()
+        self._mac_edit.setPlaceholderText("e.g., 01:0C:CD:01:00:00")
+        self._mac_edit.setValidator(QRegularExpressionValidator(
+            QRegularExpression(r'^[0-9A-Fa-f:]{0,17}$'), self._mac_edit))
+        self._mac_edit.textChanged.connect(self.on_config_changed)
+        
+        # MAC Address info
+        mac_info = QLabel("ℹ️ IEC 61850 GOOSE MAC range: 01:0C:CD:01:00:00 - 01:0C:CD:01:01:FF")
+        mac_info.setObjectName("addrMacInfo")
+        
+        # Other info (display only)
+        self._goid_label = QLabel()
+        self._dataset_label = QLabel()
+        
+        for label, widget in (("APP ID:", self._appid_edit),
+                              ("Destination MAC:", self._mac_edit),
+                              ("", mac_info),
+                              ("GoID:", self._goid_label),
+                              ("Dataset:", self._dataset_label)):
+            goose_layout.addRow(label, widget)
+        
+        self._goose_group.setLayout(goose_layout)
+        self.config_container_layout.addWidget(self._goose_group)
+        
+        # No GOOSE config found
+        self._no_goose_label = QLabel("⚠️ No GOOSE configuration found for this IED")
+        self._no_goose_label.setObjectName("addrWarnLabel")
+        self.config_container_layout.addWidget(self._no_goose_label)
+        
+        # ซ่อนไว้จนกว่าจะเลือก IED
+        self._info_label.setVisible(False)
+        self._goose_group.setVisible(False)
+        self._no_goose_label.setVisible(False)
         self.config_layout.addStretch()
         
         scroll_area.setWidget(scroll_widget)
@@ -143,102 +267,74 @@ class AddressEditorDialog(QDialog):
     
     def populate_ied_combo(self):
         """Populate IED combo box"""
-        self.ied_combo.clear()
-        
-        for config in self.ied_configs:
-            ied_name = config['ied_name']
-            display_text = f"🏭 {ied_name}"
-            self.ied_combo.addItem(display_text, ied_name)
+        self.ied_combo.setModel(IedListModel(self.ied_configs, self.ied_combo))
     
     def on_ied_selected(self, ied_name):
         """Handle IED selection"""
-        # Clear current widgets
+        debug_log(f"Showing config for IED: {ied_name}")
         self.clear_config_widgets()
         
-        # Create configuration widgets for selected IED
-        self.create_config_widgets(ied_name)
+        goose_key = self._find_goose_key(ied_name)
+        goose_config = self.runtime_goose_configs[goose_key] if goose_key is not None else None
+        if goose_key is not None:
+            debug_log(f"Found GOOSE config: {goose_key}")
+        
+        self._populate_goose_group(goose_config, goose_key)
+        
+        # Store current IED name
+        self.current_widgets['ied_name'] = ied_name
     
     def clear_config_widgets(self):
-        """Clear current configuration widgets"""
-        # Clear container
-        while self.config_container_layout.count():
-            child = self.config_container_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
+        """Forget the current IED's widgets and pending validation"""
         self.current_widgets.clear()
+        self._validate_timer.stop()
+        self._last_errors = None
     
-    def create_config_widgets(self, ied_name):
-        """Create configuration widgets for selected IED"""
-        debug_log(f"Creating config widgets for IED: {ied_name}")
+    def _find_goose_key(self, ied_name):
+        """Find the GOOSE config key for an IED"""
+        goose_key = self._ied_to_goose_key.get(ied_name)
+        if goose_key is None:
+            # key ที่ไม่ได้อยู่ในรูป "IED/..." - หาแบบ substring เหมือนเดิม
+            goose_key = next((key for key in self.runtime_goose_configs if ied_name in key), None)
+        return goose_key
+    
+    def _populate_goose_group(self, goose_config, goose_key):
+        """Fill the pre-built GOOSE widgets with the selected config"""
+        has_goose = bool(goose_config)
+        self.apply_btn.setEnabled(False)  # ค่าที่เพิ่งโหลดยังไม่มีอะไรให้ apply
+        self._info_label.setVisible(True)
+        self._goose_group.setVisible(has_goose)
+        self._no_goose_label.setVisible(not has_goose)
+        if not has_goose:
+            return
         
-        # Find matching GOOSE config
-        goose_config = None
-        goose_key = None
+        self._goose_group.setTitle(f"GOOSE Configuration - {goose_key}")
         
-        for key in self.runtime_goose_configs:
-            if ied_name in key:
-                goose_config = self.runtime_goose_configs[key]
-                goose_key = key
-                debug_log(f"Found GOOSE config: {key}")
-                break
+        current_appid = goose_config.get('app_id', 0x0001)
+        appid_text = f"0x{current_appid:04X}" if isinstance(current_appid, int) else str(current_appid)
         
-        # Virtual IED Info
-        info_label = QLabel("🤖 Virtual IED - GOOSE Configuration Only")
-        info_label.setStyleSheet("color: blue; font-style: italic; padding: 10px;")
-        self.config_container_layout.addWidget(info_label)
+        # set ค่าโดยไม่ให้ textChanged เปิดปุ่ม Apply - ยังไม่ได้แก้อะไร
+        for edit, text in ((self._appid_edit, appid_text),
+                           (self._mac_edit, goose_config.get('dst_mac', '01:0C:CD:01:00:00'))):
+            with QSignalBlocker(edit):
+                edit.setText(text)
         
-        # GOOSE Configuration Group
-        if goose_config:
-            goose_group = QGroupBox(f"GOOSE Configuration - {goose_key}")
-            goose_layout = QFormLayout()
-            
-            # APP ID
-            appid_edit = QLineEdit()
-            current_appid = goose_config.get('app_id', 0x0001)
-            if isinstance(current_appid, int):
-                appid_edit.setText(f"0x{current_appid:04X}")
-            else:
-                appid_edit.setText(str(current_appid))
-            appid_edit.setPlaceholderText("e.g., 0x0001 or 1")
-            appid_edit.textChanged.connect(self.on_config_changed)
-            goose_layout.addRow("APP ID:", appid_edit)
-            self.current_widgets['app_id'] = appid_edit
-            
-            # MAC Address
-            mac_edit = QLineEdit()
-            mac_edit.setText(goose_config.get('dst_mac', '01:0C:CD:01:00:00'))
-            mac_edit.setPlaceholderText("e.g., 01:0C:CD:01:00:00")
-            mac_edit.textChanged.connect(self.on_config_changed)
-            goose_layout.addRow("Destination MAC:", mac_edit)
-            self.current_widgets['dst_mac'] = mac_edit
-            
-            # MAC Address info
-            mac_info = QLabel("ℹ️ IEC 61850 GOOSE MAC range: 01:0C:CD:01:00:00 - 01:0C:CD:01:01:FF")
-            mac_info.setStyleSheet("color: gray; font-size: 10px;")
-            goose_layout.addRow("", mac_info)
-            
-            # Other info (display only)
-            goose_layout.addRow("GoID:", QLabel(goose_config.get('go_id', '')))
-            goose_layout.addRow("Dataset:", QLabel(goose_config.get('dataset_ref', '')))
-            
-            goose_group.setLayout(goose_layout)
-            self.config_container_layout.addWidget(goose_group)
-            
-            # Store goose key for later
-            self.current_widgets['goose_key'] = goose_key
-        else:
-            # No GOOSE config found
-            no_goose_label = QLabel("⚠️ No GOOSE configuration found for this IED")
-            no_goose_label.setStyleSheet("color: orange; padding: 10px;")
-            self.config_container_layout.addWidget(no_goose_label)
+        self._goid_label.setText(goose_config.get('go_id', ''))
+        self._dataset_label.setText(goose_config.get('dataset_ref', ''))
         
-        # Store current IED name
-        self.current_widgets['ied_name'] = ied_name
+        self.current_widgets['app_id'] = self._appid_edit
+        self.current_widgets['dst_mac'] = self._mac_edit
+        self.current_widgets['goose_key'] = goose_key
     
     def on_config_changed(self):
         """Handle configuration value change"""
         self.apply_btn.setEnabled(True)
+        self._validate_timer.start()  # restart - validate once typing pauses
+    
+    def _do_validate(self):
+        """Validate after typing pauses and cache the result for apply_changes"""
+        self._last_errors = self.validate_inputs()
+        self.apply_btn.setToolTip("\n".join(self._last_errors))
     
     def validate_inputs(self):
         """Validate current inputs"""
@@ -247,46 +343,35 @@ class AddressEditorDialog(QDialog):
         # Validate APP ID
         if 'app_id' in self.current_widgets:
             appid_text = self.current_widgets['app_id'].text().strip()
-            try:
-                if appid_text.startswith('0x') or appid_text.startswith('0X'):
-                    value = int(appid_text, 16)
-                else:
-                    value = int(appid_text)
-                
+            if not _APPID_RE.fullmatch(appid_text):
+                errors.append("Invalid APP ID format (use hex 0x0001 or decimal 1)")
+            else:
                 # Check range (0x0000 - 0xFFFF)
-                if value < 0 or value > 0xFFFF:
+                if _parse_appid(appid_text) > 0xFFFF:
                     errors.append("APP ID must be between 0x0000 and 0xFFFF")
-            except:
-                errors.append("Invalid APP ID format (use hex 0x0001 or decimal 1)")
         
         # Validate MAC Address
         if 'dst_mac' in self.current_widgets:
             mac_text = self.current_widgets['dst_mac'].text().strip()
-            mac_parts = mac_text.split(':')
-            if len(mac_parts) != 6:
-                errors.append("MAC Address must have 6 parts (XX:XX:XX:XX:XX:XX)")
-            else:
-                try:
-                    for part in mac_parts:
-                        if len(part) != 2:
-                            raise ValueError()
-                        int(part, 16)
-                    
-                    # Check if it's in GOOSE range
-                    if mac_text.startswith("01:0C:CD:01:"):
-                        # Valid GOOSE MAC
-                        pass
-                    else:
-                        errors.append("Warning: MAC is outside IEC 61850 GOOSE range (01:0C:CD:01:00:00-FF)")
-                except:
+            if not _MAC_RE.fullmatch(mac_text):
+                if mac_text.count(':') != 5:
+                    errors.append("MAC Address must have 6 parts (XX:XX:XX:XX:XX:XX)")
+                else:
                     errors.append("Invalid MAC Address format")
+            
+            # Check if it's in GOOSE range (hex ตัวเล็ก/ใหญ่ก็ได้)
+            elif not mac_text.upper().startswith(_GOOSE_MAC_PREFIX):
+                errors.append("Warning: MAC is outside IEC 61850 GOOSE range (01:0C:CD:01:00:00-FF)")
         
         return errors
     
     def apply_changes(self):
         """Apply configuration changes"""
-        # Validate inputs
-        errors = self.validate_inputs()
+        # Validate inputs (ใช้ผลที่ cache ไว้ถ้าไม่มีการแก้ไขหลังจาก validate ครั้งล่าสุด)
+        if self._validate_timer.isActive() or self._last_errors is None:
+            self._validate_timer.stop()
+            self._do_validate()
+        errors = self._last_errors
         if errors:
             QMessageBox.warning(self, "Validation Error", 
                               "Please fix the following:\n\n" + "\n".join(errors))
@@ -305,10 +390,7 @@ class AddressEditorDialog(QDialog):
             # Update APP ID
             if 'app_id' in self.current_widgets:
                 appid_text = self.current_widgets['app_id'].text().strip()
-                if appid_text.startswith('0x') or appid_text.startswith('0X'):
-                    goose_config['app_id'] = int(appid_text, 16)
-                else:
-                    goose_config['app_id'] = int(appid_text)
+                goose_config['app_id'] = _parse_appid(appid_text)
             
             # Update MAC
             if 'dst_mac' in self.current_widgets:
@@ -332,14 +414,10 @@ class AddressEditorDialog(QDialog):
         if not ied_name:
             return
         
-        # Find original config
+        # Drop the edits layered over the original config
         goose_key = self.current_widgets.get('goose_key')
-        if goose_key and goose_key in self.goose_configs:
-            original_goose = self.goose_configs[goose_key]
-            if hasattr(original_goose, 'to_dict'):
-                self.runtime_goose_configs[goose_key] = original_goose.to_dict()
-            else:
-                self.runtime_goose_configs[goose_key] = original_goose.copy()
+        if goose_key and goose_key in self.runtime_goose_configs:
+            self.runtime_goose_configs[goose_key].maps[0].clear()
             
             # Refresh display
             self.on_ied_selected(ied_name)
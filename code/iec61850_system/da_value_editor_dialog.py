@@ -8,20 +8,34 @@ Dialog for editing Data Attribute values according to IEC 61850 standard
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox,
-    QDialogButtonBox, QGroupBox, QWidget
+    QDialogButtonBox, QGroupBox, QWidget, QStackedWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIntValidator
+from PyQt6.QtCore import Qt, pyqtSignal, QRegularExpression
+from PyQt6.QtGui import QIntValidator, QRegularExpressionValidator, QStandardItem, QStandardItemModel
 from typing import Dict, Any, Tuple, Optional
-from datetime import datetime
+from dataclasses import dataclass
 import time
 
+
+@dataclass(frozen=True)
+class DADefinition:
+    """DA definition in frozen form (built once from DAValueEditorDialog.DA_DEFINITIONS)"""
+    type: str = ''
+    widget: str = 'Label'
+    values: Tuple[Tuple[str, Any], ...] = ()
+    default: Optional[str] = None
+    description: str = ''
+
+
 class DAValueEditorDialog(QDialog):
     """Dialog for editing DA values according to IEC 61850"""
     
     # Signal emitted when value is changed
     value_changed = pyqtSignal(str, object)  # da_name, new_value
     
+    # Stylesheet ตั้งครั้งเดียวที่ dialog แทน setStyleSheet ต่อ widget
+    STYLE_SHEET = "QLabel#daValueLabel { background-color: #f0f0f0; padding: 5px; }"
+    
     # DA definitions based on IEC 61850
     DA_DEFINITIONS = {
         'stVal': {
@@ -151,24 +165,50 @@ class DAValueEditorDialog(QDialog):
         }
     }
     
-    def __init__(self, da_info: Dict[str, Any], parent=None):
+    # ลำดับ page ใน value stack ตามชนิด widget
+    PAGE_INDEX = {
+        'ComboBox': 0,
+        'HexInput': 1,
+        'DoubleSpinBox': 2,
+        'SpinBox': 3,
+        'Label': 4,
+        'LineEdit': 5
+    }
+    
+    # ค่า Quality ที่ใช้บ่อย (label, hex) - "Custom..." อยู่ท้ายสุดเสมอ
+    QUALITY_PRESETS = (
+        ("Good", "0x0000"),
+        ("Invalid", "0x0001"),
+        ("Questionable", "0x0003"),
+        ("Old Data", "0x0040"),
+        ("Test Mode", "0x0800"),
+        ("Blocked", "0x0400"),
+        ("Invalid + Old", "0x0041"),
+        ("Custom...", "custom")
+    )
+    
+    def __init__(self, da_info: Optional[Dict[str, Any]] = None, parent=None):
         super().__init__(parent)
         
-        self.da_name = da_info.get('name', '')
-        self.da_path = da_info.get('path', '')
-        self.current_value = da_info.get('value', '')
-        self.element_info = da_info
+        self.da_name = ''
+        self.da_path = ''
+        self.current_value = ''
+        self.element_info = {}
         
         self.new_value = None
         self.value_widget = None
+        self.widget_type = 'Label'
         
+        # สร้าง widget ทุกชนิดครั้งเดียว - เปิดครั้งต่อไปเรียก load_da() เพื่อเปลี่ยนข้อมูลอย่างเดียว
         self.setup_ui()
-        self.setWindowTitle(f"Edit DA Value - {self.da_name}")
+        if da_info is not None:
+            self.load_da(da_info)
     
     def setup_ui(self):
-        """Setup dialog UI"""
+        """Setup dialog UI (built once, reused by load_da)"""
         self.setModal(True)
         self.setMinimumWidth(400)
+        self.setStyleSheet(self.STYLE_SHEET)
         
         layout = QVBoxLayout(self)
         
@@ -176,30 +216,25 @@ class DAValueEditorDialog(QDialog):
         info_group = QGroupBox("Data Attribute Information")
         info_layout = QVBoxLayout()
         
-        info_layout.addWidget(QLabel(f"<b>Path:</b> {self.da_path}"))
-        info_layout.addWidget(QLabel(f"<b>DA Name:</b> {self.da_name}"))
-        
-        # Get DA definition
-        da_def = self.DA_DEFINITIONS.get(self.da_name, {})
-        if da_def:
-            info_layout.addWidget(QLabel(f"<b>Type:</b> {da_def.get('type', 'Unknown')}"))
-            info_layout.addWidget(QLabel(f"<b>Description:</b> {da_def.get('description', '')}"))
-        
-        info_layout.addWidget(QLabel(f"<b>Current Value:</b> {self.current_value}"))
+        self.path_label = QLabel()
+        self.name_label = QLabel()
+        self.type_label = QLabel()
+        self.description_label = QLabel()
+        self.current_label = QLabel()
+        for label in (self.path_label, self.name_label, self.type_label,
+                      self.description_label, self.current_label):
+            info_layout.addWidget(label)
         
         info_group.setLayout(info_layout)
         layout.addWidget(info_group)
         
-        # Value editor section
+        # Value editor section - หนึ่ง page ต่อชนิด widget
         editor_group = QGroupBox("Edit Value")
         editor_layout = QVBoxLayout()
         
-        # Create appropriate widget based on DA type
-        self.value_widget = self.create_value_widget()
-        if self.value_widget:
-            editor_layout.addWidget(self.value_widget)
-        else:
-            editor_layout.addWidget(QLabel("This DA type is not editable"))
+        self.value_stack = QStackedWidget()
+        self.create_value_pages()
+        editor_layout.addWidget(self.value_stack)
         
         editor_group.setLayout(editor_layout)
         layout.addWidget(editor_group)
@@ -213,174 +248,215 @@ class DAValueEditorDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
-    def create_value_widget(self):
-        """Create appropriate widget based on DA type"""
-        da_def = self.DA_DEFINITIONS.get(self.da_name, {})
-        widget_type = da_def.get('widget', 'Label')
+    def create_value_pages(self):
+        """Create one editor page per widget type (order follows PAGE_INDEX)"""
+        # ComboBox - BOOLEAN / ENUMERATED
+        self.value_combo = QComboBox()
+        self.value_stack.addWidget(self.value_combo)
         
-        if widget_type == 'ComboBox':
-            widget = QComboBox()
-            values = da_def.get('values', [])
-            
-            # Add values to combo box
-            current_index = 0
-            for i, (label, value) in enumerate(values):
-                widget.addItem(label, value)
-                # Set current value
-                if str(value) == str(self.current_value) or label == str(self.current_value):
-                    current_index = i
-            
-            widget.setCurrentIndex(current_index)
-            return widget
-        
-            # ใน da_value_editor_dialog.py - แก้ไขส่วน create_value_widget()
-
-        elif widget_type == 'HexInput':
-            # Create hybrid widget for Quality
-            container = QWidget()
-            layout = QHBoxLayout(container)
-            layout.setContentsMargins(0, 0, 0, 0)
-    
-            # ComboBox for common values
-            combo = QComboBox()
-            combo.addItem("Good", "0x0000")
-            combo.addItem("Invalid", "0x0001")
-            combo.addItem("Questionable", "0x0003")
-            combo.addItem("Old Data", "0x0040")
-            combo.addItem("Test Mode", "0x0800")
-            combo.addItem("Blocked", "0x0400")
-            combo.addItem("Invalid + Old", "0x0041")
-            combo.addItem("Custom...", "custom")
-    
-            # LineEdit for custom hex value
-            hex_edit = QLineEdit()
-            hex_edit.setPlaceholderText("0x0000")
-            hex_edit.setVisible(False)
-            hex_edit.setMaximumWidth(100)
-    
-            # Set current value
-            current_hex = str(self.current_value) if self.current_value else '0x0000'
+        # HexInput - hybrid widget for Quality
+        self.quality_widget = QWidget()
+        quality_layout = QHBoxLayout(self.quality_widget)
+        quality_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # ComboBox for common values
+        self.quality_combo = QComboBox()
+        self.quality_combo.setModel(_combo_model(self.QUALITY_PRESETS))
+        
+        # LineEdit for custom hex value
+        self.hex_edit = QLineEdit()
+        self.hex_edit.setPlaceholderText("0x0000")
+        self.hex_edit.setVisible(False)
+        self.hex_edit.setMaximumWidth(100)
+        # รับเฉพาะ hex ไม่เกิน 4 หลัก (0x นำหน้าหรือไม่ก็ได้ - validate_hex เติมให้)
+        self.hex_edit.setValidator(QRegularExpressionValidator(
+            QRegularExpression(r'^(0[xX])?[0-9A-Fa-f]{1,4}$'), self.hex_edit))
+        
+        self.quality_combo.currentIndexChanged.connect(self.on_quality_combo_changed)
+        self.hex_edit.editingFinished.connect(self.validate_hex)
+        
+        quality_layout.addWidget(QLabel("Quality:"))
+        quality_layout.addWidget(self.quality_combo)
+        quality_layout.addWidget(self.hex_edit)
+        quality_layout.addStretch()
+        
+        # Store references for value retrieval
+        self.quality_widget.combo = self.quality_combo
+        self.quality_widget.hex_edit = self.hex_edit
+        self.value_stack.addWidget(self.quality_widget)
+        
+        # SpinBox - FLOAT32 / FLOAT64
+        self.double_spin = QDoubleSpinBox()
+        self.double_spin.setDecimals(6)
+        self.double_spin.setRange(-1e9, 1e9)
+        self.value_stack.addWidget(self.double_spin)
+        
+        # SpinBox - integer types (range ตั้งตอน load ตาม signed/unsigned)
+        self.int_spin = QSpinBox()
+        self.value_stack.addWidget(self.int_spin)
+        
+        # Label - read-only
+        self.value_label = QLabel()
+        self.value_label.setObjectName("daValueLabel")
+        self.value_stack.addWidget(self.value_label)
+        
+        # LineEdit - default
+        self.value_edit = QLineEdit()
+        self.value_stack.addWidget(self.value_edit)
     
-            # Check if it's a standard value
-            standard_found = False
-            for i in range(combo.count() - 1):  # Exclude "Custom..."
-                if combo.itemData(i) == current_hex:
-                    combo.setCurrentIndex(i)
-                    standard_found = True
-                    break
+    def load_da(self, da_info: Dict[str, Any]):
+        """Load a DA into the dialog - only updates data of the prebuilt widgets"""
+        self.da_name = da_info.get('name', '')
+        self.da_path = da_info.get('path', '')
+        self.current_value = da_info.get('value', '')
+        self.element_info = da_info
+        self.new_value = None
+        
+        self.path_label.setText(f"<b>Path:</b> {self.da_path}")
+        self.name_label.setText(f"<b>DA Name:</b> {self.da_name}")
+        
+        # Get DA definition
+        da_def = _DA_DEFS.get(self.da_name)
+        if da_def is not None:
+            self.type_label.setText(f"<b>Type:</b> {da_def.type or 'Unknown'}")
+            self.description_label.setText(f"<b>Description:</b> {da_def.description}")
+        self.type_label.setVisible(da_def is not None)
+        self.description_label.setVisible(da_def is not None)
+        
+        self.current_label.setText(f"<b>Current Value:</b> {self.current_value}")
+        
+        self.load_value_widget(da_def or _EMPTY_DA_DEF)
+        self.setWindowTitle(f"Edit DA Value - {self.da_name}")
     
-            if not standard_found:
-                # Set to Custom and show hex edit
-                combo.setCurrentIndex(combo.count() - 1)  # Custom
-                hex_edit.setText(current_hex)
-                hex_edit.setVisible(True)
+    def load_value_widget(self, da_def: DADefinition):
+        """Show the editor page for the DA type and fill in the current value"""
+        loader = self._PAGE_LOADERS.get(da_def.widget, DAValueEditorDialog._load_line_edit)
+        widget_type, widget = loader(self, da_def)
+        
+        self.widget_type = widget_type
+        self.value_widget = widget
+        self.value_stack.setCurrentIndex(self.PAGE_INDEX[widget_type])
     
-            # Handle combo change
-            def on_combo_changed(index):
-                if combo.itemData(index) == "custom":
-                    hex_edit.setVisible(True)
-                    hex_edit.setFocus()
-                else:
-                    hex_edit.setVisible(False)
+    def _load_combo(self, da_def: DADefinition) -> Tuple[str, QWidget]:
+        widget = self.value_combo
+        values = da_def.values
+        
+        # model ของชุดค่านี้ใช้ร่วมกันทุก dialog - เปลี่ยนเฉพาะเมื่อชุดค่าเปลี่ยน
+        model = _combo_model(values)
+        if widget.model() is not model:
+            widget.setModel(model)
+        
+        # Set current value
+        current_index = 0
+        for i, (label, value) in enumerate(values):
+            if str(value) == str(self.current_value) or label == str(self.current_value):
+                current_index = i
+        
+        widget.setCurrentIndex(current_index)
+        return 'ComboBox', widget
     
-            combo.currentIndexChanged.connect(on_combo_changed)
+    def _load_hex(self, da_def: DADefinition) -> Tuple[str, QWidget]:
+        combo = self.quality_combo
+        
+        # Set current value
+        current_hex = str(self.current_value) if self.current_value else '0x0000'
+        
+        # Check if it's a standard value (exclude "Custom...")
+        index = _QUALITY_INDEX.get(current_hex)
+        standard_found = index is not None
+        
+        # ไม่ให้ on_quality_combo_changed ทำงานตอน load (ไม่ต้อง focus hex_edit)
+        combo.blockSignals(True)
+        combo.setCurrentIndex(index if standard_found else len(self.QUALITY_PRESETS) - 1)
+        combo.blockSignals(False)
+        
+        if standard_found:
+            self.hex_edit.clear()
+        else:
+            # Custom - show hex edit
+            self.hex_edit.setText(current_hex)
+        self.hex_edit.setVisible(not standard_found)
+        return 'HexInput', self.quality_widget
     
-            # Validate hex input
-            def validate_hex():
-                text = hex_edit.text()
-                if not text.startswith('0x'):
-                    hex_edit.setText('0x' + text)
+    def _load_spin(self, da_def: DADefinition) -> Tuple[str, QWidget]:
+        if da_def.type in ('FLOAT32', 'FLOAT64'):
+            widget = self.double_spin
+            try:
+                widget.setValue(float(self.current_value))
+            except:
+                widget.setValue(0.0)
+            return 'DoubleSpinBox', widget
+        
+        widget = self.int_spin
+        if 'U' in da_def.type:  # Unsigned
+            widget.setRange(0, 2147483647)
+        else:
+            widget.setRange(-2147483648, 2147483647)
+        try:
+            widget.setValue(int(self.current_value))
+        except:
+            widget.setValue(0)
+        return 'SpinBox', widget
     
-            hex_edit.editingFinished.connect(validate_hex)
+    def _load_label(self, da_def: DADefinition) -> Tuple[str, QWidget]:
+        widget = self.value_label
+        if self.da_name in ['t', 'T']:
+            # Show timestamp
+            try:
+                widget.setText(_format_timestamp_ms(int(self.current_value)))
+            except (TypeError, ValueError, OverflowError, OSError):
+                widget.setText(str(self.current_value))
+        else:
+            widget.setText(str(self.current_value))
+        return 'Label', widget
     
-            # Add to layout
-            layout.addWidget(QLabel("Quality:"))
-            layout.addWidget(combo)
-            layout.addWidget(hex_edit)
-            layout.addStretch()
+    def _load_line_edit(self, da_def: DADefinition) -> Tuple[str, QWidget]:
+        # Default to line edit
+        self.value_edit.setText(str(self.current_value))
+        return 'LineEdit', self.value_edit
     
-            # Store references for value retrieval
-            container.combo = combo
-            container.hex_edit = hex_edit
+    # DA widget type -> page loader (ชนิดอื่นใช้ LineEdit)
+    _PAGE_LOADERS = {
+        'ComboBox': _load_combo,
+        'HexInput': _load_hex,
+        'SpinBox': _load_spin,
+        'Label': _load_label,
+    }
     
-            return container
-        
-        elif widget_type == 'SpinBox':
-            if da_def.get('type') in ['FLOAT32', 'FLOAT64']:
-                widget = QDoubleSpinBox()
-                widget.setDecimals(6)
-                widget.setRange(-1e9, 1e9)
-                try:
-                    widget.setValue(float(self.current_value))
-                except:
-                    widget.setValue(0.0)
-            else:
-                widget = QSpinBox()
-                if 'U' in da_def.get('type', ''):  # Unsigned
-                    widget.setRange(0, 2147483647)
-                else:
-                    widget.setRange(-2147483648, 2147483647)
-                try:
-                    widget.setValue(int(self.current_value))
-                except:
-                    widget.setValue(0)
-            return widget
-        
-        elif widget_type == 'Label':
-            widget = QLabel()
-            if self.da_name in ['t', 'T']:
-                # Show timestamp
-                try:
-                    ts = int(self.current_value) / 1000  # Convert from ms
-                    dt = datetime.fromtimestamp(ts)
-                    widget.setText(dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
-                except:
-                    widget.setText(str(self.current_value))
-            else:
-                widget.setText(str(self.current_value))
-            
-            widget.setStyleSheet("QLabel { background-color: #f0f0f0; padding: 5px; }")
-            return widget
-        
+    def on_quality_combo_changed(self, index: int):
+        """Show the hex editor when "Custom..." is selected"""
+        if self.quality_combo.itemData(index) == "custom":
+            self.hex_edit.setVisible(True)
+            self.hex_edit.setFocus()
         else:
-            # Default to line edit
-            widget = QLineEdit()
-            widget.setText(str(self.current_value))
-            return widget
+            self.hex_edit.setVisible(False)
+    
+    def validate_hex(self):
+        """Validate hex input"""
+        text = self.hex_edit.text()
+        if text[:2] not in ('0x', '0X'):
+            self.hex_edit.setText('0x' + text)
     
     def accept_value(self):
         """Accept the edited value"""
-        if not self.value_widget:
-            self.reject()
-            return
-    
+        widget_type = self.widget_type
+        
         # Get value based on widget type
-        if isinstance(self.value_widget, QComboBox):
-            self.new_value = self.value_widget.currentData()
-    
-        # เพิ่มส่วนนี้สำหรับ Hybrid Quality widget
-        elif isinstance(self.value_widget, QWidget) and hasattr(self.value_widget, 'combo'):
-            # Hybrid widget (for Quality)
-            combo = self.value_widget.combo
-            hex_edit = self.value_widget.hex_edit
+        if widget_type == 'ComboBox':
+            self.new_value = self.value_combo.currentData()
         
-            if combo.currentData() == "custom":
-                # Get custom hex value
-                text = hex_edit.text()
-                try:
-                    self.new_value = int(text, 16)
-                except:
-                    self.new_value = 0
+        elif widget_type == 'HexInput':
+            # Hybrid widget (for Quality)
+            if self.quality_combo.currentData() == "custom":
+                # Get custom hex value (validator ยังยอมให้ค้างที่ "" / "0x" ได้)
+                hex_edit = self.hex_edit
+                self.new_value = int(hex_edit.text(), 16) if hex_edit.hasAcceptableInput() else 0
             else:
                 # Get preset value
-                hex_str = combo.currentData()
-                try:
-                    self.new_value = int(hex_str, 16)
-                except:
-                    self.new_value = 0
-    
-        elif isinstance(self.value_widget, QLineEdit):
-            text = self.value_widget.text()
+                self.new_value = int(self.quality_combo.currentData(), 16)
+        
+        elif widget_type == 'LineEdit':
+            text = self.value_edit.text()
             # Handle hex values (for other hex inputs if any)
             if self.da_name == 'q' and text.startswith('0x'):
                 try:
@@ -389,19 +465,63 @@ class DAValueEditorDialog(QDialog):
                     self.new_value = 0
             else:
                 self.new_value = text
-            
-        elif isinstance(self.value_widget, (QSpinBox, QDoubleSpinBox)):
-             self.new_value = self.value_widget.value()
         
-        elif isinstance(self.value_widget, QLabel):
+        elif widget_type in ('SpinBox', 'DoubleSpinBox'):
+            self.new_value = self.value_widget.value()
+        
+        else:
             # Read-only, no change
             self.new_value = self.current_value
-    
+        
         # Emit signal
         self.value_changed.emit(self.da_name, self.new_value)
-    
+        
         self.accept()
     
     def get_value(self) -> Tuple[str, Any]:
         """Get the DA name and new value"""
-        return self.da_name, self.new_value
\ No newline at end of file
+        return self.da_name, self.new_value
+
+
+def _format_timestamp_ms(ts_ms: int) -> str:
+    """ms since epoch -> 'YYYY-MM-DD HH:MM:SS.mmm' (local time, ไม่สร้าง datetime)"""
+    sec, ms = divmod(ts_ms, 1000)
+    t = time.localtime(sec)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ms:03d}")
+
+
+# DA_DEFINITIONS แบบ frozen - แปลงครั้งเดียวตอน import แทนการ .get() ซ้ำทุกครั้งที่เปิด dialog
+_DA_DEFS: Dict[str, DADefinition] = {
+    name: DADefinition(
+        type=d.get('type', ''),
+        widget=d.get('widget', 'Label'),
+        values=tuple(d.get('values', ())),
+        default=d.get('default'),
+        description=d.get('description', '')
+    )
+    for name, d in DAValueEditorDialog.DA_DEFINITIONS.items()
+}
+_EMPTY_DA_DEF = DADefinition()
+
+# hex ของ Quality preset -> index ใน combo (ไม่รวม "Custom..." ตัวสุดท้าย)
+_QUALITY_INDEX: Dict[str, int] = {
+    hex_value: i for i, (_, hex_value) in enumerate(DAValueEditorDialog.QUALITY_PRESETS[:-1])
+}
+
+# QStandardItemModel ต่อชุดค่า ComboBox (BOOLEAN / Beh-Mod / Health / Quality) - สร้างครั้งแรกที่ใช้
+# แล้วแชร์ทุก dialog แทน addItem ทีละแถว
+_COMBO_MODELS: Dict[Tuple[Tuple[str, Any], ...], QStandardItemModel] = {}
+
+
+def _combo_model(values: Tuple[Tuple[str, Any], ...]) -> QStandardItemModel:
+    """Shared item model for a ComboBox value set"""
+    model = _COMBO_MODELS.get(values)
+    if model is None:
+        model = QStandardItemModel()
+        for label, value in values:
+            item = QStandardItem(label)
+            item.setData(value, Qt.ItemDataRole.UserRole)
+            model.appendRow(item)
+        _COMBO_MODELS[values] = model
+    return model
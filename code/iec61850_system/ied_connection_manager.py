@@ -1,7 +1,8 @@
 # ied_connection_manager.py
 import threading
 import time
-from typing import Dict, Optional, List, Any, Callable, Tuple
+from contextlib import contextmanager
+from typing import Dict, Optional, List, Any, Callable, Tuple, Iterator
 from enum import Enum
 
 import pyiec61850 as iec61850 
@@ -34,13 +35,71 @@ class IEDConnection:
         self.last_activity = None
         
 
+class _ReportHandler(getattr(iec61850, 'RCBHandler', object)):
+    """Forward client reports from libiec61850's receive thread to a callback
+    
+    The callback gets {data set member index: python value} for the members
+    included in the report, and runs on the libiec61850 thread.
+    """
+    
+    def __init__(self, manager: 'IEDConnectionManager', ied_name: str,
+                 callback: Callable[[str, Dict[int, Any]], None]):
+        super().__init__()
+        self._manager = manager
+        self._ied_name = ied_name
+        self._callback = callback
+        
+    def trigger(self):
+        try:
+            report = self._libiec61850_client_report
+            values = iec61850.ClientReport_getDataSetValues(report)
+            if not values:
+                return
+                
+            changed = {}
+            for index in range(iec61850.MmsValue_getArraySize(values)):
+                reason = iec61850.ClientReport_getReasonForInclusion(report, index)
+                if reason == iec61850.IEC61850_REASON_NOT_INCLUDED:
+                    continue
+                changed[index] = self._manager._mms_to_python(
+                    iec61850.MmsValue_getElement(values, index)
+                )
+                
+            if changed:
+                self._callback(self._ied_name, changed)
+                
+        except Exception as e:
+            print(f"⚠️ Error handling report from {self._ied_name}: {e}")
+
+
 class IEDConnectionManager:
-    """Manager for IED connections"""
+    """Manager for IED connections
+    
+    Each connected IED owns a small pool of MMS associations so that
+    concurrent reads and control operations do not queue behind each other.
+    The first association (the one returned by get_connection) is permanent;
+    extra ones are opened on demand and evicted after idle_timeout seconds.
+    """
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 3, idle_timeout: float = 60.0):
         self.connections: Dict[str, IEDConnection] = {}
         self.lock = threading.Lock()
         
+        # Connection pool
+        self.pool_size = max(1, pool_size)
+        self.idle_timeout = idle_timeout
+        self._idle_pool: Dict[str, List[IEDConnection]] = {}
+        self._pool_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._evictor: Optional[threading.Thread] = None
+        self._evictor_stop = threading.Event()
+        
+        # False once the binding turns out not to expose multi-variable reads
+        self._multi_read_supported = True
+        
+        # Active report subscriptions: (ied_name, rcb_reference) -> (subscriber, handler)
+        # Kept here so the SWIG director objects stay alive while reports arrive
+        self._report_subscriptions: Dict[Tuple[str, str], Tuple[Any, _ReportHandler]] = {}
+        
         # Callbacks
         self.connection_callbacks: List[Callable] = []
         
@@ -94,6 +153,8 @@ class IEDConnectionManager:
             # Store connection
             with self.lock:
                 self.connections[ied_name] = ied_conn
+                self._idle_pool[ied_name] = [ied_conn]
+                self._pool_slots[ied_name] = threading.BoundedSemaphore(self.pool_size)
                 
             # Notify callbacks
             self._notify_connection_change(ied_name, ConnectionState.CONNECTED)
@@ -124,23 +185,43 @@ class IEDConnectionManager:
                 return
                 
             ied_conn = self.connections[ied_name]
+            pooled = [conn for conn in self._idle_pool.pop(ied_name, []) if conn is not ied_conn]
+            self._pool_slots.pop(ied_name, None)
+            
+            # Reports die with the association - the references are dropped only
+            # after the handlers are uninstalled and the connection is closed
+            report_keys = [key for key in self._report_subscriptions if key[0] == ied_name]
+            
+        # Close idle pooled associations (in-use ones are closed on release)
+        for conn in pooled:
+            self._close_pooled_connection(conn)
             
         try:
             if ied_conn.connection:
                 print(f"🔌 Disconnecting from {ied_name}...")
                 
+                for _, rcb_reference in report_keys:
+                    iec61850.IedConnection_uninstallReportHandler(ied_conn.connection, rcb_reference)
+                
                 # Close connection
                 iec61850.IedConnection_close(ied_conn.connection)
                 
                 # Destroy connection object
                 iec61850.IedConnection_destroy(ied_conn.connection)
                 
+            with self.lock:
+                for key in report_keys:
+                    self._report_subscriptions.pop(key, None)
+                    
             ied_conn.connection = None
             ied_conn.state = ConnectionState.DISCONNECTED
             
-            # Remove from connections
+            # Remove from connections - the evictor has nothing left to watch
+            # once the last IED is gone (disconnect_all ends up here too)
             with self.lock:
                 del self.connections[ied_name]
+                if not self.connections:
+                    self._evictor_stop.set()
                 
             # Notify callbacks
             self._notify_connection_change(ied_name, ConnectionState.DISCONNECTED)
@@ -155,6 +236,162 @@ class IEDConnectionManager:
         with self.lock:
             return self.connections.get(ied_name)
             
+    @contextmanager
+    def acquire(self, ied_name: str, timeout: float = 5.0) -> Iterator[Optional[IEDConnection]]:
+        """Borrow a connection from the IED's pool
+        
+        Yields None if the IED is not connected or no connection became
+        free within timeout seconds.
+        """
+        conn, slots = self._checkout(ied_name, timeout)
+        try:
+            yield conn
+        finally:
+            if conn is not None:
+                self.release(ied_name, conn, slots)
+                
+    def _checkout(self, ied_name: str,
+                  timeout: float) -> Tuple[Optional[IEDConnection], Optional[threading.BoundedSemaphore]]:
+        """Take an idle connection from the pool, opening a new one if needed
+        
+        Returns the connection and the pool semaphore it was counted against.
+        """
+        with self.lock:
+            primary = self.connections.get(ied_name)
+            slots = self._pool_slots.get(ied_name)
+            
+        if not primary or primary.state != ConnectionState.CONNECTED or not slots:
+            return None, None
+            
+        if not slots.acquire(timeout=timeout):
+            return None, None
+            
+        with self.lock:
+            # The IED may have been disconnected/reconnected while waiting
+            stale = self._pool_slots.get(ied_name) is not slots
+            idle = self._idle_pool.get(ied_name)
+            if not stale and idle:
+                return idle.pop(), slots
+                
+        if stale:
+            slots.release()
+            return None, None
+                
+        # Pool has a free slot but no idle connection - open another association
+        conn = self._open_pooled_connection(primary)
+        if conn is None:
+            # Fall back to sharing the primary association
+            conn = primary
+        return conn, slots
+        
+    def release(self, ied_name: str, conn: IEDConnection,
+                slots: Optional[threading.BoundedSemaphore] = None):
+        """Return a borrowed connection to the pool
+        
+        slots is the semaphore the connection was checked out against. If the
+        IED has reconnected since, the connection belongs to the old pool and
+        is closed instead of joining the new one.
+        """
+        with self.lock:
+            current_slots = self._pool_slots.get(ied_name)
+            if slots is None:
+                slots = current_slots
+            stale = slots is not current_slots
+            primary = self.connections.get(ied_name)
+            idle = None if stale else self._idle_pool.get(ied_name)
+            
+            if conn is not primary and primary is not None and not stale:
+                # Fold statistics of extra associations into the primary one
+                primary.request_count += conn.request_count
+                primary.error_count += conn.error_count
+                primary.last_activity = conn.last_activity or primary.last_activity
+                conn.request_count = 0
+                conn.error_count = 0
+                
+            conn.last_activity = time.time()
+            disconnected = idle is None or conn.state != ConnectionState.CONNECTED
+            if not disconnected and conn not in idle:
+                idle.append(conn)
+                
+        if slots is not None:
+            slots.release()
+                
+        if disconnected and conn is not primary:
+            self._close_pooled_connection(conn)
+            
+    def _open_pooled_connection(self, primary: IEDConnection) -> Optional[IEDConnection]:
+        """Open an extra MMS association to the same IED"""
+        connection = None
+        try:
+            connection = iec61850.IedConnection_create()
+            if not connection:
+                return None
+                
+            iec61850.IedConnection_setConnectTimeout(connection, 10000)
+            error = iec61850.IedConnection_connect(connection, primary.ip_address, primary.port)
+            
+            if error != iec61850.IED_ERROR_OK:
+                iec61850.IedConnection_destroy(connection)
+                return None
+                
+        except Exception as e:
+            print(f"⚠️ Could not open pooled connection to {primary.ied_name}: {e}")
+            if connection:
+                try:
+                    iec61850.IedConnection_destroy(connection)
+                except:
+                    pass
+            return None
+            
+        conn = IEDConnection(primary.ied_name, primary.ip_address, primary.port)
+        conn.connection = connection
+        conn.state = ConnectionState.CONNECTED
+        conn.connected_time = time.time()
+        conn.model = primary.model
+        
+        self._start_evictor()
+        return conn
+        
+    def _close_pooled_connection(self, conn: IEDConnection):
+        """Close an extra pooled association"""
+        try:
+            if conn.connection:
+                iec61850.IedConnection_close(conn.connection)
+                iec61850.IedConnection_destroy(conn.connection)
+        except Exception as e:
+            print(f"⚠️ Error closing pooled connection to {conn.ied_name}: {e}")
+        conn.connection = None
+        conn.state = ConnectionState.DISCONNECTED
+        
+    def _start_evictor(self):
+        """Start the background thread that closes idle pooled connections"""
+        with self.lock:
+            if self._evictor and self._evictor.is_alive() and not self._evictor_stop.is_set():
+                return
+            # Fresh Event per thread - an evictor that is still winding down keeps its own (set) one
+            self._evictor_stop = threading.Event()
+            self._evictor = threading.Thread(target=self._evict_idle_connections,
+                                             args=(self._evictor_stop,),
+                                             name="IEDPoolEvictor", daemon=True)
+            self._evictor.start()
+            
+    def _evict_idle_connections(self, stop: threading.Event):
+        """Close extra pooled connections that have been idle too long"""
+        while not stop.wait(max(1.0, self.idle_timeout / 2)):
+            now = time.time()
+            expired = []
+            
+            with self.lock:
+                for ied_name, idle in self._idle_pool.items():
+                    primary = self.connections.get(ied_name)
+                    for conn in list(idle):
+                        if conn is not primary and now - (conn.last_activity or 0) > self.idle_timeout:
+                            idle.remove(conn)
+                            expired.append(conn)
+                            
+            for conn in expired:
+                self._close_pooled_connection(conn)
+                
     def is_connected(self, ied_name: str) -> bool:
         """Check if IED is connected"""
         conn = self.get_connection(ied_name)
@@ -171,37 +408,417 @@ class IEDConnectionManager:
         Returns:
             (value, error_message)
         """
+        with self.acquire(ied_name) as conn:
+            if not conn:
+                return None, f"{ied_name} not connected"
+                
+            try:
+                # Read value
+                mms_value = iec61850.IedConnection_readObject(
+                    conn.connection, 
+                    object_reference,
+                    iec61850.IEC61850_FC_ST  # Functional constraint
+                )
+                
+                if not mms_value:
+                    return None, "Failed to read value"
+                    
+                # Convert to Python value
+                python_value = self._mms_to_python(mms_value)
+                
+                # Delete MMS value
+                iec61850.MmsValue_delete(mms_value)
+                
+                # Update statistics
+                conn.request_count += 1
+                conn.last_activity = time.time()
+                
+                return python_value, None
+                
+            except Exception as e:
+                conn.error_count += 1
+                return None, str(e)
+            
+    def read_values(self, ied_name: str,
+                    object_references: List[str]) -> Dict[str, Tuple[Optional[Any], Optional[str]]]:
+        """Read several values from one IED in a single call
+        
+        Returns:
+            {object_reference: (value, error_message)}
+        """
+        with self.acquire(ied_name) as conn:
+            if not conn:
+                error = f"{ied_name} not connected"
+                return {ref: (None, error) for ref in object_references}
+                
+            if self._multi_read_supported:
+                results = self._read_multiple_variables(conn, object_references)
+                if results is not None:
+                    return results
+                    
+            results = {}
+            read_object = iec61850.IedConnection_readObject
+            fc = iec61850.IEC61850_FC_ST
+            
+            for ref in object_references:
+                try:
+                    mms_value = read_object(conn.connection, ref, fc)
+                    
+                    if not mms_value:
+                        conn.error_count += 1
+                        results[ref] = (None, "Failed to read value")
+                        continue
+                        
+                    results[ref] = (self._mms_to_python(mms_value), None)
+                    iec61850.MmsValue_delete(mms_value)
+                    conn.request_count += 1
+                    
+                except Exception as e:
+                    conn.error_count += 1
+                    results[ref] = (None, str(e))
+                    
+            conn.last_activity = time.time()
+            return results
+        
+    def _read_multiple_variables(self, conn: IEDConnection,
+                                 object_references: List[str]) -> Optional[Dict[str, Tuple[Optional[Any], Optional[str]]]]:
+        """Read ST references with one MMS Read request per logical device
+        
+        Returns None when the binding has no MmsConnection_readMultipleVariables,
+        so the caller can fall back to one readObject per reference.
+        """
+        # "LD/LN.DO.DA" -> domain "LD", item "LN$ST$DO$DA"
+        by_domain: Dict[str, List[Tuple[str, str]]] = {}
+        for ref in object_references:
+            domain, _, variable = ref.partition('/')
+            ln_name, _, rest = variable.partition('.')
+            item = f"{ln_name}$ST${rest.replace('.', '$')}"
+            by_domain.setdefault(domain, []).append((ref, item))
+            
+        try:
+            mms_connection = iec61850.IedConnection_getMmsConnection(conn.connection)
+        except AttributeError:
+            self._multi_read_supported = False
+            return None
+            
+        results = {}
+        for domain, entries in by_domain.items():
+            items = iec61850.LinkedList_create()
+            try:
+                for _, item in entries:
+                    iec61850.LinkedList_add(items, item)
+                    
+                [mms_values, mms_error] = iec61850.MmsConnection_readMultipleVariables(
+                    mms_connection, domain, items
+                )
+            except (AttributeError, TypeError):
+                # Binding ไม่รองรับ - ใช้ readObject ทีละตัวแทน
+                self._multi_read_supported = False
+                return None
+            except Exception as e:
+                conn.error_count += 1
+                for ref, _ in entries:
+                    results[ref] = (None, str(e))
+                continue
+            finally:
+                iec61850.LinkedList_destroyStatic(items)
+                
+            conn.request_count += 1
+            
+            if mms_error != iec61850.MMS_ERROR_NONE or not mms_values:
+                conn.error_count += 1
+                for ref, _ in entries:
+                    results[ref] = (None, "Failed to read value")
+                continue
+                
+            for index, (ref, _) in enumerate(entries):
+                element = iec61850.MmsValue_getElement(mms_values, index)
+                if not element or iec61850.MmsValue_getType(element) == iec61850.MMS_DATA_ACCESS_ERROR:
+                    results[ref] = (None, "Failed to read value")
+                else:
+                    results[ref] = (self._mms_to_python(element), None)
+            iec61850.MmsValue_delete(mms_values)
+            
+        conn.last_activity = time.time()
+        return results
+        
+    def create_data_set(self, ied_name: str, data_set_reference: str,
+                        fcda_references: List[str]) -> Optional[str]:
+        """Create a dynamic (client-defined) data set on the IED
+        
+        Non-persistent ("@"-prefixed) data sets belong to one association,
+        so data set services always use the primary connection.
+        
+        Returns:
+            error_message if failed, None if successful
+        """
         conn = self.get_connection(ied_name)
         if not conn or conn.state != ConnectionState.CONNECTED:
-            return None, f"{ied_name} not connected"
+            return f"{ied_name} not connected"
             
+        data_set_elements = iec61850.LinkedList_create()
         try:
-            # Read value
-            mms_value = iec61850.IedConnection_readObject(
-                conn.connection, 
-                object_reference,
-                iec61850.IEC61850_FC_ST  # Functional constraint
+            for ref in fcda_references:
+                iec61850.LinkedList_add(data_set_elements, ref)
+                
+            error = iec61850.IedConnection_createDataSet(
+                conn.connection,
+                data_set_reference,
+                data_set_elements
             )
             
-            if not mms_value:
-                return None, "Failed to read value"
+            conn.request_count += 1
+            conn.last_activity = time.time()
+            
+            if error != iec61850.IED_ERROR_OK:
+                conn.error_count += 1
+                return iec61850.IedClientError_toString(error)
                 
-            # Convert to Python value
-            python_value = self._mms_to_python(mms_value)
+            return None
             
-            # Delete MMS value
-            iec61850.MmsValue_delete(mms_value)
+        except Exception as e:
+            conn.error_count += 1
+            return str(e)
+            
+        finally:
+            iec61850.LinkedList_destroyStatic(data_set_elements)
+            
+    def delete_data_set(self, ied_name: str, data_set_reference: str) -> Optional[str]:
+        """Delete a dynamic data set from the IED
+        
+        Returns:
+            error_message if failed, None if successful
+        """
+        conn = self.get_connection(ied_name)
+        if not conn or conn.state != ConnectionState.CONNECTED:
+            return f"{ied_name} not connected"
+            
+        try:
+            [deleted, error] = iec61850.IedConnection_deleteDataSet(
+                conn.connection,
+                data_set_reference
+            )
+            
+            if error != iec61850.IED_ERROR_OK:
+                return iec61850.IedClientError_toString(error)
+                
+            return None if deleted else "Data set not deleted"
+            
+        except Exception as e:
+            return str(e)
+            
+    def read_data_set_values(self, ied_name: str,
+                             data_set_reference: str) -> Tuple[Optional[List[Any]], Optional[str]]:
+        """Read all member values of a data set with a single request
+        
+        Returns:
+            (values in data set order, error_message)
+        """
+        conn = self.get_connection(ied_name)
+        if not conn or conn.state != ConnectionState.CONNECTED:
+            return None, f"{ied_name} not connected"
+            
+        try:
+            [data_set, error] = iec61850.IedConnection_readDataSetValues(
+                conn.connection,
+                data_set_reference,
+                None
+            )
+            
+            if error != iec61850.IED_ERROR_OK or not data_set:
+                conn.error_count += 1
+                return None, iec61850.IedClientError_toString(error)
+                
+            values = self._mms_to_python(iec61850.ClientDataSet_getValues(data_set))
+            iec61850.ClientDataSet_destroy(data_set)
             
-            # Update statistics
             conn.request_count += 1
             conn.last_activity = time.time()
             
-            return python_value, None
+            return values, None
             
         except Exception as e:
             conn.error_count += 1
             return None, str(e)
             
+    def find_free_urcb(self, ied_name: str, logical_device: str) -> Optional[str]:
+        """Find an unbuffered report control block in <logical_device>/LLN0
+        that is neither reserved nor enabled by another client
+        
+        Returns:
+            RCB reference (e.g. "IEDLD0/LLN0.RP.urcbA01") or None
+        """
+        conn = self.get_connection(ied_name)
+        if not conn or conn.state != ConnectionState.CONNECTED:
+            return None
+            
+        try:
+            rcb_list = iec61850.IedConnection_getLogicalNodeDirectory(
+                conn.connection,
+                f"{logical_device}/LLN0",
+                iec61850.ACSI_CLASS_URCB
+            )
+            if not rcb_list:
+                return None
+                
+            rcb_names = []
+            element = rcb_list
+            while element:
+                rcb_name = iec61850.LinkedList_getData(element)
+                if rcb_name:
+                    rcb_names.append(rcb_name)
+                element = iec61850.LinkedList_getNext(element)
+            iec61850.LinkedList_destroy(rcb_list)
+            
+            for rcb_name in rcb_names:
+                rcb_reference = f"{logical_device}/LLN0.RP.{rcb_name}"
+                [rcb, error] = iec61850.IedConnection_getRCBValues(conn.connection, rcb_reference, None)
+                if error != iec61850.IED_ERROR_OK or not rcb:
+                    continue
+                    
+                free = (not iec61850.ClientReportControlBlock_getRptEna(rcb) and
+                        not iec61850.ClientReportControlBlock_getResv(rcb))
+                iec61850.ClientReportControlBlock_destroy(rcb)
+                
+                if free:
+                    return rcb_reference
+                    
+            return None
+            
+        except Exception as e:
+            print(f"⚠️ Cannot browse report control blocks on {ied_name}: {e}")
+            return None
+            
+    def enable_report(self, ied_name: str, rcb_reference: str, data_set_reference: str,
+                      callback: Callable[[str, Dict[int, Any]], None]) -> Optional[str]:
+        """Point an RCB at a data set and enable data-change/quality-change reports
+        
+        A general interrogation is requested right away so the callback
+        receives the current value of every member once.
+        
+        Returns:
+            error_message if failed, None if successful
+        """
+        if not hasattr(iec61850, 'RCBSubscriber'):
+            return "Report subscription not supported by this pyiec61850 build"
+            
+        conn = self.get_connection(ied_name)
+        if not conn or conn.state != ConnectionState.CONNECTED:
+            return f"{ied_name} not connected"
+            
+        rcb = None
+        subscribed = False
+        try:
+            [rcb, error] = iec61850.IedConnection_getRCBValues(conn.connection, rcb_reference, None)
+            if error != iec61850.IED_ERROR_OK or not rcb:
+                return iec61850.IedClientError_toString(error)
+                
+            # Install the handler before enabling so the GI report is not missed
+            handler = _ReportHandler(self, ied_name, callback)
+            subscriber = iec61850.RCBSubscriber()
+            subscriber.setIedConnection(conn.connection)
+            subscriber.setRcbReference(rcb_reference)
+            if hasattr(subscriber, 'setRcbRptId'):
+                subscriber.setRcbRptId(iec61850.ClientReportControlBlock_getRptId(rcb))
+            subscriber.setEventHandler(handler)
+            subscriber.subscribe()
+            subscribed = True
+            
+            iec61850.ClientReportControlBlock_setResv(rcb, True)
+            iec61850.ClientReportControlBlock_setDataSetReference(rcb, data_set_reference)
+            iec61850.ClientReportControlBlock_setTrgOps(
+                rcb,
+                iec61850.TRG_OPT_DATA_CHANGED | iec61850.TRG_OPT_QUALITY_CHANGED | iec61850.TRG_OPT_GI
+            )
+            iec61850.ClientReportControlBlock_setRptEna(rcb, True)
+            iec61850.ClientReportControlBlock_setGI(rcb, True)
+            
+            error = iec61850.IedConnection_setRCBValues(
+                conn.connection, rcb,
+                iec61850.RCB_ELEMENT_RESV | iec61850.RCB_ELEMENT_DATSET |
+                iec61850.RCB_ELEMENT_TRG_OPS | iec61850.RCB_ELEMENT_RPT_ENA |
+                iec61850.RCB_ELEMENT_GI,
+                True
+            )
+            
+            conn.request_count += 1
+            conn.last_activity = time.time()
+            
+            if error != iec61850.IED_ERROR_OK:
+                conn.error_count += 1
+                iec61850.IedConnection_uninstallReportHandler(conn.connection, rcb_reference)
+                return iec61850.IedClientError_toString(error)
+                
+            with self.lock:
+                self._report_subscriptions[(ied_name, rcb_reference)] = (subscriber, handler)
+            return None
+            
+        except Exception as e:
+            conn.error_count += 1
+            if subscribed:
+                # Handler is installed but nobody keeps the director alive - remove it
+                try:
+                    iec61850.IedConnection_uninstallReportHandler(conn.connection, rcb_reference)
+                except Exception:
+                    pass
+            return str(e)
+            
+        finally:
+            if rcb:
+                iec61850.ClientReportControlBlock_destroy(rcb)
+                
+    def disable_report(self, ied_name: str, rcb_reference: str) -> Optional[str]:
+        """Disable and release an RCB enabled with enable_report
+        
+        Returns:
+            error_message if failed, None if successful
+        """
+        conn = self.get_connection(ied_name)
+        if not conn or conn.state != ConnectionState.CONNECTED:
+            # disconnect_from_ied already uninstalled the handler
+            with self.lock:
+                self._report_subscriptions.pop((ied_name, rcb_reference), None)
+            return f"{ied_name} not connected"
+            
+        rcb = None
+        try:
+            [rcb, error] = iec61850.IedConnection_getRCBValues(conn.connection, rcb_reference, None)
+            if error != iec61850.IED_ERROR_OK or not rcb:
+                return iec61850.IedClientError_toString(error)
+                
+            iec61850.ClientReportControlBlock_setRptEna(rcb, False)
+            iec61850.ClientReportControlBlock_setResv(rcb, False)
+            error = iec61850.IedConnection_setRCBValues(
+                conn.connection, rcb,
+                iec61850.RCB_ELEMENT_RPT_ENA | iec61850.RCB_ELEMENT_RESV,
+                True
+            )
+            
+            conn.request_count += 1
+            conn.last_activity = time.time()
+            
+            if error != iec61850.IED_ERROR_OK:
+                conn.error_count += 1
+                return iec61850.IedClientError_toString(error)
+                
+            return None
+            
+        except Exception as e:
+            conn.error_count += 1
+            return str(e)
+            
+        finally:
+            if rcb:
+                iec61850.ClientReportControlBlock_destroy(rcb)
+                
+            # Uninstall before dropping the director - a report may be in flight
+            try:
+                iec61850.IedConnection_uninstallReportHandler(conn.connection, rcb_reference)
+            except Exception:
+                pass
+            with self.lock:
+                self._report_subscriptions.pop((ied_name, rcb_reference), None)
+                
     def write_value(self, ied_name: str, object_reference: str, 
                    value: Any, fc: int = iec61850.IEC61850_FC_ST) -> Optional[str]:
         """Write value to IED
@@ -370,10 +987,17 @@ class IEDConnectionManager:
         Returns:
             error_message if failed, None if successful
         """
-        conn = self.get_connection(ied_name)
-        if not conn or conn.state != ConnectionState.CONNECTED:
-            return f"{ied_name} not connected"
+        with self.acquire(ied_name) as conn:
+            if not conn:
+                return f"{ied_name} not connected"
+                
+            return self._control_operation(conn, control_object, control_value,
+                                           select_before_operate, test_mode)
             
+    def _control_operation(self, conn: IEDConnection, control_object: str,
+                           control_value: Any, select_before_operate: bool,
+                           test_mode: bool) -> Optional[str]:
+        """Run a control operation on a borrowed connection"""
         try:
             # Create control object client
             control_client = iec61850.ControlObjectClient_create(
@@ -5,7 +5,8 @@ UI Helper for Uranus - ใน code/ directory
 
 import os
 import sys
-from PyQt6 import uic
+import importlib
+from PyQt6 import uic, QtWidgets
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import QDir
 
@@ -85,6 +86,12 @@ class UIHelper:
             return UIHelper.create_fallback_widget(ui_filename, parent)
         
         try:
+            # ใช้ module ที่ compile ไว้แล้ว (compile_ui.py) ถ้ามี - ไม่ต้อง parse XML ใหม่
+            widget = UIHelper.load_compiled_ui(ui_path, parent)
+            if widget is not None:
+                print(f"✅ Successfully loaded UI: {ui_filename} (compiled)")
+                return widget
+            
             # Load the UI file
             if parent:
                 widget = uic.loadUi(ui_path, parent)
@@ -102,6 +109,31 @@ class UIHelper:
             
             return UIHelper.create_fallback_widget(ui_filename, parent)
     
+    @staticmethod
+    def load_compiled_ui(ui_path, parent=None):
+        """สร้าง widget จาก ui_compiled/Ui_<name>.py คืน None ถ้าไม่มีหรือเก่ากว่าไฟล์ .ui"""
+        stem = os.path.splitext(os.path.basename(ui_path))[0]
+        try:
+            module = importlib.import_module(f"ui_compiled.Ui_{stem}")
+        except ImportError:
+            return None
+        
+        # Development mode: ถ้าแก้ .ui หลัง compile ให้กลับไปใช้ uic.loadUi
+        if not hasattr(sys, '_MEIPASS'):
+            try:
+                if os.path.getmtime(module.__file__) < os.path.getmtime(ui_path):
+                    return None
+            except OSError:
+                return None
+        
+        widget = parent if parent is not None else getattr(QtWidgets, module.BASE_CLASS)()
+        form = module.FormClass()
+        form.setupUi(widget)
+        # uic.loadUi ตั้ง child widgets เป็น attribute ของ widget - ทำเหมือนกัน
+        for name, value in vars(form).items():
+            setattr(widget, name, value)
+        return widget
+    
     @staticmethod
     def create_fallback_widget(ui_filename, parent=None):
         """Create a fallback widget when UI loading fails"""
@@ -152,6 +152,18 @@ hiddenimports = [
     'pyiec61850',
 ]
 
+# Pre-compiled UI modules (สร้างโดย code/compile_ui.py, import แบบ dynamic ใน ui_helper)
+ui_compiled_dir = Path(current_dir, 'code', 'ui_compiled')
+ui_compiled_modules = sorted(ui_compiled_dir.glob('Ui_*.py')) if ui_compiled_dir.is_dir() else []
+if ui_compiled_modules:
+    hiddenimports.append('ui_compiled')
+    hiddenimports += [f'ui_compiled.{p.stem}' for p in ui_compiled_modules]
+elif os.environ.get('CI'):
+    # Release builds must ship the compiled forms
+    raise SystemExit("ERROR: code/ui_compiled not found - run code/compile_ui.py before pyinstaller")
+else:
+    print("WARNING: code/ui_compiled not found - run code/compile_ui.py (falling back to uic.loadUi)")
+
 # Exclude unnecessary modules to reduce size
 excludes = [
     'tkinter',